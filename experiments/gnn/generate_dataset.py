@@ -4,7 +4,8 @@ generate_dataset — produce the GNN training corpus for hypercommon t_best pred
 For each (shape, overlap_pct, run) trajectory:
   1. Build ring_lattice(sizes, zs) and apply random overlap merge.
   2. Walk p = 0..1 in steps of P_STEP. At each p, sweep t over T_GRID and record
-     omega(p, t). Then rewire k_step edges and continue.
+     omega(p, t). The grid is split into one chunk per worker, and each chunk is
+     a single get_communities_multi call. Then rewire k_step edges and continue.
   3. Save the initial graph + omega grid + per-p argmax labels.
 
 Each trajectory writes a 'done' marker file as its very last step. Re-running
@@ -149,26 +150,47 @@ def validate_rewiring_plan(M0: int, p_step: float) -> int:
 
 
 # =====================================================================
-# Worker — one (graph snapshot, t) -> omega
+# Worker — one (graph snapshot, chunk of t) -> omegas
 # =====================================================================
 
-def _hypercommon_omega_at_t(t, edges, nodes, gt_pair_counts, total_pairs):
-    """Run hypercommon at threshold t on the given graph snapshot. Returns (t, omega)."""
+def _hypercommon_omegas(ts, edges, nodes, gt_pair_counts, total_pairs):
+    """Run hypercommon at every threshold in ts on one graph snapshot.
+
+    All thresholds come out of a single get_communities_multi enumeration.
+    Returns [(t, omega), ...] in the order of ts.
+    """
     import warnings as _w; _w.filterwarnings("ignore")
-    import networkx as nx
-    from predicates.jaccard import closed_neighborhood_jaccard_predicate as _pred
-    from hypercommon.algorithm import get_communities as _gc
+    from predicates.jaccard import closed_neighborhood_jaccard as _value
+    from hypercommon.algorithm import get_communities_multi as _gcm
+    from hypercommon.prepared import PreparedGraph
     from metrics.omega import omega_index as _om, build_pair_counts as _bpc
 
-    G = nx.Graph()
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
     try:
-        pred = _gc(G, _pred(t))
-        omega = _om(gt_pair_counts, _bpc(pred), total_pairs)
-        return float(t), float(omega)
+        # same graph as nx.Graph(nodes + edges), without building one
+        G = PreparedGraph.from_edges(edges, nodes)
+        per_t = _gcm(G, _value, ts)
     except Exception:
-        return float(t), float("nan")
+        return [(float(t), float("nan")) for t in ts]
+
+    out = []
+    for t, pred in zip(ts, per_t):
+        try:
+            out.append((float(t), float(_om(gt_pair_counts, _bpc(pred), total_pairs))))
+        except Exception:
+            out.append((float(t), float("nan")))
+    return out
+
+
+def t_chunks(ts: list[float], k: int) -> list[list[float]]:
+    """Split ts into at most k contiguous, near-equal chunks (one per worker)."""
+    k = max(1, min(k, len(ts)))
+    size, extra = divmod(len(ts), k)
+    chunks, start = [], 0
+    for i in range(k):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(ts[start:end])
+        start = end
+    return chunks
 
 
 # =====================================================================
@@ -248,19 +270,19 @@ def run_trajectory(traj: dict, root: str, pool: ProcessPoolExecutor) -> dict:
 
     t_traj0 = time.perf_counter()
     for s in range(n_p):
-        edges = list(G.edges())
+        edges = np.array(list(G.edges()), dtype=np.int32)
         nodes = list(G.nodes())
 
         # Snapshot the graph at this p step
-        graphs_dict[f"p_{s:03d}"] = np.array(edges, dtype=np.int32)
+        graphs_dict[f"p_{s:03d}"] = edges
 
-        futures = {t: pool.submit(_hypercommon_omega_at_t, t, edges, nodes, gt_pc, total_pairs)
-                   for t in TGRID}
+        futures = [pool.submit(_hypercommon_omegas, chunk, edges, nodes, gt_pc, total_pairs)
+                   for chunk in t_chunks(TGRID, N_WORKERS)]
 
-        row = np.full(n_t, np.nan, dtype=np.float64)
-        for ti, t in enumerate(TGRID):
-            _, omega = futures[t].result()
-            row[ti] = omega
+        omega_at = {}
+        for fut in futures:
+            omega_at.update(fut.result())
+        row = np.array([omega_at[float(t)] for t in TGRID], dtype=np.float64)
         omega_grid[s, :] = row
 
         # argmax + omega_at_argmax
@@ -0,0 +1,60 @@
+"""Per-pair vs batch evaluation of closed_neighborhood_jaccard_predicate.
+
+Times get_communities, a lazy get_node_community on the networkx graph and
+one on a freshly built PreparedGraph, with the default predicate and with
+batch=True, on ring lattices. The default must not be slower: the batch
+form is only worth asking for with a value whose per-pair evaluation is
+expensive.
+
+Run:
+  ./.venv/Scripts/python.exe -m experiments.ring_lattice.batch_predicate_benchmark
+"""
+
+import time
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities, get_node_community
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard_predicate
+
+GRAPHS = [
+    ([300] * 10, [16] * 10),
+    ([100] * 20, [8] * 20),
+]
+THRESHOLD = 0.1
+SEED_NODE = 5
+REPEATS = 3
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark():
+    rows = []
+    for ring_sizes, degrees in GRAPHS:
+        G = ring_lattice(ring_sizes, degrees)
+        label = f"{len(ring_sizes)}x ring({ring_sizes[0]}, k={degrees[0]})"
+        for name, pred in (
+            ("default", closed_neighborhood_jaccard_predicate(THRESHOLD)),
+            ("batch", closed_neighborhood_jaccard_predicate(THRESHOLD, batch=True)),
+        ):
+            rows.append((
+                label,
+                name,
+                best_of(lambda: get_communities(G, pred)),
+                best_of(lambda: get_node_community(G, pred, SEED_NODE)),
+                best_of(lambda: get_node_community(PreparedGraph(G), pred, SEED_NODE)),
+            ))
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'graph':<28}{'predicate':<10}{'global':>9}{'local':>9}{'cold P':>9}")
+    for label, name, whole, local, cold in run_benchmark():
+        print(f"{label:<28}{name:<10}{whole:>8.3f}s{local:>8.3f}s{cold:>8.3f}s")
@@ -207,15 +207,18 @@ def _run_algo_worker(algo_name, params, edges, nodes, gt_pair_counts, total_pair
     G.add_edges_from(edges)
 
     if algo_name == "hypercommon":
-        from predicates.jaccard import closed_neighborhood_jaccard_predicate as _pred
-        from hypercommon.algorithm import get_communities as _gc
+        from predicates.jaccard import closed_neighborhood_jaccard as _value
+        from hypercommon.algorithm import get_communities_multi as _gcm
         from metrics.omega import omega_index as _om, build_pair_counts as _bpc
         t_grid = params["t_grid"]
         best_omega = float("-inf")
         best_t = None
-        for t in t_grid:
+        try:
+            per_t = _gcm(G, _value, t_grid)
+        except Exception:
+            per_t = []
+        for t, pred in zip(t_grid, per_t):
             try:
-                pred = _gc(G, _pred(t))
                 om = _om(gt_pair_counts, _bpc(pred), total_pairs)
             except Exception:
                 continue
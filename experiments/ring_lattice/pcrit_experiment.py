@@ -28,7 +28,7 @@ from generators.ring_lattice import ring_lattice
 from utils.rewiring import rewire_step
 from metrics.omega import omega_index, build_pair_counts
 from predicates.jaccard import closed_neighborhood_jaccard_predicate
-from hypercommon.algorithm import get_communities
+from hypercommon.dynamic import DynamicHypercommon
 
 
 # ---------------------------------------------------------------------------
@@ -194,12 +194,13 @@ def estimate_p_crit(G_base, gt_pair_counts, total_pairs, threshold, steps, k_ste
 
     for _ in range(avg_times):
         G = G_base.copy()
+        dyn = DynamicHypercommon(G, pred_fn)
         edge_stack = list(G.edges())
         rng.shuffle(edge_stack)
 
         found = False
         for s in range(steps + 1):
-            pred = get_communities(G, pred_fn)
+            pred = dyn.communities()
             pred_pair_count = build_pair_counts(pred)
             score = omega_index(
                 ground_truth_pair_counts=gt_pair_counts,
@@ -211,7 +212,7 @@ def estimate_p_crit(G_base, gt_pair_counts, total_pairs, threshold, steps, k_ste
                 found = True
                 break
             if s < steps:
-                rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng)
+                rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng, dynamic=dyn)
 
         if not found:
             total_p_crit += 1.0
@@ -312,11 +313,12 @@ def run_config(overlap, n, z, ring_size, rng, search_writer, sweep_writer, summa
     for run_i in range(1, AVG_FINAL + 1):
         t_run0 = time.perf_counter()
         G = G_base.copy()
+        dyn = DynamicHypercommon(G, pred_fn)
         edge_stack = list(G.edges())
         rng.shuffle(edge_stack)
 
         for s in range(steps):
-            pred = get_communities(G, pred_fn)
+            pred = dyn.communities()
             pred_pair_count = build_pair_counts(pred)
             score = omega_index(
                 ground_truth_pair_counts=gt_pair_counts,
@@ -324,9 +326,9 @@ def run_config(overlap, n, z, ring_size, rng, search_writer, sweep_writer, summa
                 total_pairs=total_pairs,
             )
             sum_scores[s] += score
-            rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng)
+            rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng, dynamic=dyn)
 
-        pred = get_communities(G, pred_fn)
+        pred = dyn.communities()
         pred_pair_count = build_pair_counts(pred)
         score = omega_index(
             ground_truth_pair_counts=gt_pair_counts,
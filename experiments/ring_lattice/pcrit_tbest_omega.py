@@ -70,23 +70,44 @@ def t_grid() -> list[float]:
 # Worker
 # =====================================================================
 
-def _hypercommon_omega_at_t(t, edges, nodes, gt_pair_counts, total_pairs):
-    """Run hypercommon at threshold t on the given graph snapshot. Returns (t, omega)."""
+def _hypercommon_omegas(ts, edges, nodes, gt_pair_counts, total_pairs):
+    """Run hypercommon at every threshold in ts on one graph snapshot.
+
+    All thresholds come out of a single get_communities_multi enumeration.
+    Returns [(t, omega), ...] in the order of ts.
+    """
     import warnings as _w; _w.filterwarnings("ignore")
-    import networkx as nx
-    from predicates.jaccard import closed_neighborhood_jaccard_predicate as _pred
-    from hypercommon.algorithm import get_communities as _gc
+    from predicates.jaccard import closed_neighborhood_jaccard as _value
+    from hypercommon.algorithm import get_communities_multi as _gcm
+    from hypercommon.prepared import PreparedGraph
     from metrics.omega import omega_index as _om, build_pair_counts as _bpc
 
-    G = nx.Graph()
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
     try:
-        pred = _gc(G, _pred(t))
-        omega = _om(gt_pair_counts, _bpc(pred), total_pairs)
-        return float(t), float(omega)
+        # same graph as nx.Graph(nodes + edges), without building one
+        G = PreparedGraph.from_edges(edges, nodes)
+        per_t = _gcm(G, _value, ts)
     except Exception:
-        return float(t), float("nan")
+        return [(float(t), float("nan")) for t in ts]
+
+    out = []
+    for t, pred in zip(ts, per_t):
+        try:
+            out.append((float(t), float(_om(gt_pair_counts, _bpc(pred), total_pairs))))
+        except Exception:
+            out.append((float(t), float("nan")))
+    return out
+
+
+def t_chunks(ts: list[float], k: int) -> list[list[float]]:
+    """Split ts into at most k contiguous, near-equal chunks (one per worker)."""
+    k = max(1, min(k, len(ts)))
+    size, extra = divmod(len(ts), k)
+    chunks, start = [], 0
+    for i in range(k):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(ts[start:end])
+        start = end
+    return chunks
 
 
 # =====================================================================
@@ -134,12 +155,16 @@ def run_one(run_i: int, run_dir: str, rng: random.Random, pool: ProcessPoolExecu
             nodes = list(G.nodes())
             t_p0 = time.perf_counter()
 
-            # Submit all t-evals; collect in t-order
-            futures = {t: pool.submit(_hypercommon_omega_at_t, t, edges, nodes, gt_pc, total_pairs) for t in TGRID}
+            # One multi-threshold call per worker chunk; collect in t-order
+            futures = [pool.submit(_hypercommon_omegas, chunk, edges, nodes, gt_pc, total_pairs)
+                       for chunk in t_chunks(TGRID, N_WORKERS)]
+            omega_at: dict[float, float] = {}
+            for fut in futures:
+                omega_at.update(fut.result())
 
             row_omega: dict[float, float] = {}
             for t in TGRID:
-                _, omega = futures[t].result()
+                omega = omega_at[float(t)]
                 row_omega[t] = omega
                 sweep_w.writerow({"p": p, "t": t, "omega": omega})
             sweep_fp.flush()
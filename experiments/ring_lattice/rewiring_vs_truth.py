@@ -10,7 +10,7 @@ from generators.ring_lattice import ring_lattice
 from utils.rewiring import rewire_step
 from metrics.omega import omega_index, build_pair_counts
 from predicates.jaccard import closed_neighborhood_jaccard_predicate
-from hypercommon.algorithm import get_communities
+from hypercommon.dynamic import DynamicHypercommon
 
 
 def ring_ground_truth(n: int, rings: int) -> list[set[int]]:
@@ -106,6 +106,9 @@ def run_experiment(
                 t_run0 = time.perf_counter()
 
                 G = ring_lattice([n // rings] * rings, [z] * rings)
+                # follows G through every rewiring, re-evaluating only the
+                # triples around changed edges
+                dyn = DynamicHypercommon(G, closed_neighborhood_jaccard_predicate(threshold))
 
                 edge_stack = list(G.edges())
                 rng.shuffle(edge_stack)
@@ -113,7 +116,7 @@ def run_experiment(
                 for s in range(steps):
                     t_step0 = time.perf_counter()
 
-                    pred = get_communities(G, closed_neighborhood_jaccard_predicate(threshold))
+                    pred = dyn.communities()
                     pred_pair_count = build_pair_counts(pred)
 
                     score = omega_index(
@@ -123,13 +126,13 @@ def run_experiment(
                     )
                     sum_scores[s] += score
 
-                    rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng)
+                    rewire_step(G=G, edge_stack=edge_stack, k=k_step, rng=rng, dynamic=dyn)
 
                     dt_step = time.perf_counter() - t_step0
                     print(f"      [STEP {s + 1}/{steps}] dt={dt_step:.3f}s")
 
                 # final point p=1.0
-                pred = get_communities(G, closed_neighborhood_jaccard_predicate(threshold))
+                pred = dyn.communities()
                 pred_pair_count = build_pair_counts(pred)
                 score = omega_index(
                     ground_truth_pair_counts=gt_pair_counts,
@@ -264,15 +264,18 @@ def _run_algo(algo, params, edges, nodes, gt_pair_counts, total_pairs):
     started = _time.perf_counter()
 
     if algo == "hypercommon":
-        from hypercommon.algorithm import get_communities as _detect
-        from predicates.jaccard import closed_neighborhood_jaccard_predicate as _predicate
+        from hypercommon.algorithm import get_communities_multi as _detect_multi
+        from predicates.jaccard import closed_neighborhood_jaccard as _value
 
         best_omega = float("-inf")
         best_t = None
         best_count = 0
-        for t in params["t_grid"]:
+        try:
+            per_t = _detect_multi(G, _value, params["t_grid"])
+        except Exception:
+            per_t = []
+        for t, communities in zip(params["t_grid"], per_t):
             try:
-                communities = _detect(G, _predicate(t))
                 score = _omega(gt_pair_counts, _pair_counts(communities), total_pairs)
             except Exception:
                 continue
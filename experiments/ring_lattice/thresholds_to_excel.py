@@ -1,20 +1,18 @@
-import networkx as nx
 import pandas as pd
 
 from generators.ring_lattice import ring_lattice
-from hypercommon.hypergraph import build_hypergraph
-from predicates.jaccard import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from hypercommon.hypergraph import hypergraph_stats
+from predicates.jaccard import closed_neighborhood_jaccard
 from utils.threshold import representative_thresholds
 
 
-def degree_stats(H: nx.Graph):
-    if H.number_of_nodes() == 0:
+def degree_stats(stats):
+    if stats["triples"] == 0:
         return {
             "Degree Set": "{}"
         }
 
-    degs = [d for _, d in H.degree]
-    s = sorted(set(degs))
+    s = sorted(stats["degrees"])
 
     return {
         "Degree Set": "{" + ",".join(map(str, s)) + "}"
@@ -39,16 +37,14 @@ def run_experiment(configs, output_path="results/commonality_thresholds.xlsx"):
 
         rows = []
 
-        for t in thresholds:
-            H = build_hypergraph(G, closed_neighborhood_jaccard_predicate(t))
-
-            stats = degree_stats(H)
-
+        # every threshold counted from one enumeration, without building H
+        for stats in hypergraph_stats(G, closed_neighborhood_jaccard, thresholds):
             rows.append({
-                "Threshold": round(t, 6),
-                "H Nodes": H.number_of_nodes(),
-                "H Edges": H.number_of_edges(),
-                **stats
+                "Threshold": round(stats["threshold"], 6),
+                "H Nodes": stats["triples"],
+                "H Edges": stats["links"],
+                "Communities": stats["communities"],
+                **degree_stats(stats)
             })
 
         df = pd.DataFrame(rows)
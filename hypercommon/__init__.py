@@ -1,3 +1,17 @@
-from hypercommon.algorithm import get_communities
+from hypercommon.algorithm import get_communities, get_communities_multi, iter_communities
+from hypercommon.budget import Budget
+from hypercommon.dynamic import DynamicHypercommon
+from hypercommon.index import CommunityIndex
+from hypercommon.prepared import PreparedGraph
+from hypercommon.sharded import get_communities_sharded
 
-__all__ = ["get_communities"]
\ No newline at end of file
+__all__ = [
+    "get_communities",
+    "get_communities_multi",
+    "get_communities_sharded",
+    "iter_communities",
+    "Budget",
+    "CommunityIndex",
+    "DynamicHypercommon",
+    "PreparedGraph",
+]
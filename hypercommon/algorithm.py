@@ -1,22 +1,51 @@
 from collections import deque
 
 import networkx as nx
-from hypercommon.hypergraph import build_hypergraph
-from hypercommon.hypernode import HCNode
+import numpy as np
+from hypercommon.budget import _Exhausted
+from hypercommon.components import communities_by_component
+from hypercommon.hypergraph import ADMISSION_CHUNK, _admission_order, _enumerate_triples, _validate, build_hypergraph
+from hypercommon.parallel import communities_parallel, node_communities_parallel
+from hypercommon.unionfind import DisjointSet
+from hypercommon.vectorized import communities_numpy
 
 def get_communities(
     G: nx.Graph,
     commonality_predicate,
+    engine="unionfind",
+    workers=None,
+    memo=None,
 ):
     """
     Compute communities using the Hypercommon method.
 
     Parameters
     ----------
-    G : nx.Graph
-        Input graph.
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+        Input graph. Pass a PreparedGraph to reuse HCNodes and commonality
+        values across calls on the same snapshot.
     commonality_predicate : callable
         Function f(u: HCNode, v: HCNode) -> bool.
+    engine : {"unionfind", "hypergraph", "parallel", "numpy"}
+        "unionfind" streams admitted triples into a disjoint-set over node
+        pairs and never materialises the hypergraph. "hypergraph" builds H with
+        build_hypergraph and takes its connected components. "parallel" runs
+        the union-find engine with the centers split across worker processes
+        sharing the graph (see communities_parallel). "numpy" does the whole
+        pipeline in array form (see communities_numpy); it needs a predicate
+        with a commonality table or a batch form. All return the same
+        communities in the same order.
+    workers : int or concurrent.futures.Executor, optional
+        With engine="parallel", the number of processes (default: all CPUs).
+        Otherwise, split G into connected components (no triple spans two)
+        and process them across this many worker processes, or on this
+        executor. Either way the predicate must pickle; ThresholdPredicate
+        does.
+    memo : dict, optional
+        Also split into components, and reuse a component's communities from
+        memo when the same predicate has seen the same edge set before. Pass
+        one dict across the snapshots of a rewiring trajectory to skip every
+        component a step left untouched. See communities_by_component.
 
     Returns
     -------
@@ -24,20 +53,315 @@ def get_communities(
         List of communities (sets of nodes).
     """
 
-    H = build_hypergraph(G, commonality_predicate)
+    if engine not in ("unionfind", "hypergraph", "parallel", "numpy"):
+        raise ValueError("engine must be 'unionfind', 'hypergraph', 'parallel' or 'numpy'")
+    if engine == "parallel":
+        if memo is not None:
+            raise ValueError("memo needs engine='unionfind'")
+        if workers is not None and not isinstance(workers, int):
+            raise TypeError("engine='parallel' takes workers as a number of processes")
+        P = _validate(G, commonality_predicate)
+        return communities_parallel(P, commonality_predicate, workers=workers)
+    if workers is not None or memo is not None:
+        if engine != "unionfind":
+            raise ValueError("workers and memo need engine='unionfind'")
+        P = _validate(G, commonality_predicate)
+        return communities_by_component(P, commonality_predicate, workers=workers, memo=memo)
+    if engine == "unionfind":
+        return _communities_unionfind(G, commonality_predicate)
+    if engine == "numpy":
+        return communities_numpy(_validate(G, commonality_predicate), commonality_predicate)
+
+    return build_hypergraph(G, commonality_predicate).communities()
+
+
+def _communities_unionfind(G, commonality_predicate, with_centers=False):
+    """
+    Two triples are linked in H exactly when they share a pair, so a component
+    of H is a class of the relation "pairs that co-occur in an admitted triple".
+    Unioning the three pairs of every admitted triple therefore yields the
+    components of H without building it.
+
+    Pair ids are handed out in admission order, so the smallest pair id in a
+    class belongs to that component's first triple — iterating ids in order
+    reproduces the component order of nx.connected_components(H).
+
+    With with_centers=True each community comes as (community, center), where
+    center is the center its first triple was enumerated from.
+    """
+    P = _validate(G, commonality_predicate)
+    classes = _PairClasses(P, commonality_predicate, with_origins=with_centers)
+    classes.run()
+    classes.resolve_pending()
+
+    communities = classes.communities()
+    if not with_centers:
+        return [nodes for nodes, _ in communities]
+    return [(nodes, _center_of(P, classes.origins[p])) for nodes, p in communities]
+
+
+class _PairClasses:
+    """
+    The union-find over pairs behind _communities_unionfind.
+
+    Pairs are node-index pairs packed into one int, a * n + b with a < b (see
+    PreparedGraph.pair_key), so the whole run hashes ints only; node ids come
+    back in communities().
+
+    A candidate whose center pairs (i, j) and (j, k) already share a class can
+    only add the pair (i, k), whose nodes are both in that class already. Its
+    check is deferred: (i, k) is remembered with the class it would join, and
+    only matters if (i, k) also turns up in an admitted triple (it is merged
+    then) or was deferred from several classes that are still apart at the
+    end (it is checked then, by resolve_pending). In a large, well-connected
+    community most outer-pair checks are never paid.
+
+    run() can be given a range of centers, which is how the parallel engine
+    splits the work; its workers hand pairs, classes and pending pairs back
+    to a parent that merges them with add_pair and union.
+    """
+
+    __slots__ = ("P", "n", "predicate", "pair_id", "pairs", "dsu", "pending", "origins")
+
+    def __init__(self, P, commonality_predicate, with_origins=False):
+        self.P = P
+        self.n = len(P)
+        self.predicate = commonality_predicate
+        self.pair_id = {}
+        self.pairs = []
+        self.dsu = DisjointSet()
+        # pair key -> pair ids of the classes a deferred check of it would join
+        self.pending = {}
+        # with_origins: the index triple that created each pair id
+        self.origins = [] if with_origins else None
+
+    def add_pair(self, key):
+        """Id of pair key, creating it (and merging its pending classes) if new."""
+        p = self.pair_id.get(key)
+        if p is None:
+            p = self.dsu.add()
+            self.pair_id[key] = p
+            self.pairs.append(key)
+            anchors = self.pending.pop(key, None)
+            if anchors is not None:
+                for q in anchors:
+                    self.dsu.union(p, q)
+        return p
+
+    def run(self, centers=None):
+        n = self.n
+        pair_id = self.pair_id
+        pairs = self.pairs
+        find = self.dsu.find
+        union = self.dsu.union
+        add_pair = self.add_pair
+        pending = self.pending
+        origins = self.origins
+
+        def defer(i, j, k):
+            p = pair_id.get(i * n + j if i < j else j * n + i)
+            if p is None:
+                return False
+            q = pair_id.get(j * n + k if j < k else k * n + j)
+            if q is None or find(p) != find(q):
+                return False
+            key = i * n + k if i < k else k * n + i
+            if key in pair_id:
+                # already admitted elsewhere, so the triple may bridge two classes
+                return False
+            pending.setdefault(key, []).append(p)
+            return True
+
+        for triple in _enumerate_triples(self.P, self.predicate, defer=defer, centers=centers):
+            a, b, c = triple
+            created = len(pairs)
+            p = add_pair(a * n + b)
+            union(p, add_pair(a * n + c))
+            union(p, add_pair(b * n + c))
+            if origins is not None:
+                origins.extend([triple] * (len(pairs) - created))
+
+    def resolve_pending(self):
+        """Check the deferred pairs whose classes are still apart, merging those that pass."""
+        if not self.pending:
+            return
+        find = self.dsu.find
+        check = self.P.check_function(self.predicate, indexed=True)
+        n = self.n
+        for key, anchors in list(self.pending.items()):
+            if len({find(q) for q in anchors}) > 1 and check(*divmod(key, n)):
+                self.add_pair(key)
+        self.pending.clear()
+
+    def communities(self):
+        """(nodes, first pair id) per class, in order of first pair id."""
+        find = self.dsu.find
+        n = self.n
+        by_root = {}
+        first = {}
+        for p, key in enumerate(self.pairs):
+            root = find(p)
+            members = by_root.get(root)
+            if members is None:
+                members = by_root[root] = set()
+                first[root] = p
+            x, y = divmod(key, n)
+            members.add(x)
+            members.add(y)
+        nodes = self.P.nodes
+        return [({nodes[x] for x in members}, first[root]) for root, members in by_root.items()]
+
+
+def _center_of(P, triple):
+    """The center an index triple is enumerated from: the first, in node order, adjacent to the other two."""
+    a, b, c = triple
+    adjacent = P.adjacency_sets
+    center = min(
+        x for x, y, z in ((a, b, c), (b, a, c), (c, a, b))
+        if y in adjacent[x] and z in adjacent[x]
+    )
+    return P.nodes[center]
+
+
+def get_communities_multi(
+    G: nx.Graph,
+    commonality_value,
+    thresholds,
+):
+    """
+    Compute Hypercommon communities for many thresholds from one enumeration.
+
+    The predicate at threshold t is commonality_value(u, v) >= t, so a triple
+    is admissible at t exactly when the minimum of its three pair values is
+    >= t. Triples are enumerated once into arrays of pair ids, argsorted by
+    that admission level, and fed into a union-find from the highest
+    threshold down; the partition is read off as each requested threshold is
+    reached.
+
+    Parameters
+    ----------
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+        Input graph.
+    commonality_value : callable
+        Function f(u: HCNode, v: HCNode) -> float.
+    thresholds : iterable of float
+
+    Returns
+    -------
+    list[list[set]]
+        One entry per threshold, in the order given. Entry i equals
+        get_communities(G, lambda u, v: commonality_value(u, v) >= thresholds[i]),
+        including the order of the communities.
+    """
+
+    P = _validate(G, commonality_value)
+    thresholds = list(thresholds)
+    if not thresholds:
+        return []
+
+    # triples below every threshold are never admitted and are dropped
+    # before the sort
+    n = len(P)
+    pairs, pair_of, order, neg_levels = _admission_order(P, commonality_value, min(thresholds))
+    ends = np.stack([pairs // n, pairs % n], axis=1).tolist()
+
+    dsu = DisjointSet(len(pairs))
+    seen = bytearray(len(pairs))
+    # Per root: member nodes, and the enumeration index of the component's
+    # first triple, which is what orders get_communities' output.
+    members = {}
+    first = {}
+
+    def add(p, index):
+        if not seen[p]:
+            seen[p] = 1
+            members[p] = set(ends[p])
+            first[p] = index
+
+    def join(p, q):
+        rp = dsu.find(p)
+        rq = dsu.find(q)
+        if rp == rq:
+            return
+        dsu.union(rp, rq)
+        root, other = (rp, rq) if dsu.find(rp) == rp else (rq, rp)
+        keep, merge = members[root], members.pop(other)
+        if len(keep) < len(merge):
+            keep, merge = merge, keep
+        keep |= merge
+        members[root] = keep
+        first[root] = min(first[root], first.pop(other))
+
+    nodes = P.nodes
+    results = {}
+    cursor = 0
+    for t in sorted(set(thresholds), reverse=True):
+        stop = int(np.searchsorted(neg_levels, -t, side="right"))
+        for start in range(cursor, stop, ADMISSION_CHUNK):
+            end = min(start + ADMISSION_CHUNK, stop)
+            for index, (p, q, r) in zip(order[start:end].tolist(), pair_of[start:end].tolist()):
+                add(p, index)
+                add(q, index)
+                add(r, index)
+                join(p, q)
+                join(p, r)
+        cursor = stop
+
+        roots = sorted(members, key=first.__getitem__)
+        results[t] = [{nodes[x] for x in members[root]} for root in roots]
+
+    return [results[t] for t in thresholds]
+
+
+def iter_communities(G: nx.Graph, commonality_predicate):
+    """
+    Yield the communities of get_communities one at a time, as each completes.
+
+    Triples are enumerated in get_communities order. The first triple not in
+    a community already yielded starts a new one, which is grown to its end
+    with the local expansion of get_node_community and yielded at once;
+    its pairs are then marked covered, and enumeration skips every candidate
+    with a covered center pair without checking it further. Communities come
+    out in get_communities order, the first one after a single component's
+    work, and only the open community and the covered pairs (as packed ints)
+    are held, so a consumer that stops early pays for what it took.
+
+    Parameters
+    ----------
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+    commonality_predicate : callable (u: HCNode, v: HCNode) -> bool
+
+    Returns
+    -------
+    iterator of set
+        The nodes of each community. The inputs are checked, and G prepared,
+        by the call itself; the enumeration starts with the first next().
+    """
+    return _iter_communities(_validate(G, commonality_predicate), commonality_predicate)
+
 
-    communities = []
+def _iter_communities(P, commonality_predicate):
+    """The generator behind iter_communities, on a prepared graph."""
+    check, prefetch = P.check_functions(commonality_predicate, indexed=True)
+    n = len(P)
+    nodes = P.nodes
+    covered = set()
 
-    for component in nx.connected_components(H):
-        nodes = set()
-        for hypernode in component:
-            nodes.update(hypernode)
-        communities.append(nodes)
+    def defer(i, j, k):
+        # a triple is in an earlier community exactly when any of its pairs is
+        return (
+            (i * n + j if i < j else j * n + i) in covered
+            or (j * n + k if j < k else k * n + j) in covered
+        )
 
-    return communities
+    for triple in _enumerate_triples(P, commonality_predicate, defer=defer):
+        pairs = set()
+        community = _local_community(P, check, prefetch, None, start=triple, pairs=pairs)
+        covered.update(x * n + y for x, y in pairs)
+        yield {nodes[x] for x in community}
 
 
-def get_node_community(G: nx.Graph, commonality_predicate, v):
+def get_node_community(G: nx.Graph, commonality_predicate, v, budget=None):
     """
     Find one community containing node v using local hypergraph expansion.
 
@@ -47,33 +371,136 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
 
     Parameters
     ----------
-    G : nx.Graph
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+        A networkx (or neighbors()/has_edge()) graph is read lazily: only the
+        nodes the search reaches get an HCNode (see LazyGraph), so the query
+        costs in proportion to the community's volume. A PreparedGraph keeps
+        its HCNodes and, for ThresholdPredicate predicates, its commonality
+        values warm across repeated queries. Pass LazyGraph(G, cache_limit)
+        to bound the pair cache of a lazy query.
     commonality_predicate : callable (u: HCNode, v: HCNode) -> bool
     v : node in G
+    budget : Budget, optional
+        Limits on pair checks, community size and wall time. When one is
+        reached the search stops and returns the community found so far (None
+        if no triple was found yet), and budget.truncated is set. Pairs are
+        then checked one at a time, without a batch predicate's prefetch.
 
     Returns
     -------
     set of nodes, or None if v is not in any community
     """
 
-    # HCNode cache — built from original G, never mutated
-    hc = {u: HCNode(u, set(G.neighbors(u))) for u in G.nodes()}
+    P = _validate(G, commonality_predicate, lazy=True)
+    if v not in P:
+        raise nx.NetworkXError(f"The node {v} is not in the graph.")
+
+    # The search runs on node indices (see PreparedGraph.adjacency) and maps
+    # the community back to node ids at the end.
+    check, prefetch = P.check_functions(commonality_predicate, indexed=True)
+    if budget is not None:
+        # Every evaluation goes through the meter: a prefetch would evaluate
+        # a whole block of pairs past the limits before the search asks.
+        prefetch = None
+        budget._start()
+        check = budget._metered(check)
+    found = _local_community(P, check, prefetch, P.index[v], budget)
+    if found is None:
+        return None
+    nodes = P.nodes
+    return {nodes[x] for x in found}
+
+
+def get_node_communities(G: nx.Graph, commonality_predicate, seeds, workers=None):
+    """
+    get_node_community for many seed nodes at once.
+
+    The searches share one view of G and one predicate cache, so a pair
+    checked for one seed is free for every later one. A seed inside a
+    community already found is answered with that community instead of being
+    searched again. That is always a community containing the seed, as
+    get_node_community guarantees; for a seed in several overlapping
+    communities it need not be the one get_node_community would pick.
+
+    Parameters
+    ----------
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+    commonality_predicate : callable (u: HCNode, v: HCNode) -> bool
+    seeds : iterable of nodes in G
+    workers : int, optional
+        Split the seeds into contiguous chunks and search them in this many
+        processes, each with its own view and cache; seeds are only skipped
+        against the communities of their own chunk. G and the predicate must
+        pickle (ThresholdPredicate does).
+
+    Returns
+    -------
+    dict
+        seed -> set of nodes, or None if the seed is in no community. Seeds in
+        the same community share one set.
+    """
+    P = _validate(G, commonality_predicate, lazy=True)
+    seeds = list(dict.fromkeys(seeds))
+    for v in seeds:
+        if v not in P:
+            raise nx.NetworkXError(f"The node {v} is not in the graph.")
+
+    if workers is None or workers == 1 or len(seeds) < 2:
+        check, prefetch = P.check_functions(commonality_predicate, indexed=True)
+        found = _seed_communities(P, check, prefetch, seeds)
+    else:
+        found = node_communities_parallel(G, commonality_predicate, seeds, workers)
+
+    shared = {}
+    return {
+        v: None if c is None else shared.setdefault(frozenset(c), c)
+        for v, c in zip(seeds, found)
+    }
+
+
+def _seed_communities(P, check, prefetch, seeds):
+    """A community (set of node ids) or None per seed, skipping seeds already covered."""
+    index = P.index
+    nodes = P.nodes
+    covering = {}
+    isolated = set()
+    found = []
+    for v in seeds:
+        i = index[v]
+        community = covering.get(i)
+        if community is None and i not in isolated:
+            members = _local_community(P, check, prefetch, i)
+            if members is None:
+                isolated.add(i)
+            else:
+                community = {nodes[x] for x in members}
+                for x in members:
+                    covering.setdefault(x, community)
+        found.append(community)
+    return found
+
+
+def _local_community(P, check, prefetch, v, budget=None, start=None, pairs=None):
+    """
+    The search behind get_node_community, on node indices: the index set of
+    a community containing node index v, or None.
 
-    # Predicate cache
-    predicate_cache = {}
+    check and prefetch are P's indexed check functions, which callers may
+    share across searches. If budget runs out, the part found so far.
 
-    def check(a, b):
-        key = (a, b) if a < b else (b, a)
-        if key not in predicate_cache:
-            predicate_cache[key] = commonality_predicate(hc[key[0]], hc[key[1]])
-        return predicate_cache[key]
+    start, an admissible index triple, skips the search for v's first triple
+    and expands the community of start instead. pairs, a set, is filled with
+    the community's pairs (x, y), x < y.
+    """
+    neighbors = P.adjacency
+    adjacent = P.adjacency_sets
 
     def has_center(a, b, c):
         """True if one of a, b, c is adjacent to the other two."""
         return (
-            (G.has_edge(a, b) and G.has_edge(a, c))
-            or (G.has_edge(b, a) and G.has_edge(b, c))
-            or (G.has_edge(c, a) and G.has_edge(c, b))
+            (b in adjacent[a] and c in adjacent[a])
+            or (a in adjacent[b] and c in adjacent[b])
+            or (a in adjacent[c] and b in adjacent[c])
         )
 
     def is_admissible(a, b, c):
@@ -85,12 +512,21 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
         only under a caller-side invariant; the result is memoised, so it costs a
         dict lookup.
         """
-        return has_center(a, b, c) and check(a, b) and check(a, c) and check(b, c)
+        return has_center(a, b, c) and passes(a, b, c)
+
+    def passes(a, b, c):
+        """The three pair checks of is_admissible, for a triple known to have a center."""
+        return check(a, b) and check(a, c) and check(b, c)
 
     def find_initial_triple(v):
-        nbrs = list(G.neighbors(v))
+        nbrs = neighbors[v]
         L = len(nbrs)
 
+        if prefetch is not None:
+            prefetch([(v, u) for u in nbrs])
+            passing = [u for u in nbrs if check(v, u)]
+            prefetch([(u, k) for idx, u in enumerate(passing) for k in passing[idx + 1:]])
+
         # v as center: check pairs among neighbors(v)
         for idx_a in range(L):
             u = nbrs[idx_a]
@@ -100,8 +536,17 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
                     return u, v, k
 
         # u as center: v -> u -> k
+        if prefetch is not None:
+            prefetch([
+                pair
+                for u in passing
+                for k in neighbors[u]
+                if k != v
+                for pair in ((u, k), (v, k))
+            ])
+
         for u in nbrs:
-            for k in G.neighbors(u):
+            for k in neighbors[u]:
                 if k == v:
                     continue
                 if check(v, u) and check(u, k) and check(v, k):
@@ -109,7 +554,7 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
 
         return None
 
-    def expand(initial_triple):
+    def expand(initial_triple, community):
         """Grow the community by walking the same triple-link structure that
         build_hypergraph builds, starting from one admissible triple.
 
@@ -117,16 +562,17 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
         triple. A pair is extended by any node n forming another admissible
         triple {x, y, n}; that triple contributes all three of its pairs back to
         the frontier, which is what makes this equivalent to the connected
-        component of the hypergraph.
+        component of the hypergraph. community is grown in place, so a search
+        stopped by its budget leaves what it had found there.
         """
-        community = set(initial_triple)
         a, b, c = initial_triple
 
         def pair_key(x, y):
             return (x, y) if x < y else (y, x)
 
         potential = deque([pair_key(a, b), pair_key(b, c), pair_key(a, c)])
-        queued_pairs = set(potential)
+        queued_pairs = pairs if pairs is not None else set()
+        queued_pairs.update(potential)
 
         def push(x, y):
             key = pair_key(x, y)
@@ -134,31 +580,64 @@ def get_node_community(G: nx.Graph, commonality_predicate, v):
                 queued_pairs.add(key)
                 potential.append(key)
 
-        while potential:
-            x, y = potential.popleft()
-
+        def candidates_of(x, y):
             # Candidates completing a triple with {x, y} must be adjacent to at
             # least one of them, otherwise no node of the triple can be a center.
-            candidates = set(G.neighbors(x))
-            candidates |= set(G.neighbors(y))
-            candidates.discard(x)
-            candidates.discard(y)
-
-            for n in candidates:
-                if not is_admissible(x, y, n):
-                    continue
-
-                community.add(n)
-
-                # Every pair of the newly admitted triple is a valid frontier —
-                # including (x, n) and (y, n).
-                push(x, n)
-                push(y, n)
+            # Walked straight off the two neighbor lists, without a merged set.
+            for n in neighbors[x]:
+                if n != y:
+                    yield n
+            nbrs_x = adjacent[x]
+            for n in neighbors[y]:
+                if n != x and n not in nbrs_x:
+                    yield n
+
+        # The frontier is drained a wave at a time — everything queued so far —
+        # which is the same FIFO order as popping one pair at a time, but lets a
+        # batch predicate evaluate the whole wave's pairs in one call. The
+        # centred candidates the prefetch collects are the ones then admitted,
+        # so they are only walked once.
+        while potential:
+            wave = list(potential)
+            potential.clear()
+
+            if prefetch is None:
+                todo = ((x, y, candidates_of(x, y)) for x, y in wave)
+                admissible = is_admissible
+            else:
+                todo = [
+                    (x, y, [n for n in candidates_of(x, y) if has_center(x, y, n)])
+                    for x, y in wave
+                ]
+                prefetch([pair for x, y, centred in todo for n in centred for pair in ((x, n), (y, n))])
+                admissible = passes
+
+            for x, y, candidates in todo:
+                for n in candidates:
+                    if not admissible(x, y, n):
+                        continue
+
+                    if n not in community:
+                        if budget is not None:
+                            budget._admit(len(community))
+                        community.add(n)
+
+                    # Every pair of the newly admitted triple is a valid frontier —
+                    # including (x, n) and (y, n).
+                    push(x, n)
+                    push(y, n)
 
         return community
 
-    triple = find_initial_triple(v)
-    if triple is None:
-        return None
-
-    return expand(triple)
\ No newline at end of file
+    found = None
+    try:
+        triple = find_initial_triple(v) if start is None else start
+        if triple is None:
+            return None
+        if budget is not None:
+            budget._admit(2)
+        found = set(triple)
+        expand(triple, found)
+    except _Exhausted:
+        pass
+    return found
\ No newline at end of file
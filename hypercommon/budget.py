@@ -0,0 +1,95 @@
+import time
+
+
+class _Exhausted(Exception):
+    """Raised inside a local query when its Budget runs out."""
+
+
+class Budget:
+    """
+    Limits on the work of one local query, and what happened to it.
+
+    A query given a Budget stops as soon as any limit is reached and returns
+    what it has found so far, with truncated set and reason naming the limit.
+    The outcome fields describe the last query the budget was passed to; the
+    limits can be reused across queries.
+
+    Parameters
+    ----------
+    max_checks : int, optional
+        Pair checks (commonality_predicate evaluations, cached or not). A
+        budgeted query checks pairs one at a time, so a batch predicate is
+        not asked ahead of the search for pairs it may never reach.
+    max_size : int, optional
+        Nodes in the community; the result never has more.
+    max_seconds : float, optional
+        Wall time, measured from the start of the query.
+
+    Attributes
+    ----------
+    checks : int
+        Pair checks the last query made.
+    truncated : bool
+    reason : {None, "checks", "size", "seconds"}
+    """
+
+    __slots__ = ("max_checks", "max_size", "max_seconds", "checks", "truncated", "reason", "_deadline")
+
+    def __init__(self, max_checks=None, max_size=None, max_seconds=None):
+        for name, limit in (("max_checks", max_checks), ("max_size", max_size), ("max_seconds", max_seconds)):
+            if limit is not None and limit < 0:
+                raise ValueError(f"{name} must not be negative")
+        self.max_checks = max_checks
+        self.max_size = max_size
+        self.max_seconds = max_seconds
+        self._reset()
+
+    def _reset(self):
+        self.checks = 0
+        self.truncated = False
+        self.reason = None
+        self._deadline = None
+
+    def _start(self):
+        """Reset the outcome fields and start the clock for a new query."""
+        self._reset()
+        if self.max_seconds is not None:
+            self._deadline = time.perf_counter() + self.max_seconds
+
+    def _stop(self, reason):
+        self.truncated = True
+        self.reason = reason
+        raise _Exhausted(reason)
+
+    def _metered(self, check):
+        """check, counting calls and stopping at max_checks or the deadline."""
+        max_checks = self.max_checks
+        deadline = self._deadline
+        if max_checks is None and deadline is None:
+
+            def counted(a, b):
+                self.checks += 1
+                return check(a, b)
+
+            return counted
+
+        clock = time.perf_counter
+
+        def limited(a, b):
+            if max_checks is not None and self.checks >= max_checks:
+                self._stop("checks")
+            if deadline is not None and clock() > deadline:
+                self._stop("seconds")
+            self.checks += 1
+            return check(a, b)
+
+        return limited
+
+    def _admit(self, size):
+        """Stop before a community of `size` nodes would grow past max_size."""
+        if self.max_size is not None and size >= self.max_size:
+            self._stop("size")
+
+    def __repr__(self):
+        state = f"truncated ({self.reason})" if self.truncated else "complete"
+        return f"Budget(checks={self.checks}, {state})"
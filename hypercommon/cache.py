@@ -0,0 +1,84 @@
+class ClockCache:
+    """
+    A fixed-capacity mapping with CLOCK (second-chance) eviction.
+
+    Behaves like the subset of dict the pair caches use: get(), [] assignment,
+    `in` and len(). Entries live in parallel slot lists; a hit sets the slot's
+    reference bit, and an insert into a full cache advances a hand around the
+    slots, clearing reference bits, until it finds one that was not used since
+    the hand last passed and reuses it. That approximates LRU at the cost of
+    one bit per entry and no reordering on hits.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of entries, at least 1.
+    """
+
+    __slots__ = ("capacity", "_slot", "_keys", "_vals", "_ref", "_hand")
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._slot = {}
+        self._keys = []
+        self._vals = []
+        self._ref = bytearray()
+        self._hand = 0
+
+    def __len__(self):
+        return len(self._slot)
+
+    def __contains__(self, key):
+        return key in self._slot
+
+    def get(self, key, default=None):
+        s = self._slot.get(key)
+        if s is None:
+            return default
+        self._ref[s] = 1
+        return self._vals[s]
+
+    def __setitem__(self, key, val):
+        s = self._slot.get(key)
+        if s is not None:
+            self._vals[s] = val
+            self._ref[s] = 1
+            return
+
+        if len(self._keys) < self.capacity:
+            self._slot[key] = len(self._keys)
+            self._keys.append(key)
+            self._vals.append(val)
+            self._ref.append(0)
+            return
+
+        ref = self._ref
+        hand = self._hand
+        while ref[hand]:
+            ref[hand] = 0
+            hand = (hand + 1) % self.capacity
+        del self._slot[self._keys[hand]]
+        self._slot[key] = hand
+        self._keys[hand] = key
+        self._vals[hand] = val
+        self._hand = (hand + 1) % self.capacity
+
+    def update(self, items):
+        for key, val in items:
+            self[key] = val
+
+    def clear(self):
+        self._slot.clear()
+        self._keys.clear()
+        self._vals.clear()
+        self._ref.clear()
+        self._hand = 0
+
+
+def pair_cache(capacity=None):
+    """An empty pair cache: a plain dict, or a ClockCache when capacity is set."""
+    if capacity is None:
+        return {}
+    return ClockCache(capacity)
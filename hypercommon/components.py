@@ -0,0 +1,124 @@
+import hashlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+
+def connected_parts(P):
+    """
+    Connected components of a PreparedGraph with at least three nodes, as node
+    lists in node order, ordered by their first node.
+
+    Smaller components cannot hold a triple, so they never carry a community.
+    """
+    neighbor_lists = P.neighbor_lists
+    seen = set()
+    parts = []
+    for s in P.nodes:
+        if s in seen:
+            continue
+        seen.add(s)
+        part = [s]
+        stack = [s]
+        while stack:
+            u = stack.pop()
+            for v in neighbor_lists[u]:
+                if v not in seen:
+                    seen.add(v)
+                    part.append(v)
+                    stack.append(v)
+        if len(part) >= 3:
+            parts.append(part)
+    return parts
+
+
+def edge_fingerprint(P, nodes):
+    """
+    A digest of the edge set induced on nodes, independent of edge order.
+
+    Edges are taken as pairs of node indices (P.index), so node ids are only
+    hashed and repr'd, never compared; the ids are included in index order,
+    so equal fingerprints name the same nodes. Two components with the same
+    fingerprint have the same edges, so they have the same communities under
+    the same predicate.
+    """
+    index = P.index
+    neighbor_lists = P.neighbor_lists
+    members = sorted(index[u] for u in nodes)
+    edges = sorted(
+        (i, j) if i < j else (j, i)
+        for u in nodes
+        for v in neighbor_lists[u]
+        for i, j in [(index[u], index[v])]
+    )
+    names = [P.nodes[i] for i in members]
+    return hashlib.blake2b(repr((names, edges)).encode(), digest_size=16).hexdigest()
+
+
+def _part_communities(part, commonality_predicate):
+    """Worker: (community, center of its first triple) for every community of part."""
+    from .algorithm import _communities_unionfind
+
+    return _communities_unionfind(part, commonality_predicate, with_centers=True)
+
+
+def communities_by_component(P, commonality_predicate, workers=None, memo=None):
+    """
+    get_communities over the connected components of P, one at a time.
+
+    Triples never span components, so each component's communities can be
+    found alone, in a worker process, or looked up in memo. The results are
+    merged back into get_communities order: communities are ordered by the
+    center of their first triple, and those sharing a center come from the
+    same component, which already orders them.
+
+    Parameters
+    ----------
+    P : PreparedGraph
+    commonality_predicate : callable
+        Must pickle when workers is given (ThresholdPredicate does), and be
+        hashable when memo is given.
+    workers : int or concurrent.futures.Executor, optional
+        Process count for a pool created for this call, or an executor to
+        submit to (reuse one across calls to avoid the start-up cost).
+    memo : dict, optional
+        Maps (commonality_predicate, edge_fingerprint) to a component's
+        results. Filled in by this call, so passing the same dict across
+        snapshots, e.g. the steps of a rewiring trajectory, reuses every
+        component no step has touched. A reused component keeps the community
+        order of the snapshot it was computed on.
+    """
+    parts = connected_parts(P)
+
+    results = [None] * len(parts)
+    keys = [None] * len(parts)
+    todo = []
+    for n, nodes in enumerate(parts):
+        if memo is not None:
+            keys[n] = (commonality_predicate, edge_fingerprint(P, nodes))
+            cached = memo.get(keys[n])
+            if cached is not None:
+                results[n] = cached
+                continue
+        todo.append(n)
+
+    subgraphs = [P.subgraph(parts[n]) for n in todo]
+    if workers is None or len(todo) < 2:
+        computed = [_part_communities(part, commonality_predicate) for part in subgraphs]
+    elif isinstance(workers, Executor):
+        computed = list(workers.map(_part_communities, subgraphs, [commonality_predicate] * len(todo)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_part_communities, subgraphs, [commonality_predicate] * len(todo)))
+
+    for n, found in zip(todo, computed):
+        results[n] = found
+        if memo is not None:
+            memo[keys[n]] = found
+
+    rank = P.index
+    ordered = [
+        (rank[center], local, nodes)
+        for found in results
+        for local, (nodes, center) in enumerate(found)
+    ]
+    ordered.sort(key=lambda item: item[:2])
+    return [set(nodes) for _, _, nodes in ordered]
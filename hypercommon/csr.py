@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class CSRAdjacency:
+    """
+    Compressed sparse row adjacency over contiguous node indices 0..n-1.
+
+    Row i of the adjacency is indices[indptr[i]:indptr[i + 1]], sorted
+    ascending. Self-loops are dropped, so a row is exactly the open
+    neighborhood N(i) and the closed neighborhood is that row plus i.
+
+    Attributes
+    ----------
+    indptr : np.ndarray of int64, shape (n + 1,)
+    indices : np.ndarray of int32, shape (nnz,)
+    degree : np.ndarray of int64, shape (n,)
+    """
+
+    __slots__ = ("indptr", "indices", "degree")
+
+    def __init__(self, indptr, indices):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.degree = np.diff(self.indptr)
+
+    @property
+    def n(self):
+        return len(self.indptr) - 1
+
+    def row(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    @classmethod
+    def from_neighbor_lists(cls, neighbor_lists, index):
+        """
+        Build from {node: iterable of neighbors} and {node: index}.
+
+        Rows follow the order of index's values, which must be 0..n-1.
+        """
+        n = len(index)
+        rows = [None] * n
+        for u, nbrs in neighbor_lists.items():
+            i = index[u]
+            rows[i] = sorted(index[x] for x in nbrs if x != u)
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in rows], out=indptr[1:])
+        indices = np.fromiter(
+            (x for r in rows for x in r), dtype=np.int32, count=int(indptr[-1])
+        )
+        return cls(indptr, indices)
+
+    def gather(self, rows, closed=False):
+        """
+        Concatenate the neighborhoods of many rows.
+
+        Returns (owner, nbr): nbr[k] is a neighbor of rows[owner[k]]. With
+        closed=True each row also lists itself.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        lens = self.degree[rows]
+        owner = np.repeat(np.arange(len(rows), dtype=np.int64), lens)
+        offsets = np.arange(int(lens.sum()), dtype=np.int64) - np.repeat(np.cumsum(lens) - lens, lens)
+        nbr = self.indices[self.indptr[rows][owner] + offsets].astype(np.int64)
+        if closed:
+            owner = np.concatenate((owner, np.arange(len(rows), dtype=np.int64)))
+            nbr = np.concatenate((nbr, rows))
+        return owner, nbr
+
+    def common_counts(self, us, vs, closed=False):
+        """
+        |N(u) & N(v)| for every pair (us[k], vs[k]), or |N[u] & N[v]| with closed=True.
+
+        Each pair's two neighborhoods are tagged with the pair's position and
+        sorted together; a neighbor shared by both appears twice in a row.
+        """
+        us = np.asarray(us, dtype=np.int64)
+        vs = np.asarray(vs, dtype=np.int64)
+        m = len(us)
+        if m == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        n = self.n
+        ou, nu = self.gather(us, closed)
+        ov, nv = self.gather(vs, closed)
+        keys = np.concatenate((ou * n + nu, ov * n + nv))
+        keys.sort()
+        dup = keys[1:][keys[1:] == keys[:-1]]
+        return np.bincount(dup // n, minlength=m)
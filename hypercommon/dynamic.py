@@ -0,0 +1,352 @@
+from collections import deque
+
+import networkx as nx
+
+from .hypergraph import admissible_triples
+from .hypernode import HCNode
+
+
+class DynamicHypercommon:
+    """
+    Hypercommon communities of a graph that changes one edge at a time.
+
+    Adding or removing edge (u, v) changes the HCNodes of u and v only, so the
+    only predicate values that can change are those of pairs touching u or v.
+    A triple can only change admissibility if one of its pairs changed value or
+    its center condition changed, and both require u or v to be a member. So
+    each update re-enumerates the triples containing u or v and diffs them
+    against the admitted ones. New triples merge components; lost triples
+    trigger a split check that grows from the affected pairs only until they
+    are known to be reconnected. Work per update scales with the
+    neighborhoods of u and v, not with the graph.
+
+    Parameters
+    ----------
+    G : nx.Graph
+        Initial graph. It is copied; later changes to G are not seen.
+    commonality_predicate : callable
+        Function f(u: HCNode, v: HCNode) -> bool.
+
+    Examples
+    --------
+    >>> dyn = DynamicHypercommon(G, closed_neighborhood_jaccard_predicate(0.2))
+    >>> dyn.remove_edge(0, 1)
+    >>> dyn.add_edge(0, 7)
+    >>> communities = dyn.communities()
+    """
+
+    def __init__(self, G, commonality_predicate):
+        if not isinstance(G, nx.Graph):
+            raise TypeError("G must be a networkx.Graph instance")
+        if not callable(commonality_predicate):
+            raise TypeError("commonality_predicate must be callable: commonality_predicate(u:HCNode, v:HCNode) -> bool")
+
+        self.predicate = commonality_predicate
+        self.adj = {u: set(G.neighbors(u)) for u in G.nodes()}
+        self.hc = {u: HCNode(u, nbrs) for u, nbrs in self.adj.items()}
+
+        # predicate results, with a per-node index for invalidation
+        self._cache = {}
+        self._partners = {}
+
+        # admitted triples, indexed by pair and by node
+        self._triples_of_pair = {}
+        self._triples_of_node = {}
+
+        # components: pair -> component id; component id -> its pairs, and
+        # node -> number of the component's pairs containing it
+        self._comp_of = {}
+        self._comp_pairs = {}
+        self._comp_nodes = {}
+        self._next_comp = 0
+
+        for triple in admissible_triples(G, commonality_predicate):
+            self._insert_triple(tuple(sorted(triple)))
+        self._rebuild(list(self._triples_of_pair))
+
+    # ---- public API ----
+
+    def add_edge(self, u, v):
+        """Add edge (u, v), creating either node if needed. No-op if present."""
+        if u == v:
+            raise ValueError("self-loops are not supported")
+        for x in (u, v):
+            if x not in self.adj:
+                self.adj[x] = set()
+                self.hc[x] = HCNode(x, self.adj[x])
+        if v in self.adj[u]:
+            return
+        self._update(u, v, add=True)
+
+    def remove_edge(self, u, v):
+        """Remove edge (u, v). Raises KeyError if it is not in the graph."""
+        if u not in self.adj or v not in self.adj[u]:
+            raise KeyError(f"edge ({u!r}, {v!r}) is not in the graph")
+        self._update(u, v, add=False)
+
+    def has_edge(self, u, v):
+        return u in self.adj and v in self.adj[u]
+
+    def communities(self):
+        """Current communities, as a list of node sets (order unspecified)."""
+        return [set(counts) for counts in self._comp_nodes.values()]
+
+    def number_of_triples(self):
+        return sum(len(ts) for ts in self._triples_of_pair.values()) // 3
+
+    # ---- internals ----
+
+    @staticmethod
+    def _key(a, b):
+        return (a, b) if a < b else (b, a)
+
+    def _check(self, a, b):
+        key = (a, b) if a < b else (b, a)
+        val = self._cache.get(key)
+        if val is None:
+            val = self.predicate(self.hc[key[0]], self.hc[key[1]])
+            self._cache[key] = val
+            self._partners.setdefault(a, set()).add(b)
+            self._partners.setdefault(b, set()).add(a)
+        return val
+
+    def _invalidate(self, x):
+        for y in self._partners.pop(x, ()):
+            self._cache.pop(self._key(x, y), None)
+            partners = self._partners.get(y)
+            if partners is not None:
+                partners.discard(x)
+
+    def _pairs(self, triple):
+        a, b, c = triple
+        return (a, b), (a, c), (b, c)
+
+    def _insert_triple(self, triple):
+        for pair in self._pairs(triple):
+            self._triples_of_pair.setdefault(pair, set()).add(triple)
+        for x in triple:
+            self._triples_of_node.setdefault(x, set()).add(triple)
+
+    def _drop_triple(self, triple):
+        for pair in self._pairs(triple):
+            triples = self._triples_of_pair[pair]
+            triples.discard(triple)
+            if not triples:
+                del self._triples_of_pair[pair]
+        for x in triple:
+            triples = self._triples_of_node[x]
+            triples.discard(triple)
+            if not triples:
+                del self._triples_of_node[x]
+
+    def _triples_through(self, *xs):
+        """Admissible triples containing any of xs, against the current graph."""
+        adj = self.adj
+        check = self._check
+        found = set()
+
+        for x in xs:
+            # Both centers need x's pair with the center's neighbor to pass,
+            # so only neighbors passing with x are ever paired.
+            nbrs = [j for j in adj[x] if check(x, j)]
+            # x as center
+            for idx, i in enumerate(nbrs):
+                for k in nbrs[idx + 1:]:
+                    found.add(tuple(sorted((i, x, k))))
+            # a neighbor of x as center
+            for j in nbrs:
+                for k in adj[j]:
+                    if k != x and check(j, k):
+                        found.add(tuple(sorted((x, j, k))))
+
+        return {
+            (a, b, c) for a, b, c in found
+            if check(a, b) and check(a, c) and check(b, c)
+        }
+
+    def _update(self, u, v, add):
+        before = self._triples_of_node.get(u, set()) | self._triples_of_node.get(v, set())
+
+        if add:
+            self.adj[u].add(v)
+            self.adj[v].add(u)
+        else:
+            self.adj[u].discard(v)
+            self.adj[v].discard(u)
+        self.hc[u] = HCNode(u, self.adj[u])
+        self.hc[v] = HCNode(v, self.adj[v])
+        self._invalidate(u)
+        self._invalidate(v)
+
+        after = self._triples_through(u, v)
+
+        # Most triples through u and v keep their admissibility; only the
+        # difference touches the components.
+        removed = before - after
+        added = after - before
+
+        for triple in removed:
+            self._drop_triple(triple)
+
+        touched = {}
+        for pair in {pair for triple in removed for pair in self._pairs(triple)}:
+            cid = self._comp_of[pair]
+            if pair in self._triples_of_pair:
+                touched.setdefault(cid, set()).add(pair)
+            else:
+                self._release_pair(pair, cid)
+        for cid, pairs in touched.items():
+            if cid in self._comp_pairs:
+                self._split(cid, pairs)
+
+        for triple in added:
+            self._insert_triple(triple)
+            self._join(triple)
+
+    def _release_pair(self, pair, cid):
+        """Take a pair that no admitted triple holds any more out of its component."""
+        del self._comp_of[pair]
+        pairs = self._comp_pairs[cid]
+        pairs.discard(pair)
+        counts = self._comp_nodes[cid]
+        for x in pair:
+            counts[x] -= 1
+            if not counts[x]:
+                del counts[x]
+        if not pairs:
+            del self._comp_pairs[cid]
+            del self._comp_nodes[cid]
+
+    def _new_component(self, pairs):
+        cid = self._next_comp
+        self._next_comp += 1
+        counts = {}
+        for pair in pairs:
+            self._comp_of[pair] = cid
+            for x in pair:
+                counts[x] = counts.get(x, 0) + 1
+        self._comp_pairs[cid] = set(pairs)
+        self._comp_nodes[cid] = counts
+        return cid
+
+    def _join(self, triple):
+        """Merge the components of a newly admitted triple's pairs, small into large."""
+        cids = set()
+        fresh = []
+        for pair in self._pairs(triple):
+            cid = self._comp_of.get(pair)
+            if cid is None:
+                fresh.append(pair)
+            else:
+                cids.add(cid)
+
+        if not cids:
+            self._new_component(fresh)
+            return
+
+        target = max(cids, key=lambda c: len(self._comp_pairs[c]))
+        pairs = self._comp_pairs[target]
+        counts = self._comp_nodes[target]
+        for cid in cids - {target}:
+            moved = self._comp_pairs.pop(cid)
+            for pair in moved:
+                self._comp_of[pair] = target
+            pairs |= moved
+            for x, c in self._comp_nodes.pop(cid).items():
+                counts[x] = counts.get(x, 0) + c
+        for pair in fresh:
+            self._comp_of[pair] = target
+            pairs.add(pair)
+            for x in pair:
+                counts[x] = counts.get(x, 0) + 1
+
+    def _split(self, cid, sources):
+        """
+        Find out whether component cid fell apart after losing some triples.
+
+        Every piece the component can break into contains one of the sources
+        (the surviving pairs of the removed triples), so a BFS is grown from
+        all sources at once, one step per wave in turn, and waves that meet are
+        merged. Once at most one group of waves is still growing, every
+        finished group is a complete piece of its own and the growing one is
+        the remainder, which keeps the id. In a well-connected community the
+        waves meet within a step or two, so this stays local.
+        """
+        if len(sources) < 2:
+            return
+
+        triples_of_pair = self._triples_of_pair
+        sources = list(sources)
+        parent = list(range(len(sources)))
+
+        def find(w):
+            while parent[w] != w:
+                parent[w] = parent[parent[w]]
+                w = parent[w]
+            return w
+
+        wave_of = {pair: w for w, pair in enumerate(sources)}
+        frontiers = [deque([pair]) for pair in sources]
+        visited = [[pair] for pair in sources]
+        active = set(range(len(sources)))
+
+        def growing_groups():
+            return {find(w) for w in active}
+
+        while len(growing_groups()) > 1:
+            for w in list(active):
+                if w not in active:
+                    continue
+                frontier = frontiers[w]
+                if not frontier:
+                    active.discard(w)
+                    continue
+                pair = frontier.popleft()
+                for triple in triples_of_pair[pair]:
+                    for other in self._pairs(triple):
+                        seen = wave_of.get(other)
+                        if seen is None:
+                            wave_of[other] = w
+                            frontier.append(other)
+                            visited[w].append(other)
+                        else:
+                            rw, rs = find(w), find(seen)
+                            if rw != rs:
+                                parent[rs] = rw
+
+        # A group with no growing wave has been explored completely.
+        growing = growing_groups()
+        pieces = {}
+        for w in range(len(sources)):
+            root = find(w)
+            if root not in growing:
+                pieces.setdefault(root, []).extend(visited[w])
+
+        for piece in pieces.values():
+            for pair in piece:
+                self._release_pair(pair, cid)
+            self._new_component(piece)
+
+    def _rebuild(self, seeds):
+        """Label the components reachable from seeds, skipping pairs no triple holds."""
+        triples_of_pair = self._triples_of_pair
+        comp_of = self._comp_of
+
+        for seed in seeds:
+            if seed in comp_of or seed not in triples_of_pair:
+                continue
+
+            pairs = [seed]
+            comp_of[seed] = None
+            queue = deque([seed])
+
+            while queue:
+                pair = queue.popleft()
+                for triple in triples_of_pair[pair]:
+                    for other in self._pairs(triple):
+                        if other not in comp_of:
+                            comp_of[other] = None
+                            pairs.append(other)
+                            queue.append(other)
+
+            self._new_component(pairs)
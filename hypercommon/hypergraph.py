@@ -1,5 +1,387 @@
+from array import array
+from collections import Counter
+from itertools import chain
+
 import networkx as nx
-from .hypernode import HCNode
+import numpy as np
+
+from .prepared import _LazyRows, prepare
+from .unionfind import DisjointSet
+
+
+def _validate(G, commonality_predicate, lazy=False):
+    """Check the inputs and return G as a PreparedGraph (see prepare for the accepted forms and lazy)."""
+    if not callable(commonality_predicate):
+        raise TypeError("commonality_predicate must be callable: commonality_predicate(u:HCNode, v:HCNode) -> bool")
+    return prepare(G, lazy=lazy)
+
+
+def admissible_triples(G, commonality_predicate):
+    """
+    Enumerate the admissible triples of G, in the order build_hypergraph adds them.
+
+    A triple {i, j, k} is admissible when some center j is adjacent to the other
+    two and all three pairs pass the commonality_predicate. Each triple is
+    yielded once, its nodes in node order (sorted, for the usual integer
+    graphs).
+
+    Returns
+    -------
+    iterator of triplets (i, j, k).
+    """
+
+    P = _validate(G, commonality_predicate)
+    nodes = P.nodes
+    return (
+        (nodes[a], nodes[b], nodes[c])
+        for a, b, c in _enumerate_triples(P, commonality_predicate)
+    )
+
+
+# Centers per prefetch round when the predicate can be evaluated in batch.
+# Large enough to amortise the per-call overhead of the vectorised predicate,
+# small enough that the pending pairs of one round stay cheap to hold.
+PREFETCH_BLOCK = 512
+
+
+def _prefetch_wedges(centers, neighbor_lists, check, prefetch):
+    """
+    Batch-evaluate every pair the triples centred on `centers` will test.
+
+    Center-to-neighbor pairs go first; a neighbor pair {i, k} is only needed
+    when both i and k pass with the center, since otherwise every triple
+    containing it from this center is already rejected.
+    """
+    prefetch([(j, i) for j in centers for i in neighbor_lists[j]])
+
+    pairs = []
+    for j in centers:
+        passing = [i for i in neighbor_lists[j] if check(j, i)]
+        for idx_a in range(len(passing)):
+            i = passing[idx_a]
+            for idx_b in range(idx_a + 1, len(passing)):
+                pairs.append((i, passing[idx_b]))
+    prefetch(pairs)
+
+
+def _size_pruned(P, size_bounds):
+    """
+    Per-center neighbor lists cut down by a predicate's size bounds.
+
+    Returns prune(j) -> (nbrs, limits), on node indices. nbrs keeps, in
+    neighbor order, the neighbors of j whose closed-neighborhood size is
+    within j's bounds; the others cannot pass with j, so no triple centred on
+    j can use them. limits is None when every two survivors are within each
+    other's bounds (the common case once the hub-sized outliers are gone),
+    otherwise the (lo, hi, sizes) needed to skip incompatible pairs of
+    survivors.
+    """
+    hc_list = P.hc_list
+    if isinstance(hc_list, list):
+        closed_size = [node.closed_size for node in hc_list]
+    else:
+        # a lazy graph: only the sizes of nodes the centers reach
+        closed_size = _LazyRows(lambda i: hc_list[i].closed_size)
+    adjacency = P.adjacency
+    memo = {}
+
+    def bounds(size):
+        b = memo.get(size)
+        if b is None:
+            b = memo[size] = size_bounds(size)
+        return b
+
+    def prune(j):
+        lo, hi = bounds(closed_size[j])
+        nbrs = []
+        sizes = []
+        for i in adjacency[j]:
+            size = closed_size[i]
+            if lo <= size <= hi:
+                nbrs.append(i)
+                sizes.append(size)
+        if not sizes or bounds(min(sizes))[1] >= max(sizes):
+            return nbrs, None
+        return nbrs, ([bounds(size) for size in sizes], sizes)
+
+    return prune
+
+
+def _enumerate_triples(P, commonality_predicate, defer=None, centers=None):
+    """
+    Yield the admissible triples of P, in build_hypergraph order.
+
+    Everything runs on node indices (P.index): triples come out as sorted
+    index tuples (a, b, c), a < b < c, and callers map them back to node ids
+    with P.nodes. Node ids are never compared or hashed here, so any hashable
+    ids work, and strings or tuples cost no more than ints.
+
+    centers, if given, restricts the enumeration to the triples those centers
+    (node ids) admit, visited in the order given. Every triple has exactly one
+    admitting center, so disjoint sets of centers enumerate disjoint sets of
+    triples.
+
+    defer(i, j, k), if given, is asked about every candidate whose center
+    pairs (i, j) and (j, k) have passed, before check(i, k) is paid for. When
+    it returns True the candidate is dropped without that check, and the
+    caller takes responsibility for it (see _PairClasses).
+    """
+    check, prefetch = P.check_functions(commonality_predicate, indexed=True)
+    commonality_value = getattr(commonality_predicate, "commonality_value", None)
+    if commonality_value is not None and P.is_complete(commonality_value):
+        # A precomputed table already caches every pair; nothing is left to prefetch.
+        prefetch = None
+    if centers is None:
+        order = range(len(P))
+    else:
+        index = P.index
+        order = [index[u] for u in centers]
+    adjacency = P.adjacency
+    adjacency_sets = P.adjacency_sets
+
+    size_bounds = getattr(commonality_predicate, "size_bounds", None)
+    prune = _size_pruned(P, size_bounds) if size_bounds is not None else None
+
+    block = PREFETCH_BLOCK if prefetch is not None else max(len(order), 1)
+    for start in range(0, len(order), block):
+        block_centers = order[start:start + block]
+        if prune is not None:
+            pruned = {j: prune(j) for j in block_centers}
+            wedge_lists = {j: nbrs for j, (nbrs, _) in pruned.items()}
+        else:
+            wedge_lists = adjacency
+        if prefetch is not None:
+            _prefetch_wedges(block_centers, wedge_lists, check, prefetch)
+
+        for j in block_centers:
+            # Only neighbors passing with j can be in a triple centred on j, so
+            # filter first and pair the survivors: at useful thresholds most
+            # center pairs fail, and the L^2 pairing shrinks to L'^2. Filtering
+            # keeps neighbor order, so triples come out in the same order.
+            nbrs = wedge_lists[j]
+            keep = [idx for idx, i in enumerate(nbrs) if check(i, j)]
+            passing = [nbrs[idx] for idx in keep]
+            if prune is not None and pruned[j][1] is not None:
+                bounds, sizes = pruned[j][1]
+                bounds = [bounds[idx] for idx in keep]
+                sizes = [sizes[idx] for idx in keep]
+            else:
+                bounds = None
+            L = len(passing)
+            for idx_a in range(L):
+                i = passing[idx_a]
+                nbrs_i = adjacency_sets[i]
+                earlier_i = i < j
+                if bounds is None:
+                    partners = passing[idx_a + 1:]
+                else:
+                    lo, hi = bounds[idx_a]
+                    partners = [
+                        passing[idx_b] for idx_b in range(idx_a + 1, L)
+                        if lo <= sizes[idx_b] <= hi
+                    ]
+                for k in partners:
+                    # A triangle has all three members as centers; only the
+                    # first in node order admits it, which is where the
+                    # enumeration would reach it first anyway.
+                    if k in nbrs_i and (earlier_i or k < j):
+                        continue
+                    if defer is not None and defer(i, j, k):
+                        continue
+                    if check(i, k):
+                        yield tuple(sorted((i, j, k)))
+
+
+def _triple_levels(P, commonality_value):
+    """
+    Yield (triple, level) for every triple with a center, in build_hypergraph order.
+
+    Triples are sorted index tuples, as in _enumerate_triples. level is the
+    minimum of the triple's three pair values, i.e. the largest threshold t at
+    which commonality_value(u, v) >= t admits the triple.
+    """
+    P.precompute(commonality_value)
+    value = P.value_function(commonality_value, indexed=True)
+    adjacency = P.adjacency
+    adjacency_sets = P.adjacency_sets
+
+    for j, nbrs in enumerate(adjacency):
+        L = len(nbrs)
+        for idx_a in range(L):
+            i = nbrs[idx_a]
+            nbrs_i = adjacency_sets[i]
+            earlier_i = i < j
+            for idx_b in range(idx_a + 1, L):
+                k = nbrs[idx_b]
+
+                # canonical center, as in _enumerate_triples
+                if k in nbrs_i and (earlier_i or k < j):
+                    continue
+
+                triple = tuple(sorted((i, j, k)))
+                a, b, c = triple
+                yield triple, min(value(a, b), value(a, c), value(b, c))
+
+
+# Triples per slice of the union-find loops over _admission_order, bounding
+# the Python ints a slice of its arrays is turned into.
+ADMISSION_CHUNK = 1 << 16
+
+
+def _admission_order(P, commonality_value, lowest):
+    """
+    The triples admitted at threshold lowest, as arrays sorted by admission.
+
+    Triples are enumerated once (_triple_levels) into flat arrays, so each
+    costs a few dozen bytes rather than a Python tuple. Returns (pairs,
+    pair_of, order, neg_levels):
+      - pairs: the distinct packed pair keys a * n + b, a < b, ascending
+      - pair_of: (T, 3) int32, the pair ids (positions in pairs) of each triple
+      - order: the enumeration index of each triple
+      - neg_levels: minus each triple's level, ascending
+    all in admission order: highest level first, enumeration order among
+    equals. The triples admitted at t >= lowest are the first
+    searchsorted(neg_levels, -t, side="right").
+    """
+    n = len(P)
+    flat = array("i")
+    levels = array("d")
+    for triple, level in _triple_levels(P, commonality_value):
+        if level >= lowest:
+            flat.extend(triple)
+            levels.append(level)
+    t64 = np.frombuffer(flat, dtype=np.int32).reshape(-1, 3).astype(np.int64)
+    keys = np.stack([t64[:, 0] * n + t64[:, 1], t64[:, 0] * n + t64[:, 2], t64[:, 1] * n + t64[:, 2]], axis=1)
+    del flat, t64
+    pairs, pair_of = np.unique(keys, return_inverse=True)
+    del keys
+
+    levels = np.frombuffer(levels, dtype=np.float64)
+    order = np.argsort(-levels, kind="stable")
+    pair_of = pair_of.reshape(-1, 3).astype(np.int32)[order]
+    return pairs, pair_of, order, -levels[order]
+
+
+class HyperGraph:
+    """
+    The hypergraph build_hypergraph returns, held as arrays.
+
+    Hypernode t is the triple of node indices triples[t] (ascending), and each
+    row (s, t) of links, s < t, joins two triples sharing a pair. Node index x
+    names node nodes[x]. At 12 bytes a triple and 8 a link, hypergraphs with
+    millions of triples stay inspectable; to_networkx() builds the
+    tuple-keyed nx.Graph when one is wanted.
+
+    Attributes
+    ----------
+    nodes : list
+        Node ids by index, as in PreparedGraph.nodes.
+    triples : np.ndarray of int32, shape (T, 3)
+        In enumeration order.
+    links : np.ndarray of int32, shape (E, 2)
+    """
+
+    __slots__ = ("nodes", "triples", "links")
+
+    def __init__(self, nodes, triples, links):
+        self.nodes = nodes
+        self.triples = triples
+        self.links = links
+
+    def __len__(self):
+        return len(self.triples)
+
+    def hypernodes(self):
+        """The triples as tuples of node ids, in enumeration order."""
+        nodes = self.nodes
+        return [(nodes[a], nodes[b], nodes[c]) for a, b, c in self.triples.tolist()]
+
+    def degree(self):
+        """Number of links at each triple, as an int64 array of shape (T,)."""
+        return np.bincount(self.links.ravel(), minlength=len(self.triples))
+
+    def components(self):
+        """
+        Connected components as arrays of triple indices, ascending.
+
+        Components are ordered by their first triple, which is the order
+        nx.connected_components gives on to_networkx().
+        """
+        T = len(self.triples)
+        if T == 0:
+            return []
+        count, label = _triple_components(T, self.links)
+        order = np.argsort(label, kind="stable")
+        bounds = np.searchsorted(label[order], np.arange(count + 1))
+        parts = [order[bounds[c]:bounds[c + 1]] for c in range(count)]
+        parts.sort(key=lambda part: part[0])
+        return parts
+
+    def communities(self):
+        """The node ids of each component, in the order of components()."""
+        nodes = self.nodes
+        return [
+            {nodes[x] for x in np.unique(self.triples[part]).tolist()}
+            for part in self.components()
+        ]
+
+    def to_networkx(self):
+        """The hypergraph as an nx.Graph keyed by node-id triples, each with a members attribute."""
+        H = nx.Graph()
+        labelled = self.hypernodes()
+        for triple in labelled:
+            H.add_node(triple, members=triple)
+        H.add_edges_from((labelled[s], labelled[t]) for s, t in self.links.tolist())
+        return H
+
+
+def _triple_components(T, links):
+    """(count, label) of the graph on T triples with the given links."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    adjacency = coo_matrix(
+        (np.ones(len(links), dtype=np.int8), (links[:, 0], links[:, 1])), shape=(T, T)
+    )
+    return connected_components(adjacency, directed=False)
+
+
+def _link_triples(triples, n, pair_connection_mode):
+    """
+    Links between triples sharing a pair.
+
+    "star" links every triple holding a pair to the first triple that held
+    it; "clique" links all of them to each other. Both give the same
+    components.
+    """
+    T = len(triples)
+    t64 = triples.astype(np.int64)
+    keys = np.stack([
+        t64[:, 0] * n + t64[:, 1],
+        t64[:, 0] * n + t64[:, 2],
+        t64[:, 1] * n + t64[:, 2],
+    ], axis=1).ravel()
+    owner = np.repeat(np.arange(T, dtype=np.int64), 3)
+
+    if pair_connection_mode == "star":
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        rep = owner[first][inverse]
+        later = rep != owner
+        links = np.stack([rep[later], owner[later]], axis=1)
+    else:
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(keys)])
+        links = [
+            (holders[a], holders[b])
+            for start, size in zip(starts.tolist(), sizes.tolist()) if size > 1
+            for holders in [owner[order[start:start + size]].tolist()]
+            for a in range(size)
+            for b in range(a + 1, size)
+        ]
+        links = np.array(links, dtype=np.int64).reshape(-1, 2)
+    return links.astype(np.int32)
 
 
 def build_hypergraph(G, commonality_predicate, pair_connection_mode="star"):
@@ -12,77 +394,224 @@ def build_hypergraph(G, commonality_predicate, pair_connection_mode="star"):
       - Edges connect hypernodes that share exactly two original nodes.
       - commonality_predicate(u, v) is a boolean predicate receiving HCNode objects.
 
+    G may be a PreparedGraph, in which case its HCNodes and value cache are reused,
+    or any other graph form prepare() accepts (CSR arrays, an edge array, ...).
+
+    pair_connection_mode : {"star", "clique"}
+        How triples sharing a pair are linked; see _link_triples.
+
     Returns
     -------
-    H : networkx.Graph whose nodes are sorted triplets (i, j, k).
+    HyperGraph
+        Triples and links as arrays; H.to_networkx() gives the nx.Graph whose
+        nodes are triplets (i, j, k) in node order.
     """
 
-    if not isinstance(G, nx.Graph):
-        raise TypeError("G must be a networkx.Graph instance")
-    if not callable(commonality_predicate):
-        raise TypeError("commonality_predicate must be callable: commonality_predicate(u:HCNode, v:HCNode) -> bool")
     if pair_connection_mode not in ("star", "clique"):
         raise ValueError("pair_connection_mode must be 'star' or 'clique'")
+    P = _validate(G, commonality_predicate)
 
-    # ---- Reduce to 2-core (kept for future use) ----
-    # G = nx.k_core(G, k=2)
+    triples = np.fromiter(
+        chain.from_iterable(_enumerate_triples(P, commonality_predicate)), dtype=np.int32
+    ).reshape(-1, 3)
+    return HyperGraph(P.nodes, triples, _link_triples(triples, len(P), pair_connection_mode))
 
-    nodes = list(G.nodes())
 
-    # ---- HCNode cache ----
-    hc = {u: HCNode(u, set(G.neighbors(u))) for u in nodes}
+def _shift_counts(counts, values, sign):
+    """The bincount array counts with the bincount of values added (sign 1) or taken off (sign -1)."""
+    if len(values) == 0:
+        return counts
+    extra = np.bincount(values)
+    if len(extra) > len(counts):
+        counts = np.concatenate([counts, np.zeros(len(extra) - len(counts), dtype=counts.dtype)])
+    counts[:len(extra)] += sign * extra
+    return counts
 
-    # ---- Hypergraph construction ----
-    H = nx.Graph()
-    pair_rep = {}
-    commonality_cache = {}
 
-    def check(a, b):
-        key = (a, b) if a < b else (b, a)
-        val = commonality_cache.get(key)
-        if val is None:
-            val = commonality_predicate(hc[key[0]], hc[key[1]])
-            commonality_cache[key] = val
-        return val
+def _nonzero_counts(counts):
+    """{value: count} of a bincount array, by ascending value, zero counts left out."""
+    present = np.flatnonzero(counts)
+    return dict(zip(present.tolist(), counts[present].tolist()))
 
-    def pair_key(x, y):
-        return (x, y) if x < y else (y, x)
 
-    seen = set()
+def hypergraph_stats(G, commonality_value, thresholds, pair_connection_mode="star"):
+    """
+    Statistics of build_hypergraph at many thresholds, without its links or communities.
 
-    for j in nodes:
-        nbrs = list(G.neighbors(j))
-        L = len(nbrs)
-        for idx_a in range(L):
-            i = nbrs[idx_a]
-            for idx_b in range(idx_a + 1, L):
-                k = nbrs[idx_b]
+    The predicate at threshold t is commonality_value(u, v) >= t, as in
+    get_communities_multi, and the approach is the same: triples are
+    enumerated once (_admission_order), sorted by admission level, and fed
+    into a union-find over their pairs from the highest threshold down.
+    Running counters are read off as each threshold is reached: triples,
+    links, per-pair holder counts, each triple's H-degree and their
+    histogram, class sizes and per-node multiplicity. Adding a level only
+    revisits the triples holding a pair that level touches.
 
-                triple = tuple(sorted((i, j, k)))
-                if triple in seen:
-                    continue
-                seen.add(triple)
+    Sorting by level needs every triple admitted at the lowest threshold at
+    hand, so memory is O(T): about 40 bytes per triple (its pair ids,
+    enumeration index, degree and place in the per-pair holder lists), plus
+    O(pairs + n). No link, hypergraph or community list is built, and the
+    thresholds add nothing to the memory.
 
-                a, b, c = triple
-                if not (check(a, b) and check(a, c) and check(b, c)):
-                    continue
+    Parameters
+    ----------
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+    commonality_value : callable
+        Function f(u: HCNode, v: HCNode) -> float.
+    thresholds : iterable of float
+    pair_connection_mode : {"star", "clique"}
+        The links counted, as in build_hypergraph.
+
+    Returns
+    -------
+    list[dict]
+        One entry per threshold, in the order given, with keys
+          - "threshold"
+          - "triples": len(H), the admissible triples
+          - "links": len(H.links)
+          - "degrees": {degree: number of triples}, the histogram of H.degree()
+          - "communities": the number of communities
+          - "community_sizes": {size: number of communities}
+          - "membership": {k: number of nodes in exactly k communities}, k = 0
+            included
+    """
+
+    if pair_connection_mode not in ("star", "clique"):
+        raise ValueError("pair_connection_mode must be 'star' or 'clique'")
+    P = _validate(G, commonality_value)
+    thresholds = list(thresholds)
+    if not thresholds:
+        return []
+
+    n = len(P)
+    pairs, pair_of, order, neg_levels = _admission_order(P, commonality_value, min(thresholds))
+    T = len(order)
+    m = len(pairs)
+    ends = np.stack([pairs // n, pairs % n], axis=1).tolist()
+
+    # The holders of each pair, by admission position: holders[starts[p]:]
+    # lists p's triples in the order they are admitted.
+    flat = pair_of.ravel()
+    holders = (np.argsort(flat, kind="stable") // 3).astype(np.int32)
+    starts = np.zeros(m + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=m), out=starts[1:])
+    del flat
+
+    held = np.zeros(m, dtype=np.int64)  # admitted triples holding each pair
+    first = np.full(m, T, dtype=np.int64)  # enumeration index of its first holder
+    degree = np.zeros(T, dtype=np.int64)  # H-degree, by admission position
+    degree_counts = np.zeros(1, dtype=np.int64)
+    pair_count = 0
+    clique_links = 0
+
+    dsu = DisjointSet(m)
+    seen = bytearray(m)
+    members = {}  # per root: member nodes
+    sizes = Counter()  # size -> classes
+    multiplicity = [0] * n  # node -> classes holding it
+    membership = Counter({0: n})  # multiplicity -> nodes
+
+    def bump(x, by):
+        k = multiplicity[x]
+        membership[k] -= 1
+        multiplicity[x] = k + by
+        membership[k + by] += 1
+
+    def add(p):
+        if not seen[p]:
+            seen[p] = 1
+            x, y = ends[p]
+            members[p] = {x, y}
+            bump(x, 1)
+            bump(y, 1)
+            sizes[2] += 1
+
+    def join(p, q):
+        rp = dsu.find(p)
+        rq = dsu.find(q)
+        if rp == rq:
+            return
+        dsu.union(rp, rq)
+        root, other = (rp, rq) if dsu.find(rp) == rp else (rq, rp)
+        keep, merge = members[root], members.pop(other)
+        sizes[len(keep)] -= 1
+        sizes[len(merge)] -= 1
+        if len(keep) < len(merge):
+            keep, merge = merge, keep
+        for x in merge:
+            if x in keep:
+                bump(x, -1)
+            else:
+                keep.add(x)
+        sizes[len(keep)] += 1
+        members[root] = keep
+
+    star = pair_connection_mode == "star"
+    results = {}
+    cursor = 0
+    for t in sorted(set(thresholds), reverse=True):
+        stop = int(np.searchsorted(neg_levels, -t, side="right"))
+        for start in range(cursor, stop, ADMISSION_CHUNK):
+            for p, q, r in pair_of[start:min(start + ADMISSION_CHUNK, stop)].tolist():
+                add(p)
+                add(q)
+                add(r)
+                join(p, q)
+                join(p, r)
+
+        if stop > cursor:
+            batch = pair_of[cursor:stop]
+            touched, count = np.unique(batch, return_counts=True)
+            old = held[touched]
+            new = old + count
+            held[touched] = new
+            pair_count += int(np.count_nonzero(old == 0))
+            clique_links += int((new * (new - 1) // 2 - old * (old - 1) // 2).sum())
+            old_first = first[touched]
+            np.minimum.at(first, batch.ravel(), np.repeat(order[cursor:stop], 3))
+            new_first = first[touched]
+
+            # New triples enter the histogram at degree 0 and are then
+            # updated like the rest. Touched pairs are taken a slice of about
+            # ADMISSION_CHUNK holders at a time, bounding the arrays below.
+            degree_counts[0] += stop - cursor
+            cuts = np.searchsorted(np.cumsum(new), np.arange(ADMISSION_CHUNK, int(new.sum()), ADMISSION_CHUNK))
+            for ids in np.split(np.arange(len(touched)), np.unique(cuts)):
+                # every admitted holder of these pairs: the first `new` of its holders
+                lengths = new[ids]
+                which = np.repeat(ids, lengths)
+                offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+                position = holders[starts[touched[which]] + np.arange(len(which)) - offsets]
+
+                # A pair adds held - 1 to the degree of each holder under
+                # "clique"; under "star" it links its first holder to each
+                # later one, so it adds held - 1 to the first and 1 to the others.
+                if star:
+                    enumerated = order[position]
+                    before = np.where(enumerated == old_first[which], old[which] - 1, 1)
+                    after = np.where(enumerated == new_first[which], new[which] - 1, 1)
+                else:
+                    before = old[which] - 1
+                    after = new[which] - 1
+                before[position >= cursor] = 0
+
+                affected, slot = np.unique(position, return_inverse=True)
+                change = np.zeros(len(affected), dtype=np.int64)
+                np.add.at(change, slot, after - before)
+                previous = degree[affected]
+                degree_counts = _shift_counts(degree_counts, previous, -1)
+                degree[affected] = previous + change
+                degree_counts = _shift_counts(degree_counts, previous + change, 1)
+            cursor = stop
+
+        results[t] = {
+            "threshold": t,
+            "triples": cursor,
+            "links": 3 * cursor - pair_count if star else clique_links,
+            "degrees": _nonzero_counts(degree_counts),
+            "communities": len(members),
+            "community_sizes": {k: v for k, v in sorted(sizes.items()) if v},
+            "membership": {k: v for k, v in sorted(membership.items()) if v},
+        }
 
-                H.add_node(triple, members=triple)
-
-                for x, y in ((a, b), (a, c), (b, c)):
-                    key = pair_key(x, y)
-                    rep = pair_rep.get(key)
-                    if rep is None:
-                        if pair_connection_mode == "star":
-                            pair_rep[key] = triple
-                        else:
-                            pair_rep[key] = [triple]
-                    else:
-                        if pair_connection_mode == "star":
-                            H.add_edge(triple, rep)
-                        else:
-                            for node in pair_rep[key]:
-                                H.add_edge(triple, node)
-                            pair_rep[key].append(triple)
-
-    return H
\ No newline at end of file
+    return [results[t] for t in thresholds]
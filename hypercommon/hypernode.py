@@ -3,16 +3,28 @@ class HCNode:
     A lightweight wrapper around a graph node that exposes:
       - neighbors: set of adjacent nodes
       - degree: number of neighbors
+      - closed_size: size of the closed neighborhood N[u] = neighbors | {id}
 
     This is what the user-defined f(u, v) receives.
+
+    A PreparedGraph also numbers its nodes and may attach compact forms of the
+    neighborhood over those numbers, for predicates that can use them:
+      - index: the node's position 0..n-1, or None
+      - bits: int bitset with bit i set for each neighbor of index i, or None
+      - array: sorted int32 numpy array of neighbor indices, or None
+    Neither form includes the node itself, and both ignore self-loops.
     """
 
-    __slots__ = ("id", "neighbors", "degree")
+    __slots__ = ("id", "neighbors", "degree", "closed_size", "index", "bits", "array")
 
-    def __init__(self, node_id, neighbors):
+    def __init__(self, node_id, neighbors, index=None, bits=None, array=None):
         self.id = node_id
         self.neighbors = neighbors
         self.degree = len(neighbors)
+        self.closed_size = self.degree if node_id in neighbors else self.degree + 1
+        self.index = index
+        self.bits = bits
+        self.array = array
 
     def __repr__(self):
-        return f"HCNode({self.id})"
\ No newline at end of file
+        return f"HCNode({self.id})"
@@ -0,0 +1,144 @@
+from numbers import Integral
+
+import numpy as np
+
+from .prepared import prepare
+
+
+class CommunityIndex:
+    """
+    Node -> community lookups over precomputed Hypercommon runs.
+
+    Holds, per threshold, the communities as CSR-style int32 arrays in both
+    directions: the members of each community, and the postings of each node
+    (the ids of the communities containing it, ascending). lookup(v, t) is
+    then a slice, with nothing re-expanded. Community ids are positions in
+    that threshold's get_communities order.
+
+    Build with CommunityIndex.build (one multi-threshold run) or
+    from_communities (results already at hand), and keep with save/load.
+
+    Attributes
+    ----------
+    nodes : list
+        Node ids; node i of the arrays is nodes[i].
+    thresholds : list of float
+    """
+
+    __slots__ = ("nodes", "thresholds", "_index", "_level", "_arrays")
+
+    def __init__(self, nodes, thresholds, arrays):
+        self.nodes = list(nodes)
+        self.thresholds = [float(t) for t in thresholds]
+        self._index = {u: i for i, u in enumerate(self.nodes)}
+        self._level = {t: k for k, t in enumerate(self.thresholds)}
+        # per threshold: (members_ptr, members, postings_ptr, postings)
+        self._arrays = arrays
+
+    @classmethod
+    def build(cls, G, commonality_value, thresholds):
+        """Index get_communities_multi(G, commonality_value, thresholds)."""
+        from .algorithm import get_communities_multi
+
+        P = prepare(G)
+        thresholds = list(thresholds)
+        per_t = get_communities_multi(P, commonality_value, thresholds)
+        return cls.from_communities(dict(zip(thresholds, per_t)), nodes=P.nodes)
+
+    @classmethod
+    def from_communities(cls, communities, nodes=None):
+        """
+        Index communities given as {threshold: list of node sets}.
+
+        nodes lists every node that may be looked up; by default, the members
+        of the communities, in order of first appearance.
+        """
+        if nodes is None:
+            nodes = {}
+            for found in communities.values():
+                for c in found:
+                    nodes.update(dict.fromkeys(c))
+        nodes = list(nodes)
+        index = {u: i for i, u in enumerate(nodes)}
+        n = len(nodes)
+
+        arrays = []
+        for found in communities.values():
+            sizes = np.array([len(c) for c in found], dtype=np.int64)
+            members_ptr = np.zeros(len(found) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=members_ptr[1:])
+            members = np.fromiter(
+                (index[u] for c in found for u in c), dtype=np.int32, count=int(members_ptr[-1])
+            )
+            for c in range(len(found)):
+                members[members_ptr[c]:members_ptr[c + 1]].sort()
+
+            owner = np.repeat(np.arange(len(found), dtype=np.int32), sizes)
+            order = np.argsort(members, kind="stable")
+            postings_ptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(members, minlength=n), out=postings_ptr[1:])
+            arrays.append((members_ptr, members, postings_ptr, owner[order]))
+        return cls(nodes, list(communities), arrays)
+
+    def _at(self, t):
+        k = self._level.get(float(t))
+        if k is None:
+            raise KeyError(f"threshold {t!r} is not indexed; indexed thresholds are {self.thresholds}")
+        return self._arrays[k]
+
+    def community_ids(self, v, t):
+        """Ids of the communities containing v at threshold t, as an int32 array."""
+        i = self._index.get(v)
+        if i is None:
+            raise KeyError(f"node {v!r} is not indexed")
+        _, _, postings_ptr, postings = self._at(t)
+        return postings[postings_ptr[i]:postings_ptr[i + 1]]
+
+    def members(self, c, t):
+        """The nodes of community c at threshold t, as a set."""
+        members_ptr, members, _, _ = self._at(t)
+        nodes = self.nodes
+        return {nodes[x] for x in members[members_ptr[c]:members_ptr[c + 1]].tolist()}
+
+    def lookup(self, v, t):
+        """The communities containing v at threshold t, in get_communities order."""
+        return [self.members(c, t) for c in self.community_ids(v, t).tolist()]
+
+    def communities(self, t):
+        """Every community at threshold t, in get_communities order."""
+        members_ptr = self._at(t)[0]
+        return [self.members(c, t) for c in range(len(members_ptr) - 1)]
+
+    def save(self, path):
+        """
+        Write the index to an .npz file.
+
+        Integer and string node ids are stored as plain arrays; any other ids
+        (mixed types, tuples) are pickled, and loading them then needs
+        allow_pickle=True.
+        """
+        if all(isinstance(u, Integral) for u in self.nodes):
+            nodes = np.array(self.nodes, dtype=np.int64)
+        elif all(isinstance(u, str) for u in self.nodes):
+            nodes = np.array(self.nodes, dtype=str)
+        else:
+            nodes = np.empty(len(self.nodes), dtype=object)
+            nodes[:] = self.nodes
+
+        arrays = {"nodes": nodes, "thresholds": np.array(self.thresholds, dtype=np.float64)}
+        for k, level in enumerate(self._arrays):
+            for name, array in zip(("members_ptr", "members", "postings_ptr", "postings"), level):
+                arrays[f"{name}_{k}"] = array
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path, allow_pickle=False):
+        """Read an index written by save()."""
+        with np.load(path, allow_pickle=allow_pickle) as data:
+            thresholds = data["thresholds"].tolist()
+            nodes = data["nodes"].tolist()
+            arrays = [
+                tuple(data[f"{name}_{k}"] for name in ("members_ptr", "members", "postings_ptr", "postings"))
+                for k in range(len(thresholds))
+            ]
+        return cls(nodes, thresholds, arrays)
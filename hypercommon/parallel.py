@@ -0,0 +1,219 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .hypernode import HCNode
+from .prepared import LazyGraph, _LazyRows
+
+# Center ranges per worker. More than one, so that a range heavy in
+# high-degree centers does not leave the other workers idle at the end.
+CHUNKS_PER_WORKER = 4
+
+# Set in each worker process by _init_worker: (_SharedGraph, predicate).
+_state = None
+
+
+def _shared_array(array):
+    """Copy a numpy array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+class _SharedGraph(LazyGraph):
+    """
+    A worker's view of the parent's graph, read from the shared CSR blocks.
+
+    The blocks stay mapped for the worker's lifetime and rows are read from
+    numpy views over them; a node's index row, neighbor set and HCNode are
+    only built when the worker's centers reach it, so a worker holds Python
+    objects for the part of the graph its ranges touch, not a copy of the
+    whole. Node indices are the parent's, so pair keys mean the same on both
+    sides. nodes names the rows, or is None when they are 0..n-1.
+    """
+
+    __slots__ = ("_blocks", "_indptr", "_indices", "_names")
+
+    def __init__(self, indptr_name, indices_name, n, nnz, nodes=None, cache_limit=None):
+        self._blocks = [
+            shared_memory.SharedMemory(name=indptr_name),
+            shared_memory.SharedMemory(name=indices_name),
+        ]
+        self._indptr = np.ndarray((n + 1,), dtype=np.int64, buffer=self._blocks[0].buf)
+        self._indices = np.ndarray((nnz,), dtype=np.int64, buffer=self._blocks[1].buf)
+        self._names = nodes
+        self.graph = None
+        self.cache_limit = cache_limit
+        self.index = self.nodes = range(n)
+        self.hc_list = _LazyRows(self._hcnode)
+        self.adjacency = _LazyRows(self._row)
+        self.adjacency_sets = _LazyRows(lambda i: set(self.adjacency[i]))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _neighbors(self, i):
+        return self._indices[self._indptr[i]:self._indptr[i + 1]].tolist()
+
+    def _hcnode(self, i):
+        nbrs = self._neighbors(i)
+        names = self._names
+        if names is None:
+            return HCNode(i, set(nbrs), index=i)
+        return HCNode(names[i], {names[x] for x in nbrs}, index=i)
+
+    def _row(self, i):
+        return [x for x in self._neighbors(i) if x != i]
+
+    def is_complete(self, commonality_value):
+        return False
+
+
+def _init_worker(indptr_name, indices_name, n, nnz, nodes, cache_limit, commonality_predicate):
+    """Open the shared adjacency once per worker."""
+    global _state
+    _state = (_SharedGraph(indptr_name, indices_name, n, nnz, nodes, cache_limit), commonality_predicate)
+
+
+def _run_centers(start, stop):
+    """
+    Worker: run the pair union-find over the triples centred on nodes[start:stop].
+
+    Returns the packed pair keys in local admission order, the local class of
+    each (as the position of its root pair), and the deferred pair keys with
+    the position of the pair whose class they would join. The worker's graph
+    has the parent's node indices, so keys mean the same on both sides.
+    """
+    from .algorithm import _PairClasses
+
+    P, commonality_predicate = _state
+    classes = _PairClasses(P, commonality_predicate)
+    classes.run(P.nodes[start:stop])
+
+    find = classes.dsu.find
+    pairs = np.array(classes.pairs, dtype=np.int64)
+    roots = np.array([find(p) for p in range(len(classes.pairs))], dtype=np.int64)
+    deferred = [
+        (key, anchor)
+        for key, anchors in classes.pending.items()
+        for anchor in anchors
+    ]
+    deferred = np.array(deferred, dtype=np.int64).reshape(-1, 2)
+    return pairs, roots, deferred
+
+
+def _center_ranges(P, chunks):
+    """Split the node order into contiguous ranges of about equal sum(degree^2)."""
+    cost = np.array([len(P.neighbor_lists[u]) ** 2 + 1 for u in P.nodes], dtype=np.float64)
+    cumulative = np.cumsum(cost)
+    cuts = np.searchsorted(cumulative, cumulative[-1] * np.arange(1, chunks) / chunks)
+    bounds = [0] + sorted(set(int(c) for c in cuts if 0 < c < len(P))) + [len(P)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def communities_parallel(P, commonality_predicate, workers=None):
+    """
+    get_communities with the centers split across worker processes.
+
+    The adjacency is placed once in shared memory, as CSR arrays in neighbor
+    order, and each worker keeps it mapped and reads rows from it as its
+    centers need them (see _SharedGraph); node ids are only sent to the
+    workers when they are not already 0..n-1. Workers then take
+    contiguous ranges of centers and run the pair union-find over the triples
+    those centers admit; each triple has exactly one admitting center, so the
+    ranges never overlap. The parent replays the ranges' pairs in order into a
+    global union-find, which hands out pair ids in the serial admission order,
+    so the communities and their order match get_communities exactly.
+
+    Parameters
+    ----------
+    P : PreparedGraph
+    commonality_predicate : callable
+        Must pickle (ThresholdPredicate does).
+    workers : int, optional
+        Number of processes; defaults to os.cpu_count().
+    """
+    from .algorithm import _PairClasses
+
+    workers = workers or os.cpu_count() or 1
+    classes = _PairClasses(P, commonality_predicate)
+    if workers == 1 or len(P) < 3:
+        classes.run()
+        classes.resolve_pending()
+        return [members for members, _ in classes.communities()]
+
+    index = P.index
+    nodes = P.nodes
+    lists = [P.neighbor_lists[u] for u in nodes]
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum([len(nbrs) for nbrs in lists], out=indptr[1:])
+    indices = np.fromiter((index[v] for nbrs in lists for v in nbrs), dtype=np.int64, count=int(indptr[-1]))
+
+    ranges = _center_ranges(P, workers * CHUNKS_PER_WORKER)
+    indptr_block = _shared_array(indptr)
+    indices_block = _shared_array(indices)
+    try:
+        names = None if nodes == list(range(len(nodes))) else nodes
+        initargs = (
+            indptr_block.name, indices_block.name, len(nodes), len(indices),
+            names, P.cache_limit, commonality_predicate,
+        )
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(_run_centers, *zip(*ranges)))
+    finally:
+        for block in (indptr_block, indices_block):
+            block.close()
+            block.unlink()
+
+    add_pair = classes.add_pair
+    union = classes.dsu.union
+    pair_id = classes.pair_id
+    pending = classes.pending
+    for pairs, roots, deferred in results:
+        ids = [add_pair(key) for key in pairs.tolist()]
+        for p, r in enumerate(roots.tolist()):
+            union(ids[p], ids[r])
+        for key, anchor in deferred.tolist():
+            p = pair_id.get(key)
+            if p is not None:
+                union(p, ids[anchor])
+            else:
+                pending.setdefault(key, []).append(ids[anchor])
+
+    classes.resolve_pending()
+    return [members for members, _ in classes.communities()]
+
+
+def _init_seed_worker(G, commonality_predicate):
+    """One lazy view of G and one predicate cache per worker, shared by its chunks."""
+    from .hypergraph import _validate
+
+    global _state
+    P = _validate(G, commonality_predicate, lazy=True)
+    _state = (P,) + tuple(P.check_functions(commonality_predicate, indexed=True))
+
+
+def _run_seeds(seeds):
+    """Worker: get_node_communities over one chunk of seeds."""
+    from .algorithm import _seed_communities
+
+    return _seed_communities(*_state, seeds)
+
+
+def node_communities_parallel(G, commonality_predicate, seeds, workers):
+    """
+    The communities of many seeds, searched in worker processes.
+
+    The seeds are cut into contiguous chunks, CHUNKS_PER_WORKER per worker,
+    and each chunk is searched as get_node_communities would, against the
+    worker's own view of G. Returns one community or None per seed, in order.
+    """
+    chunks = workers * CHUNKS_PER_WORKER
+    size = -(-len(seeds) // chunks)
+    parts = [seeds[start:start + size] for start in range(0, len(seeds), size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_seed_worker, initargs=(G, commonality_predicate)
+    ) as pool:
+        return [c for found in pool.map(_run_seeds, parts) for c in found]
@@ -0,0 +1,621 @@
+import networkx as nx
+import numpy as np
+
+from .cache import pair_cache
+from .csr import CSRAdjacency
+from .hypernode import HCNode
+
+
+class PreparedGraph:
+    """
+    A graph snapshot prepared once for repeated Hypercommon calls.
+
+    Holds what every engine call used to rebuild from G: the node order, the
+    neighbor order of each node, and one HCNode per node. It also keeps a cache
+    of raw commonality values per pair, kept apart from any threshold, so a
+    coarse-then-fine threshold search or a series of local queries pays for
+    each pair's value once.
+
+    Nodes are also numbered 0..n-1 in node order (index), which is the row
+    numbering of the CSR adjacency handed to batch predicates.
+
+    The snapshot is taken at construction; later changes to G are not seen.
+
+    Parameters
+    ----------
+    G : nx.Graph
+    forms : iterable of {"bits", "array"}, optional
+        Compact neighborhood forms to attach to every HCNode besides the
+        neighbor set. "bits" gives popcount-based predicates an int bitset
+        (n bits per node, so best kept to small or dense graphs); "array" gives
+        each node a zero-copy view of its sorted CSR row.
+    cache_limit : int, optional
+        Maximum number of pair values each cache may hold. By default caches
+        grow to every pair ever tested, which on dense graphs is far more than
+        the graph itself; with a limit they evict with CLOCK (see ClockCache)
+        and evicted values are recomputed when needed again.
+    order : {None, "bfs", "degree"}
+        Node order, which is the order engines visit centers in. None keeps
+        G's order. "bfs" is a Cuthill-McKee order (breadth-first, low degree
+        first), so consecutive centers share most of their neighborhoods and
+        a bounded cache keeps hitting. "degree" visits high-degree nodes
+        first. Communities come out in the order of their first triple, so a
+        different node order can reorder them, but not change them.
+    """
+
+    __slots__ = (
+        "graph", "nodes", "index", "neighbor_lists", "hc",
+        "cache_limit", "_csr", "_compact", "_values", "_complete",
+    )
+
+    def __init__(self, G, forms=(), cache_limit=None, order=None):
+        if not isinstance(G, nx.Graph):
+            raise TypeError("G must be a networkx.Graph instance")
+        forms = set(forms)
+        if not forms <= {"bits", "array"}:
+            raise ValueError("forms may only contain 'bits' and 'array'")
+        if cache_limit is not None and cache_limit < 1:
+            raise ValueError("cache_limit must be a positive number of entries")
+
+        self.graph = G
+        self.nodes = _node_order(G, order)
+        self.index = {u: i for i, u in enumerate(self.nodes)}
+        self.neighbor_lists = {u: list(G.neighbors(u)) for u in self.nodes}
+        self.hc = {
+            u: HCNode(u, set(nbrs), index=i)
+            for i, (u, nbrs) in enumerate(self.neighbor_lists.items())
+        }
+        self.cache_limit = cache_limit
+        self._csr = None
+        self._compact = None
+        if forms:
+            self._attach_forms(forms)
+        # commonality_value -> {key: value}, key = pair_key(a, b)
+        self._values = {}
+        # commonality_values whose cache precompute() has filled in full
+        self._complete = set()
+
+    @classmethod
+    def from_adjacency(cls, nodes, neighbor_lists, cache_limit=None):
+        """
+        A PreparedGraph straight from a node order and neighbor lists.
+
+        For callers that already hold the adjacency (worker processes, parts
+        of a graph) and would otherwise build a networkx graph only to have it
+        read back. neighbor_lists maps every node to an iterable of neighbors,
+        which must be symmetric. The result has no graph attribute.
+        """
+        P = cls.__new__(cls)
+        P.graph = None
+        P.nodes = list(nodes)
+        P.index = {u: i for i, u in enumerate(P.nodes)}
+        P.neighbor_lists = {u: list(neighbor_lists[u]) for u in P.nodes}
+        P.hc = {
+            u: HCNode(u, set(nbrs), index=i)
+            for i, (u, nbrs) in enumerate(P.neighbor_lists.items())
+        }
+        P.cache_limit = cache_limit
+        P._csr = None
+        P._compact = None
+        P._values = {}
+        P._complete = set()
+        return P
+
+    @classmethod
+    def from_edges(cls, edges, nodes=None, cache_limit=None):
+        """
+        A PreparedGraph from an (E, 2) array of edges, such as the int32 edge
+        arrays the experiments store.
+
+        nodes gives the node order (and any isolated nodes); endpoints not in
+        it follow in order of appearance, and by default nodes are
+        0..max(edges). Neighbors are listed in edge order, duplicate edges
+        collapse, so the result is the graph nx.Graph would build from
+        add_nodes_from(nodes) and add_edges_from(edges), without building it.
+        """
+        edges = np.asarray(edges)
+        if edges.size == 0:
+            # np.array of an empty edge list has shape (0,)
+            edges = edges.reshape(0, 2)
+        if edges.ndim != 2 or edges.shape[1] != 2:
+            raise ValueError("edges must be an (E, 2) array")
+        if nodes is None:
+            nodes = range(int(edges.max()) + 1 if len(edges) else 0)
+        adjacency = {u: {} for u in nodes}
+        for u, v in edges.tolist():
+            adjacency.setdefault(u, {})[v] = None
+            adjacency.setdefault(v, {})[u] = None
+        return cls.from_adjacency(adjacency, adjacency, cache_limit=cache_limit)
+
+    @classmethod
+    def from_csr(cls, indptr, indices, nodes=None, cache_limit=None):
+        """
+        A PreparedGraph from CSR arrays of a symmetric adjacency.
+
+        Row i lists the neighbors of node i by index, in neighbor order.
+        nodes, if given, names the rows; by default they are 0..n-1.
+        """
+        indptr = np.asarray(indptr).tolist()
+        indices = np.asarray(indices).tolist()
+        n = len(indptr) - 1
+        if nodes is None:
+            nodes = range(n)
+        nodes = list(nodes)
+        if len(nodes) != n:
+            raise ValueError("nodes must name every CSR row")
+        neighbor_lists = {
+            u: [nodes[x] for x in indices[indptr[i]:indptr[i + 1]]]
+            for i, u in enumerate(nodes)
+        }
+        return cls.from_adjacency(nodes, neighbor_lists, cache_limit=cache_limit)
+
+    def subgraph(self, nodes):
+        """
+        The PreparedGraph of a union of connected components of this one.
+
+        nodes must be closed under adjacency (a whole component or several),
+        so every neighbor list carries over unchanged. Node and neighbor order
+        follow this graph, so engines visit the part in the same relative order
+        as the whole. The part shares no caches, and has no graph attribute,
+        which keeps it cheap to pickle.
+        """
+        index = self.index
+        return PreparedGraph.from_adjacency(
+            sorted(nodes, key=index.__getitem__), self.neighbor_lists, cache_limit=self.cache_limit
+        )
+
+    def _attach_forms(self, forms):
+        csr = self.csr
+        n = csr.n
+        for i, u in enumerate(self.nodes):
+            row = csr.row(i)
+            node = self.hc[u]
+            if "array" in forms:
+                node.array = row
+            if "bits" in forms:
+                mask = np.zeros(n, dtype=np.uint8)
+                mask[row] = 1
+                node.bits = int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+    def __contains__(self, u):
+        return u in self.hc
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def neighbors(self, u):
+        return self.neighbor_lists[u]
+
+    def has_edge(self, u, v):
+        return v in self.hc[u].neighbors
+
+    @property
+    def hc_list(self):
+        """The HCNodes as a list, hc_list[i] being node i's."""
+        if self._compact is None:
+            self._build_compact()
+        return self._compact[0]
+
+    @property
+    def adjacency(self):
+        """Neighbor lists over node indices, in neighbor order, without self-loops."""
+        if self._compact is None:
+            self._build_compact()
+        return self._compact[1]
+
+    @property
+    def adjacency_sets(self):
+        """The neighbors of each node index, as sets of indices."""
+        if self._compact is None:
+            self._build_compact()
+        return self._compact[2]
+
+    def _build_compact(self):
+        index = self.index
+        adjacency = [
+            [index[v] for v in self.neighbor_lists[u] if v != u]
+            for u in self.nodes
+        ]
+        self._compact = (
+            [self.hc[u] for u in self.nodes],
+            adjacency,
+            [set(nbrs) for nbrs in adjacency],
+        )
+
+    @property
+    def csr(self):
+        """CSRAdjacency over index, built on first use."""
+        if self._csr is None:
+            self._csr = CSRAdjacency.from_neighbor_lists(self.neighbor_lists, self.index)
+        return self._csr
+
+    def pair_key(self, a, b):
+        """
+        The int key caches store the pair {a, b} under.
+
+        The two node indices are packed into one integer, smaller index first,
+        which is cheaper to hash and hold than a tuple of node ids and does not
+        need the nodes themselves to be comparable. Values are computed with
+        the pair in the same order.
+        """
+        i = self.index[a]
+        j = self.index[b]
+        n = len(self.nodes)
+        return i * n + j if i < j else j * n + i
+
+    def _cache(self, commonality_value):
+        cache = self._values.get(commonality_value)
+        if cache is None:
+            cache = self._values[commonality_value] = pair_cache(self.cache_limit)
+        return cache
+
+    def value(self, commonality_value, a, b):
+        """commonality_value(hc[a], hc[b]), computed at most once per pair."""
+        return self.value_function(commonality_value)(a, b)
+
+    def value_function(self, commonality_value, indexed=False):
+        """
+        A cached f(a, b) -> commonality_value(hc[a], hc[b]) on node ids.
+
+        With indexed=True, f takes node indices instead, which is what the
+        engines run on: no id lookups, and nodes need not be hashable cheaply
+        or comparable at all.
+        """
+        cache = self._cache(commonality_value)
+        hc_list = self.hc_list
+        n = len(self.nodes)
+
+        def value_at(i, j):
+            if i > j:
+                i, j = j, i
+            key = i * n + j
+            val = cache.get(key)
+            if val is None:
+                val = commonality_value(hc_list[i], hc_list[j])
+                cache[key] = val
+            return val
+
+        if indexed:
+            return value_at
+        index = self.index
+
+        def value(a, b):
+            return value_at(index[a], index[b])
+
+        return value
+
+    def precompute(self, commonality_value):
+        """
+        Fill the value cache for every pair within distance 2 at once.
+
+        Only possible when commonality_value has a table(G) attribute returning
+        a CommonalityTable (closed_neighborhood_jaccard does). Returns True if
+        the cache now holds the complete table, False if there is no table or
+        it does not fit within cache_limit.
+
+        get_communities_multi calls this itself, since it needs every pair. A
+        single-threshold call short-circuits most pairs, so it only uses the
+        table when the caller has precomputed it on a PreparedGraph.
+        """
+        table_function = getattr(commonality_value, "table", None)
+        if table_function is None:
+            return False
+
+        if commonality_value in self._complete:
+            return True
+
+        table = table_function(self)
+        if self.cache_limit is not None and len(table.values) > self.cache_limit:
+            return False
+
+        cache = self._cache(commonality_value)
+        n = len(self.nodes)
+        # table rows and columns are already indices, with row < column
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(table.indptr))
+        keys = rows * n + table.indices
+        cache.update(zip(keys.tolist(), table.values.tolist()))
+        self._complete.add(commonality_value)
+        return True
+
+    def is_complete(self, commonality_value):
+        """True once precompute() has cached every pair for commonality_value."""
+        return commonality_value in self._complete
+
+    def check_function(self, commonality_predicate, indexed=False):
+        """A cached f(a, b) -> commonality_predicate(hc[a], hc[b]) on node ids (or indices)."""
+        return self.check_functions(commonality_predicate, indexed=indexed)[0]
+
+    def check_functions(self, commonality_predicate, indexed=False):
+        """
+        Return (check, prefetch) for a predicate.
+
+        check(a, b) -> commonality_predicate(hc[a], hc[b]), cached per pair.
+        Predicates exposing commonality_value and threshold (ThresholdPredicate)
+        are answered from the shared value cache, which outlives the call. Any
+        other callable gets a fresh cache of its boolean results.
+
+        prefetch(pairs) evaluates every uncached pair in one vectorised call and
+        stores the results where check() will find them. It is None unless the
+        predicate (or its commonality_value) has a batch(csr, us, vs) method,
+        in which case engines call it before a run of check()s.
+
+        With indexed=True both take node indices rather than node ids.
+        """
+        hc_list = self.hc_list
+        n = len(self.nodes)
+
+        commonality_value = getattr(commonality_predicate, "commonality_value", None)
+        threshold = getattr(commonality_predicate, "threshold", None)
+        if commonality_value is not None and threshold is not None:
+            cache = self._cache(commonality_value)
+            compute = commonality_value
+            batch = getattr(commonality_value, "batch", None)
+
+            def check_at(i, j):
+                if i > j:
+                    i, j = j, i
+                key = i * n + j
+                val = cache.get(key)
+                if val is None:
+                    val = compute(hc_list[i], hc_list[j])
+                    cache[key] = val
+                return val >= threshold
+        else:
+            cache = pair_cache(self.cache_limit)
+            compute = commonality_predicate
+            batch = getattr(commonality_predicate, "batch", None)
+
+            def check_at(i, j):
+                if i > j:
+                    i, j = j, i
+                key = i * n + j
+                val = cache.get(key)
+                if val is None:
+                    val = compute(hc_list[i], hc_list[j])
+                    cache[key] = val
+                return val
+
+        prefetch_at = None
+        if batch is not None:
+
+            def prefetch_at(pairs):
+                missing = {}
+                for i, j in pairs:
+                    if i > j:
+                        i, j = j, i
+                    key = i * n + j
+                    if key not in cache:
+                        missing[key] = (i, j)
+                if not missing:
+                    return
+                us = [i for i, _ in missing.values()]
+                vs = [j for _, j in missing.values()]
+                for key, val in zip(missing, batch(self.csr, us, vs).tolist()):
+                    cache[key] = val
+
+        if indexed:
+            return check_at, prefetch_at
+        index = self.index
+
+        def check(a, b):
+            return check_at(index[a], index[b])
+
+        if prefetch_at is None:
+            return check, None
+
+        def prefetch(pairs):
+            prefetch_at([(index[a], index[b]) for a, b in pairs])
+
+        return check, prefetch
+
+    def cache_size(self):
+        """Number of cached pair values, across all commonality functions."""
+        return sum(len(cache) for cache in self._values.values())
+
+    def clear_cache(self):
+        self._values.clear()
+        self._complete.clear()
+
+
+class _Numbering(dict):
+    """node -> index, handing out the next index to each node on first lookup."""
+
+    __slots__ = ("nodes",)
+
+    def __init__(self):
+        super().__init__()
+        self.nodes = []
+
+    def __missing__(self, u):
+        i = self[u] = len(self.nodes)
+        self.nodes.append(u)
+        return i
+
+
+class _LazyRows:
+    """A list-like whose row i is load(i), computed on first access."""
+
+    __slots__ = ("_rows", "_load")
+
+    def __init__(self, load):
+        self._rows = {}
+        self._load = load
+
+    def __getitem__(self, i):
+        row = self._rows.get(i)
+        if row is None:
+            row = self._rows[i] = self._load(i)
+        return row
+
+
+class LazyGraph:
+    """
+    The part of PreparedGraph a local query needs, built as the query goes.
+
+    Nodes get an index the first time they are seen, and a node's HCNode and
+    neighbor lists are only built when the query asks for them, so a query
+    touching a small community costs in proportion to that community's
+    volume rather than to the size of G. Offers the indexed interface
+    get_node_community runs on: index, nodes, hc_list, adjacency,
+    adjacency_sets and check_functions(..., indexed=True). There is no CSR
+    adjacency of the whole graph; a batch predicate is handed one holding
+    just the rows of the pairs it is asked about.
+
+    Parameters
+    ----------
+    G : nx.Graph, or any graph with neighbors(u), has_edge(u, v) and `in`
+    cache_limit : int, optional
+        Maximum number of pair values a query's cache may hold, as for
+        PreparedGraph; by default it keeps every pair the query tests.
+    """
+
+    __slots__ = ("graph", "cache_limit", "index", "nodes", "hc_list", "adjacency", "adjacency_sets")
+
+    def __init__(self, G, cache_limit=None):
+        if cache_limit is not None and cache_limit < 1:
+            raise ValueError("cache_limit must be a positive number of entries")
+        self.graph = G
+        self.cache_limit = cache_limit
+        self.index = _Numbering()
+        self.nodes = self.index.nodes
+        self.hc_list = _LazyRows(self._hcnode)
+        self.adjacency = _LazyRows(self._row)
+        self.adjacency_sets = _LazyRows(lambda i: set(self.adjacency[i]))
+
+    def __contains__(self, u):
+        return u in self.graph
+
+    def __reduce__(self):
+        # The rows are rebuilt on demand, so only G and the limit travel.
+        return LazyGraph, (self.graph, self.cache_limit)
+
+    def _hcnode(self, i):
+        u = self.nodes[i]
+        return HCNode(u, set(self.graph.neighbors(u)))
+
+    def _row(self, i):
+        u = self.nodes[i]
+        index = self.index
+        return [index[v] for v in self.graph.neighbors(u) if v != u]
+
+    def check_function(self, commonality_predicate, indexed=False):
+        return self.check_functions(commonality_predicate, indexed=indexed)[0]
+
+    def _csr_rows(self, rows):
+        """A CSRAdjacency over the current numbering in which only `rows` are filled in."""
+        adjacency = self.adjacency
+        rows = sorted(set(rows))
+        filled = [sorted(adjacency[i]) for i in rows]
+        counts = np.zeros(len(self.nodes), dtype=np.int64)
+        counts[rows] = [len(r) for r in filled]
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.fromiter((x for r in filled for x in r), dtype=np.int32, count=int(indptr[-1]))
+        return CSRAdjacency(indptr, indices)
+
+    def check_functions(self, commonality_predicate, indexed=False):
+        """
+        (check, prefetch) on node indices, as PreparedGraph.check_functions.
+
+        The cache lives for the one query and is bounded by cache_limit.
+        prefetch hands a batch predicate a
+        CSR adjacency holding just the rows of the pairs asked about.
+        """
+        if not indexed:
+            raise ValueError("LazyGraph only offers indexed checks")
+        hc_list = self.hc_list
+        commonality_value = getattr(commonality_predicate, "commonality_value", None)
+        threshold = getattr(commonality_predicate, "threshold", None)
+        cache = pair_cache(self.cache_limit)
+
+        if commonality_value is not None and threshold is not None:
+            batch = getattr(commonality_value, "batch", None)
+
+            def check(i, j):
+                if i > j:
+                    i, j = j, i
+                key = (i << 32) | j
+                val = cache.get(key)
+                if val is None:
+                    val = cache[key] = commonality_value(hc_list[i], hc_list[j])
+                return val >= threshold
+        else:
+            batch = getattr(commonality_predicate, "batch", None)
+
+            def check(i, j):
+                if i > j:
+                    i, j = j, i
+                key = (i << 32) | j
+                val = cache.get(key)
+                if val is None:
+                    val = cache[key] = commonality_predicate(hc_list[i], hc_list[j])
+                return val
+
+        if batch is None:
+            return check, None
+
+        def prefetch(pairs):
+            missing = {}
+            for i, j in pairs:
+                if i > j:
+                    i, j = j, i
+                key = (i << 32) | j
+                if key not in cache:
+                    missing[key] = (i, j)
+            if not missing:
+                return
+            us = [i for i, _ in missing.values()]
+            vs = [j for _, j in missing.values()]
+            csr = self._csr_rows(us + vs)
+            cache.update(zip(missing, batch(csr, us, vs).tolist()))
+
+        return check, prefetch
+
+
+def _node_order(G, order):
+    if order is None:
+        return list(G.nodes())
+    if order == "bfs":
+        return list(nx.utils.cuthill_mckee_ordering(G))
+    if order == "degree":
+        return sorted(G.nodes(), key=G.degree, reverse=True)
+    raise ValueError("order must be None, 'bfs' or 'degree'")
+
+
+def prepare(G, lazy=False):
+    """
+    Return G itself if it is already a PreparedGraph, otherwise prepare it.
+
+    With lazy=True, networkx graphs and neighbors()/has_edge() graphs come
+    back as a LazyGraph instead, for local queries that touch a small part
+    of G, and a LazyGraph comes back as itself.
+
+    Besides networkx graphs, G may be
+      - a pair (indptr, indices) of CSR arrays, or any object with indptr and
+        indices attributes (a scipy.sparse CSR matrix); see from_csr,
+      - an (E, 2) numpy array of edges over nodes 0..n-1; see from_edges,
+      - any object with neighbors(u) and has_edge(u, v) whose nodes are
+        listed by a nodes() method or attribute, or by iterating over it.
+    """
+    if isinstance(G, PreparedGraph):
+        return G
+    if lazy and isinstance(G, LazyGraph):
+        return G
+    if lazy and callable(getattr(G, "neighbors", None)) and callable(getattr(G, "has_edge", None)):
+        return LazyGraph(G)
+    if isinstance(G, nx.Graph):
+        return PreparedGraph(G)
+    if isinstance(G, tuple) and len(G) == 2:
+        return PreparedGraph.from_csr(*G)
+    if hasattr(G, "indptr") and hasattr(G, "indices"):
+        return PreparedGraph.from_csr(G.indptr, G.indices)
+    if isinstance(G, np.ndarray):
+        return PreparedGraph.from_edges(G)
+    if callable(getattr(G, "neighbors", None)) and callable(getattr(G, "has_edge", None)):
+        nodes = getattr(G, "nodes", None)
+        nodes = list(nodes() if callable(nodes) else nodes if nodes is not None else G)
+        return PreparedGraph.from_adjacency(nodes, {u: G.neighbors(u) for u in nodes})
+    raise TypeError(
+        "G must be a networkx.Graph instance, a PreparedGraph, CSR (indptr, indices) "
+        "arrays, an (E, 2) edge array, or a graph with neighbors() and has_edge()"
+    )
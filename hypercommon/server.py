@@ -0,0 +1,383 @@
+"""
+A long-lived local community server.
+
+The graph is prepared once and kept in memory, so HCNodes, commonality values
+and every community found stay warm across requests. Clients speak JSON
+lines over a Unix socket or a localhost TCP port; each request is an object
+with an "op" and an optional "id" echoed in the reply:
+
+    {"id": 1, "op": "community", "node": 5, "t": 0.3}
+    {"id": 2, "op": "communities", "t": 0.3}
+    {"id": 3, "op": "stats"}
+
+Replies are {"id": ..., "result": ...} or {"id": ..., "error": "..."}; a
+community is a list of nodes in node order, or null if the node is in none.
+Replies on one connection may come back out of order when requests overlap.
+
+Run with: python -m hypercommon.server edges.txt --socket /tmp/hypercommon.sock
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+
+from .algorithm import _seed_communities, get_communities
+from .prepared import PreparedGraph
+
+
+class CommunityServer:
+    """
+    Answers community(v, t) and communities(t) requests against one graph.
+
+    Requests arriving within batch_window seconds of each other are answered
+    as one batch: community requests at the same threshold share one
+    get_node_communities-style pass, so seeds falling in a community found
+    for another seed are not searched again. Every community found is kept,
+    per threshold, for the nodes it covers; later requests for those nodes
+    are cache hits. Only the max_thresholds most recently asked thresholds
+    keep their communities; asking a new one evicts the least recent.
+    Batches run one at a time on a worker thread, which keeps the event loop
+    free to accept requests meanwhile.
+
+    Parameters
+    ----------
+    G : nx.Graph or PreparedGraph
+    predicate_at : callable
+        predicate_at(t) is the commonality predicate at threshold t, e.g.
+        predicates.closed_neighborhood_jaccard_predicate. Predicates exposing
+        the same commonality_value at every t (ThresholdPredicate does) share
+        one pair value cache across thresholds.
+    cache_limit : int, optional
+        Bound on the pair value cache; see PreparedGraph.
+    batch_window : float
+        Seconds to wait for more requests after the first of a batch.
+    max_thresholds : int
+        Number of thresholds whose communities are kept. Each may cover
+        every node, so this bounds what clients asking for many distinct t
+        can make the server hold.
+    """
+
+    def __init__(
+        self, G, predicate_at, cache_limit=None, batch_window=0.002, max_thresholds=16,
+    ):
+        if max_thresholds < 1:
+            raise ValueError("max_thresholds must be a positive number of thresholds")
+        self.graph = G if isinstance(G, PreparedGraph) else PreparedGraph(G, cache_limit=cache_limit)
+        self.predicate_at = predicate_at
+        self.batch_window = batch_window
+        self.max_thresholds = max_thresholds
+        # per threshold, least recently asked first: node -> a community
+        # containing it (None: in none)
+        self._covering = OrderedDict()
+        # per threshold still in _covering: every community, after a full run
+        self._communities = {}
+        self._stats = {"requests": 0, "batches": 0, "hits": 0, "misses": 0, "errors": 0}
+        self._queue = None
+        self._batcher = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._server = None
+
+    @classmethod
+    def from_edgelist(cls, path, predicate_at, nodetype=int, **kwargs):
+        """A server over the graph in a whitespace-separated edge list file."""
+        return cls(nx.read_edgelist(path, nodetype=nodetype), predicate_at, **kwargs)
+
+    # ---- answering, on the worker thread ----
+
+    def _predicate(self, t):
+        return self.predicate_at(t)
+
+    def _named(self, community):
+        if community is None:
+            return None
+        index = self.graph.index
+        return sorted(community, key=index.__getitem__)
+
+    def _cover(self, covering, community):
+        """Record community (a node set) for its members not yet covered; returns it named."""
+        named = self._named(community)
+        for v in community:
+            covering.setdefault(v, named)
+        return named
+
+    def _covering_at(self, t):
+        """The covering dict of threshold t, marked most recent; evicts the least recent over the bound."""
+        covering = self._covering.get(t)
+        if covering is None:
+            covering = self._covering[t] = {}
+            while len(self._covering) > self.max_thresholds:
+                old, _ = self._covering.popitem(last=False)
+                self._communities.pop(old, None)
+        else:
+            self._covering.move_to_end(t)
+        return covering
+
+    def _answer_communities(self, t, counts):
+        covering = self._covering_at(t)
+        found = self._communities.get(t)
+        if found is not None:
+            counts["hits"] += 1
+            return found
+        counts["misses"] += 1
+        communities = get_communities(self.graph, self._predicate(t))
+        found = self._communities[t] = [self._cover(covering, c) for c in communities]
+        return found
+
+    def _answer_community(self, t, seeds, counts):
+        covering = self._covering_at(t)
+        if t in self._communities:
+            # a full run at t has covered every node in some community
+            todo = []
+        else:
+            todo = list(dict.fromkeys(v for v in seeds if v not in covering))
+        searches = 0
+        if todo:
+            # a seed covered by a community found earlier in the pass comes
+            # back as that same set, so each new set (or None) is one search
+            P = self.graph
+            check, prefetch = P.check_functions(self._predicate(t), indexed=True)
+            named = {}
+            for v, c in zip(todo, _seed_communities(P, check, prefetch, todo)):
+                if c is None:
+                    covering[v] = None
+                    searches += 1
+                elif id(c) not in named:
+                    named[id(c)] = self._cover(covering, c)
+                    searches += 1
+        counts["hits"] += len(seeds) - searches
+        counts["misses"] += searches
+        return [covering.get(v) for v in seeds]
+
+    def _answer(self, requests):
+        """
+        Replies to a batch of decoded requests, in order, and the batch's
+        hits, misses and errors. The counts are returned rather than added to
+        _stats, which only the event loop updates.
+        """
+        counts = {"hits": 0, "misses": 0, "errors": 0}
+        replies = [None] * len(requests)
+        seeds = {}
+        for n, request in enumerate(requests):
+            try:
+                op = request.get("op")
+                if op == "community":
+                    if "node" not in request or "t" not in request:
+                        raise ValueError("community needs node and t")
+                    v = request["node"]
+                    t = float(request["t"])
+                    if v not in self.graph:
+                        raise KeyError(f"node {v!r} is not in G")
+                    seeds.setdefault(t, []).append((n, v))
+                elif op == "communities":
+                    if "t" not in request:
+                        raise ValueError("communities needs t")
+                    replies[n] = {"result": self._answer_communities(float(request["t"]), counts)}
+                elif op == "stats":
+                    replies[n] = {"result": self.stats()}
+                else:
+                    raise ValueError(f"unknown op {op!r}")
+            except (KeyError, TypeError, ValueError) as e:
+                replies[n] = {"error": str(e.args[0] if e.args else e)}
+
+        for t, pending in seeds.items():
+            found = self._answer_community(t, [v for _, v in pending], counts)
+            for (n, _), c in zip(pending, found):
+                replies[n] = {"result": c}
+
+        for request, reply in zip(requests, replies):
+            if "id" in request:
+                reply["id"] = request["id"]
+            if "error" in reply:
+                counts["errors"] += 1
+        return replies, counts
+
+    def stats(self):
+        """Request, batch and cache counters, plus the number of cached pair values."""
+        return dict(self._stats, pair_values=self.graph.cache_size())
+
+    # ---- serving, on the event loop ----
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            if self.batch_window:
+                await asyncio.sleep(self.batch_window)
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            self._stats["batches"] += 1
+            try:
+                replies, counts = await loop.run_in_executor(self._executor, self._answer, [r for r, _ in batch])
+            except Exception as e:  # keep serving; fail this batch only
+                replies = [{"error": f"internal error: {e}"} for _ in batch]
+                counts = {"errors": len(batch)}
+            for key, value in counts.items():
+                self._stats[key] += value
+            for (_, future), reply in zip(batch, replies):
+                if not future.done():
+                    future.set_result(reply)
+
+    async def _reply(self, line, writer):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+        except ValueError as e:
+            self._stats["errors"] += 1
+            reply = {"id": None, "error": f"bad request: {e}"}
+        else:
+            self._stats["requests"] += 1
+            future = asyncio.get_running_loop().create_future()
+            await self._queue.put((request, future))
+            reply = await future
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._reply(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Start listening on a Unix socket at path, or else on host:port (port 0
+        picks a free one). Returns the asyncio server; address() tells where.
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host=host, port=port)
+        return self._server
+
+    def address(self):
+        """The socket path, or (host, port), the server listens on."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown()
+
+
+class CommunityClient:
+    """
+    A client for CommunityServer; open with CommunityClient.connect.
+
+    Requests may be issued concurrently from several tasks; replies are
+    matched to requests by id.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, path=None, host="127.0.0.1", port=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        while line := await self._reader.readline():
+            reply = json.loads(line)
+            future = self._waiting.pop(reply.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(reply)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, **request):
+        """Send one request and return its reply's result; errors raise RuntimeError."""
+        self._next_id += 1
+        request["id"] = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request["id"]] = future
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+        reply = await future
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    async def community(self, v, t):
+        return await self.request(op="community", node=v, t=t)
+
+    async def communities(self, t):
+        return await self.request(op="communities", t=t)
+
+    async def stats(self):
+        return await self.request(op="stats")
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+
+
+async def _serve_forever(server, path, host, port):
+    await server.start(path=path, host=host, port=port)
+    print(f"serving on {server.address()}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Hypercommon local communities of one graph.")
+    parser.add_argument("edgelist", help="whitespace-separated edge list, one edge per line")
+    parser.add_argument("--socket", help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--string-ids", action="store_true", help="keep node ids as strings")
+    parser.add_argument(
+        "--predicate", default="predicates:closed_neighborhood_jaccard_predicate",
+        help="module:name of the predicate factory t -> predicate",
+    )
+    parser.add_argument("--cache-limit", type=int)
+    parser.add_argument("--max-thresholds", type=int, default=16, help="thresholds whose communities are kept")
+    args = parser.parse_args(argv)
+
+    module, _, name = args.predicate.partition(":")
+    predicate_at = getattr(importlib.import_module(module), name)
+    server = CommunityServer.from_edgelist(
+        args.edgelist, predicate_at, nodetype=str if args.string_ids else int,
+        cache_limit=args.cache_limit, max_thresholds=args.max_thresholds,
+    )
+    try:
+        asyncio.run(_serve_forever(server, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .hypergraph import _validate
+from .parallel import _center_ranges
+from .unionfind import DisjointSet
+
+
+def _label_propagation(P, rounds=5):
+    """Cheap node groups: a few rounds of label propagation in node order."""
+    label = {u: i for i, u in enumerate(P.nodes)}
+    for _ in range(rounds):
+        changed = False
+        for u in P.nodes:
+            nbrs = P.neighbor_lists[u]
+            if not nbrs:
+                continue
+            counts = Counter(label[v] for v in nbrs)
+            best = max(counts.values())
+            new = min(lab for lab, c in counts.items() if c == best)
+            if new != label[u]:
+                label[u] = new
+                changed = True
+        if not changed:
+            break
+    groups = {}
+    for u in P.nodes:
+        groups.setdefault(label[u], []).append(u)
+    return list(groups.values())
+
+
+def partition(P, shards, method="range"):
+    """
+    Split the nodes of P into at most `shards` center sets, each in node order.
+
+    "range" cuts the node order into contiguous ranges of about equal
+    sum(degree^2), the cost of enumerating their triples. "label_propagation"
+    groups nodes by a few rounds of label propagation and packs the groups
+    into shards, largest first, so that few triples straddle two shards and
+    the halos stay small.
+    """
+    if method == "range":
+        return [P.nodes[a:b] for a, b in _center_ranges(P, shards)]
+    if method != "label_propagation":
+        raise ValueError("method must be 'range' or 'label_propagation'")
+
+    cost = {u: len(P.neighbor_lists[u]) ** 2 + 1 for u in P.nodes}
+    bins = [[] for _ in range(shards)]
+    load = [0] * shards
+    for group in sorted(_label_propagation(P), key=lambda g: -sum(cost[u] for u in g)):
+        b = load.index(min(load))
+        bins[b].extend(group)
+        load[b] += sum(cost[u] for u in group)
+    rank = P.index
+    return [sorted(b, key=rank.__getitem__) for b in bins if b]
+
+
+def shard_view(P, centers):
+    """
+    The part of P a shard needs: its centers plus a 2-hop halo.
+
+    A triple centred on j only involves j's neighbors, and the predicate on
+    those pairs reads their neighborhoods, so centers and their neighbors keep
+    their full neighbor lists; the nodes two hops out are only there to be
+    named, and keep just their edges inside the view. Node order follows P,
+    so the canonical-center rule picks the same center as on the whole graph.
+    """
+    from .prepared import PreparedGraph
+
+    neighbor_lists = P.neighbor_lists
+    full = set(centers)
+    for u in centers:
+        full.update(neighbor_lists[u])
+    view = set(full)
+    for u in full:
+        view.update(neighbor_lists[u])
+
+    lists = {
+        u: neighbor_lists[u] if u in full else [v for v in neighbor_lists[u] if v in view]
+        for u in view
+    }
+    rank = P.index
+    return PreparedGraph.from_adjacency(sorted(view, key=rank.__getitem__), lists)
+
+
+def _run_shard(view, centers, commonality_predicate):
+    """
+    Worker: the pair classes of the triples centred on one shard.
+
+    A pair with an endpoint whose whole neighborhood lies in the shard (an
+    interior node) only occurs in triples centred in the shard, so everything
+    about it is settled here. The other pairs are boundary pairs, through
+    which classes of different shards may connect; only those leave the
+    worker, together with each class's members and first-triple position.
+
+    Returns (classes, exported) where classes is a list of
+    (members, center, position, boundary_pairs) and exported lists the
+    deferred boundary pairs as (pair, class number).
+    """
+    from .algorithm import _PairClasses, _center_of
+
+    classes = _PairClasses(view, commonality_predicate, with_origins=True)
+    classes.run(centers)
+
+    # the view numbers nodes its own way; pairs leave as node-id pairs, which
+    # the view's node order (P's) orients the same way in every shard
+    index = view.index
+    nodes = view.nodes
+    n = len(view)
+    shard = {index[u] for u in centers}
+    adjacency = view.adjacency
+    interior = {u for u in shard if all(v in shard for v in adjacency[u])}
+
+    def is_boundary(key):
+        a, b = divmod(key, n)
+        return a not in interior and b not in interior
+
+    def named(key):
+        a, b = divmod(key, n)
+        return nodes[a], nodes[b]
+
+    # settle the deferred interior pairs here, hand the boundary ones on
+    exported = []
+    local = {}
+    for key, anchors in classes.pending.items():
+        if is_boundary(key):
+            exported.append((key, anchors))
+        else:
+            local[key] = anchors
+    classes.pending = local
+    classes.resolve_pending()
+
+    find = classes.dsu.find
+    number = {}
+    result = []
+    for members, p in classes.communities():
+        number[find(p)] = len(result)
+        result.append([members, _center_of(view, classes.origins[p]), p, []])
+    for p, key in enumerate(classes.pairs):
+        if is_boundary(key):
+            result[number[find(p)]][3].append(named(key))
+
+    exported = [(named(key), number[find(q)]) for key, anchors in exported for q in anchors]
+    return [tuple(entry) for entry in result], exported
+
+
+def get_communities_sharded(G, commonality_predicate, shards=4, method="range", workers=None):
+    """
+    get_communities for graphs too large to enumerate in one process.
+
+    G is split into shards of centers (see partition). Each shard is run on
+    its own view of the graph, the shard plus a 2-hop halo (see shard_view),
+    so a worker holds state proportional to its shard. The shards' classes are
+    then stitched with a global union-find over their boundary pairs: two
+    classes sharing a pair are one community. Classes also carry the position
+    of their first triple, which orders the result exactly as
+    get_communities does.
+
+    Parameters
+    ----------
+    G : nx.Graph, PreparedGraph, or another graph form (see prepared.prepare)
+    commonality_predicate : callable
+        Must pickle when workers is given (ThresholdPredicate does).
+    shards : int
+    method : {"range", "label_propagation"}
+    workers : int, optional
+        Run the shards in this many processes; at most `workers` views are
+        in flight at once. By default the shards run one after another here.
+
+    Returns
+    -------
+    list[set]
+        Equal to get_communities(G, commonality_predicate).
+    """
+    P = _validate(G, commonality_predicate)
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    parts = partition(P, shards, method)
+
+    if workers is None:
+        results = [
+            _run_shard(shard_view(P, centers), centers, commonality_predicate)
+            for centers in parts
+        ]
+    else:
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = deque()
+            for centers in parts:
+                if len(running) >= workers:
+                    results.append(running.popleft().result())
+                running.append(pool.submit(_run_shard, shard_view(P, centers), centers, commonality_predicate))
+            results.extend(future.result() for future in running)
+
+    # one union-find element per shard class
+    dsu = DisjointSet()
+    members = []
+    keys = []
+    owner = {}
+    rank = P.index
+    for classes, _ in results:
+        for nodes, center, position, boundary in classes:
+            c = dsu.add()
+            members.append(nodes)
+            keys.append((rank[center], position))
+            for key in boundary:
+                first = owner.setdefault(key, c)
+                if first != c:
+                    dsu.union(first, c)
+
+    # deferred boundary pairs: merged if admitted elsewhere, otherwise
+    # checked only when they would join classes that are still apart
+    offset = 0
+    deferred = {}
+    for classes, exported in results:
+        for key, n in exported:
+            deferred.setdefault(key, []).append(offset + n)
+        offset += len(classes)
+    check = P.check_function(commonality_predicate)
+    for key, cs in deferred.items():
+        c = owner.get(key)
+        if c is not None:
+            for d in cs:
+                dsu.union(c, d)
+        elif len({dsu.find(d) for d in cs}) > 1 and check(*key):
+            for d in cs[1:]:
+                dsu.union(cs[0], d)
+
+    communities = {}
+    first = {}
+    for c in range(len(members)):
+        root = dsu.find(c)
+        if root in communities:
+            communities[root] |= members[c]
+            first[root] = min(first[root], keys[c])
+        else:
+            communities[root] = set(members[c])
+            first[root] = keys[c]
+    return [communities[root] for root in sorted(communities, key=first.__getitem__)]
@@ -0,0 +1,43 @@
+class DisjointSet:
+    """
+    Array-backed union-find over the integers 0..n-1.
+
+    Elements are created with add(), which hands out the next id. find() uses
+    path halving and union() joins by size, so a long run of unions stays
+    close to linear.
+    """
+
+    __slots__ = ("parent", "size")
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self):
+        """Create a new singleton element and return its id."""
+        x = len(self.parent)
+        self.parent.append(x)
+        self.size.append(1)
+        return x
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x, y):
+        """Merge the sets of x and y. Returns True if they were separate."""
+        rx = self.find(x)
+        ry = self.find(y)
+        if rx == ry:
+            return False
+        if self.size[rx] < self.size[ry]:
+            rx, ry = ry, rx
+        self.parent[ry] = rx
+        self.size[rx] += self.size[ry]
+        return True
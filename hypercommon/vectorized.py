@@ -0,0 +1,182 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+# Upper bound on the wedges materialised at once; centers of equal degree are
+# processed in chunks of about this many wedges.
+WEDGE_CHUNK = 1 << 21
+
+
+def _member(keys, table):
+    """Boolean mask: keys[k] is in the sorted array table."""
+    if len(table) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    pos = np.searchsorted(table, keys)
+    pos[pos == len(table)] = 0
+    return table[pos] == keys
+
+
+def _pair_keys(a, b, n):
+    return np.minimum(a, b) * n + np.maximum(a, b)
+
+
+def _passing_function(P, commonality_predicate):
+    """
+    A vectorised test for pairs of node indices, given as packed keys.
+
+    Threshold predicates whose commonality_value has a table are answered from
+    the table of every distance-2 pair; predicates with a batch form are
+    evaluated on the distinct keys asked for.
+    """
+    n = len(P)
+    commonality_value = getattr(commonality_predicate, "commonality_value", None)
+    threshold = getattr(commonality_predicate, "threshold", None)
+    table_function = getattr(commonality_value, "table", None)
+
+    if table_function is not None and threshold is not None:
+        table = table_function(P)
+        rows = table.rows().astype(np.int64)
+        passing = rows * n + table.indices
+        passing = passing[table.values >= threshold]  # already ascending
+
+        def passes(keys):
+            return _member(keys, passing)
+
+        return passes
+
+    batch = getattr(commonality_predicate, "batch", None)
+    if batch is None:
+        raise ValueError(
+            "engine='numpy' needs a ThresholdPredicate whose commonality_value has a "
+            "table, or a predicate with a batch(csr, us, vs) form"
+        )
+    csr = P.csr
+
+    def passes(keys):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        if len(unique) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        result = np.asarray(batch(csr, unique // n, unique % n), dtype=bool)
+        return result[inverse]
+
+    return passes
+
+
+def _neighbor_order_csr(P):
+    """Adjacency rows in neighbor-list order, without self-loops, as int64 arrays."""
+    rows = P.adjacency
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=indptr[1:])
+    indices = np.fromiter((x for r in rows for x in r), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def _admitted_triples(P, passes):
+    """
+    Every admissible triple as arrays (center, a, b, order).
+
+    order is the triple's position in the enumeration order of the Python
+    engines (center, then the neighbor positions of a and b), packed into
+    one int64.
+    """
+    n = len(P)
+    indptr, indices = _neighbor_order_csr(P)
+    degree = np.diff(indptr)
+    span = int(degree.max()) + 1 if n else 1
+
+    owner = np.repeat(np.arange(n, dtype=np.int64), degree)
+    position = np.arange(len(indices), dtype=np.int64) - indptr[owner]
+
+    # neighbors passing with their center; only these are ever paired
+    keep = passes(_pair_keys(owner, indices, n))
+    owner, nbr, position = owner[keep], indices[keep], position[keep]
+    kept = np.bincount(owner, minlength=n)
+    starts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(kept, out=starts[1:])
+
+    csr = P.csr
+    rows = np.repeat(np.arange(n, dtype=np.int64), csr.degree)
+    upper = csr.indices > rows
+    adjacent = rows[upper] * n + csr.indices[upper]  # ascending
+
+    found = []
+    for d in np.unique(kept):
+        d = int(d)
+        if d < 2:
+            continue
+        iu, ju = np.triu_indices(d, 1)
+        centers_d = np.flatnonzero(kept == d)
+        chunk = max(1, WEDGE_CHUNK // len(iu))
+        for s in range(0, len(centers_d), chunk):
+            centers = centers_d[s:s + chunk]
+            slots = starts[centers][:, None] + np.arange(d)
+            members = nbr[slots]
+            places = position[slots]
+
+            j = np.repeat(centers, len(iu))
+            a = members[:, iu].ravel()
+            b = members[:, ju].ravel()
+            outer = _pair_keys(a, b, n)
+
+            # a triangle is admitted only from its first center in node order
+            canonical = ~_member(outer, adjacent) | ((j < a) & (j < b))
+            ok = canonical.copy()
+            ok[canonical] = passes(outer[canonical])
+
+            order = (j * span + places[:, iu].ravel()) * span + places[:, ju].ravel()
+            found.append((j[ok], a[ok], b[ok], order[ok]))
+
+    if not found:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    return tuple(np.concatenate(parts) for parts in zip(*found))
+
+
+def communities_numpy(P, commonality_predicate):
+    """
+    get_communities as array operations over the whole graph.
+
+    Wedges are generated per group of equal-degree centers with index
+    arithmetic, filtered with boolean masks against the passing pairs (from
+    the commonality table, or one batch call per chunk), and reduced to the
+    canonical center of each triangle. Each admitted triple then links its
+    three pairs in a sparse pair graph, whose connected components
+    (scipy.sparse.csgraph) are the communities. The communities are ordered
+    by the enumeration position of their first triple, as in get_communities.
+    """
+    n = len(P)
+    passes = _passing_function(P, commonality_predicate)
+    j, a, b, order = _admitted_triples(P, passes)
+    if len(j) == 0:
+        return []
+
+    keys = np.concatenate([_pair_keys(a, j, n), _pair_keys(j, b, n), _pair_keys(a, b, n)])
+    pairs, pair_of = np.unique(keys, return_inverse=True)
+    t = len(j)
+    first, second, third = pair_of[:t], pair_of[t:2 * t], pair_of[2 * t:]
+
+    m = len(pairs)
+    links = sp.coo_matrix(
+        (np.ones(2 * t, dtype=np.int8), (np.concatenate([first, first]), np.concatenate([second, third]))),
+        shape=(m, m),
+    )
+    count, label = connected_components(links, directed=False)
+
+    # order communities by their first triple
+    earliest = np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(earliest, label[first], order)
+    rank = np.empty(count, dtype=np.int64)
+    rank[np.argsort(earliest, kind="stable")] = np.arange(count)
+
+    # members: both nodes of every pair, grouped by community
+    member_label = np.concatenate([rank[label], rank[label]])
+    member_node = np.concatenate([pairs // n, pairs % n])
+    member = np.unique(member_label * n + member_node)
+    bounds = np.searchsorted(member // n, np.arange(count + 1))
+
+    nodes = P.nodes
+    member_node = (member % n).tolist()
+    return [
+        {nodes[x] for x in member_node[bounds[c]:bounds[c + 1]]}
+        for c in range(count)
+    ]
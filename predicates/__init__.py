@@ -1,3 +1,15 @@
-from .jaccard import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from .jaccard import (
+    closed_neighborhood_jaccard,
+    closed_neighborhood_jaccard_predicate,
+    closed_neighborhood_jaccard_table,
+)
+from .table import CommonalityTable
+from .threshold import ThresholdPredicate
 
-__all__ = ["closed_neighborhood_jaccard", "closed_neighborhood_jaccard_predicate"]
\ No newline at end of file
+__all__ = [
+    "closed_neighborhood_jaccard",
+    "closed_neighborhood_jaccard_predicate",
+    "closed_neighborhood_jaccard_table",
+    "CommonalityTable",
+    "ThresholdPredicate",
+]
@@ -1,13 +1,146 @@
+import math
+
+import numpy as np
+import scipy.sparse as sp
+
 from hypercommon.hypernode import HCNode
+from hypercommon.prepared import prepare
+from .table import CommonalityTable
+from .threshold import ThresholdPredicate
 
 
 def closed_neighborhood_jaccard(u: HCNode, v: HCNode) -> float:
-    Nu = u.neighbors | {u.id}
-    Nv = v.neighbors | {v.id}
-    return len(Nu & Nv) / len(Nu | Nv)
+    """
+    |N[u] & N[v]| / |N[u] | N[v]| over closed neighborhoods.
+
+    u and v are each in both closed neighborhoods exactly when they are
+    adjacent, and any other shared member is a common neighbor, so the
+    intersection is counted without building N[u] and N[v]. The union is
+    closed_size(u) + closed_size(v) minus the intersection. HCNodes carrying
+    a bitset count the common neighbors with a popcount instead.
+    """
+    if u.bits is not None and v.bits is not None:
+        inter = (u.bits & v.bits).bit_count() + 2 * ((u.bits >> v.index) & 1)
+    else:
+        common = u.neighbors & v.neighbors
+        inter = len(common)
+        if common and (u.id in common or v.id in common):
+            # only possible with self-loops
+            inter -= (u.id in common) + (v.id in common)
+        if v.id in u.neighbors:
+            inter += 2
+    return inter / (u.closed_size + v.closed_size - inter)
+
+
+def closed_neighborhood_jaccard_batch(csr, us, vs) -> np.ndarray:
+    """
+    closed_neighborhood_jaccard for every pair (us[k], vs[k]) of a CSRAdjacency.
+
+    |N[u] | N[v]| is |N[u]| + |N[v]| - |N[u] & N[v]|, so only the
+    intersection has to be counted.
+    """
+    us = np.asarray(us, dtype=np.int64)
+    vs = np.asarray(vs, dtype=np.int64)
+    inter = csr.common_counts(us, vs, closed=True)
+    union = csr.degree[us] + csr.degree[vs] + 2 - inter
+    return inter / union
+
+
+def closed_neighborhood_jaccard_table(G) -> CommonalityTable:
+    """
+    closed_neighborhood_jaccard for every pair within distance 2, in one shot.
+
+    With M = A + I, (M @ M)[u, v] is |N[u] & N[v]|, and it is non-zero exactly
+    when u and v are within distance 2. The union follows from the row degrees
+    as |N[u]| + |N[v]| - |N[u] & N[v]|.
+
+    Parameters
+    ----------
+    G : nx.Graph or PreparedGraph
+    """
+    P = prepare(G)
+    csr = P.csr
+    n = csr.n
+
+    M = sp.csr_matrix(
+        (np.ones(len(csr.indices), dtype=np.int32), csr.indices, csr.indptr), shape=(n, n)
+    )
+    M = M + sp.identity(n, dtype=np.int32, format="csr")
+    inter = sp.triu(M @ M, k=1, format="csr")
+    inter.sort_indices()
+
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(inter.indptr))
+    cols = inter.indices.astype(np.int64)
+    counts = inter.data.astype(np.int64)
+    union = csr.degree[rows] + csr.degree[cols] + 2 - counts
+
+    return CommonalityTable(P.nodes, inter.indptr, inter.indices, counts / union)
+
+
+def closed_neighborhood_jaccard_size_bounds(size: int, threshold: float):
+    """
+    Closed-neighborhood sizes a partner of a node with |N[u]| = size can have
+    and still reach closed_neighborhood_jaccard >= threshold.
+
+    The intersection is at most the smaller neighborhood and the union at
+    least the larger, so the Jaccard value never exceeds min/max of the two
+    sizes (the size filter of similarity joins): threshold * |N[u]| <= |N[v]|
+    <= |N[u]| / threshold. The bounds are computed with the same float
+    division as the value itself, so no passing pair falls outside them.
+
+    Returns
+    -------
+    (lo, hi) : inclusive bounds on |N[v]|; lo > hi when nothing can pass.
+    """
+    if threshold <= 0:
+        return 0, math.inf
+    if threshold > 1:
+        return 1, 0
+
+    lo = max(math.ceil(threshold * size), 1)
+    while lo > 1 and (lo - 1) / size >= threshold:
+        lo -= 1
+    while lo / size < threshold:
+        lo += 1
+
+    hi = math.floor(size / threshold)
+    while size / (hi + 1) >= threshold:
+        hi += 1
+    while size / hi < threshold:
+        hi -= 1
+
+    return lo, hi
+
+
+def closed_neighborhood_jaccard_batched(u: HCNode, v: HCNode) -> float:
+    """
+    closed_neighborhood_jaccard, carrying closed_neighborhood_jaccard_batch as
+    its batch form.
+
+    Engines prefetch the pairs of a batch predicate in blocks. For this value
+    the per-pair set intersection is already cheap, and gathering the blocks
+    costs more than the vectorised counts save (see
+    experiments.ring_lattice.batch_predicate_benchmark), so the batch form is
+    kept off closed_neighborhood_jaccard and only used when asked for.
+    """
+    return closed_neighborhood_jaccard(u, v)
+
+
+closed_neighborhood_jaccard.size_bounds = closed_neighborhood_jaccard_size_bounds
+closed_neighborhood_jaccard.table = closed_neighborhood_jaccard_table
+
+closed_neighborhood_jaccard_batched.batch = closed_neighborhood_jaccard_batch
+closed_neighborhood_jaccard_batched.size_bounds = closed_neighborhood_jaccard_size_bounds
+closed_neighborhood_jaccard_batched.table = closed_neighborhood_jaccard_table
+
 
+def closed_neighborhood_jaccard_predicate(threshold: float, batch: bool = False):
+    """
+    closed_neighborhood_jaccard >= threshold as a ThresholdPredicate.
 
-def closed_neighborhood_jaccard_predicate(threshold: float):
-    def predicate(u: HCNode, v: HCNode) -> bool:
-        return closed_neighborhood_jaccard(u, v) >= threshold
-    return predicate
\ No newline at end of file
+    With batch=True engines evaluate its pairs in vectorised blocks (see
+    closed_neighborhood_jaccard_batched); the default per-pair path is faster
+    for this value.
+    """
+    value = closed_neighborhood_jaccard_batched if batch else closed_neighborhood_jaccard
+    return ThresholdPredicate(value, threshold)
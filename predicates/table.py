@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class CommonalityTable:
+    """
+    Commonality values for every node pair within distance 2 of each other.
+
+    Stored as an upper-triangular CSR over node indices: the pairs of row i are
+    (i, indices[k]) for k in indptr[i]:indptr[i + 1], each with indices[k] > i,
+    and values[k] is their commonality. nodes maps an index back to its node id.
+
+    Every pair a Hypercommon triple can test lies within distance 2 (two of the
+    triple's nodes share the center as a neighbor), so one table covers all the
+    predicate work of a snapshot.
+    """
+
+    __slots__ = ("nodes", "indptr", "indices", "values")
+
+    def __init__(self, nodes, indptr, indices, values):
+        self.nodes = list(nodes)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.values)
+
+    def rows(self):
+        """Row index of every stored pair, aligned with indices and values."""
+        return np.repeat(np.arange(len(self.nodes), dtype=np.int32), np.diff(self.indptr))
+
+    def items(self):
+        """Yield (a, b, value) on node ids, one entry per unordered pair."""
+        nodes = self.nodes
+        for i, j, val in zip(self.rows().tolist(), self.indices.tolist(), self.values.tolist()):
+            yield nodes[i], nodes[j], val
+
+    def get(self, i, j, default=None):
+        """Value of the pair of node indices (i, j), or default if not within distance 2."""
+        if i > j:
+            i, j = j, i
+        start, end = self.indptr[i], self.indptr[i + 1]
+        k = start + np.searchsorted(self.indices[start:end], j)
+        if k < end and self.indices[k] == j:
+            return float(self.values[k])
+        return default
+
+    def mean(self):
+        return float(self.values.mean()) if len(self.values) else float("nan")
@@ -0,0 +1,62 @@
+class ThresholdPredicate:
+    """
+    The predicate commonality_value(u, v) >= threshold, with both parts exposed.
+
+    Calling it behaves like any other commonality predicate. Engines that see
+    the commonality_value and threshold attributes can instead cache the raw
+    values once per pair and reuse them across thresholds (see PreparedGraph).
+    Unlike a closure, instances pickle, so they can be sent to worker processes,
+    and two instances with the same parts compare (and hash) equal, so they can
+    key memoised results.
+
+    If commonality_value carries a batch(csr, us, vs) -> float array attribute,
+    the predicate exposes a matching batch that compares it to the threshold.
+    Likewise, a size_bounds(size, threshold) attribute (see
+    closed_neighborhood_jaccard_size_bounds) becomes size_bounds(size) here,
+    which engines use to skip pairs whose closed-neighborhood sizes are too far
+    apart to pass.
+    """
+
+    __slots__ = ("commonality_value", "threshold")
+
+    def __init__(self, commonality_value, threshold: float):
+        self.commonality_value = commonality_value
+        self.threshold = threshold
+
+    def __eq__(self, other):
+        if not isinstance(other, ThresholdPredicate):
+            return NotImplemented
+        return (self.commonality_value, self.threshold) == (other.commonality_value, other.threshold)
+
+    def __hash__(self):
+        return hash((self.commonality_value, self.threshold))
+
+    def __call__(self, u, v) -> bool:
+        return self.commonality_value(u, v) >= self.threshold
+
+    @property
+    def batch(self):
+        value_batch = getattr(self.commonality_value, "batch", None)
+        if value_batch is None:
+            return None
+        threshold = self.threshold
+
+        def batch(csr, us, vs):
+            return value_batch(csr, us, vs) >= threshold
+
+        return batch
+
+    @property
+    def size_bounds(self):
+        value_bounds = getattr(self.commonality_value, "size_bounds", None)
+        if value_bounds is None:
+            return None
+        threshold = self.threshold
+
+        def size_bounds(size):
+            return value_bounds(size, threshold)
+
+        return size_bounds
+
+    def __repr__(self):
+        return f"ThresholdPredicate({self.commonality_value.__name__}, {self.threshold})"
@@ -0,0 +1,25 @@
+"""Predicates shared by several test modules."""
+
+from predicates.jaccard import closed_neighborhood_jaccard
+
+
+class CountingJaccard:
+    """closed_neighborhood_jaccard(u, v) >= t as a plain callable, counting calls."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.calls = 0
+
+    def __call__(self, u, v):
+        self.calls += 1
+        return closed_neighborhood_jaccard(u, v) >= self.threshold
+
+
+class BlockPair:
+    """Passes every pair except one; picklable, unlike a closure."""
+
+    def __init__(self, blocked):
+        self.blocked = frozenset(blocked)
+
+    def __call__(self, u, v):
+        return {u.id, v.id} != self.blocked
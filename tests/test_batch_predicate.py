@@ -0,0 +1,94 @@
+"""
+Batch predicate protocol: a predicate (or its commonality_value) may expose
+batch(csr, us, vs). Engines must use it when present and give the same answers
+as the per-pair callable.
+"""
+
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from hypercommon.algorithm import get_communities, get_node_community
+from hypercommon.hypergraph import build_hypergraph
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard_batch
+
+
+class BatchOnlyCommonNeighbors:
+    """|N(u) & N(v)| >= 2, recording whether the scalar or the batch path ran."""
+
+    def __init__(self):
+        self.scalar_calls = 0
+        self.batch_calls = 0
+
+    def __call__(self, u, v):
+        self.scalar_calls += 1
+        return len(u.neighbors & v.neighbors) >= 2
+
+    def batch(self, csr, us, vs):
+        self.batch_calls += 1
+        return csr.common_counts(us, vs) >= 2
+
+
+def test_csr_rows_are_sorted_neighborhoods():
+    G = nx.Graph([("a", "c"), ("a", "b"), ("b", "c"), ("c", "d")])
+    P = PreparedGraph(G)
+    for u in G.nodes():
+        assert [P.nodes[i] for i in P.csr.row(P.index[u])] == sorted(
+            G.neighbors(u), key=P.index.__getitem__
+        )
+
+
+def test_batch_jaccard_matches_scalar():
+    G = nx.erdos_renyi_graph(40, 0.2, seed=2)
+    P = PreparedGraph(G)
+    pairs = list(itertools.combinations(G.nodes(), 2))
+    us = [P.index[a] for a, _ in pairs]
+    vs = [P.index[b] for _, b in pairs]
+
+    batch = closed_neighborhood_jaccard_batch(P.csr, us, vs)
+    scalar = [closed_neighborhood_jaccard(P.hc[a], P.hc[b]) for a, b in pairs]
+    assert batch.tolist() == scalar
+
+
+def test_threshold_predicate_exposes_batch():
+    G = nx.karate_club_graph()
+    P = PreparedGraph(G)
+    pred = closed_neighborhood_jaccard_predicate(0.3, batch=True)
+    result = pred.batch(P.csr, np.array([0, 0]), np.array([1, 33]))
+    assert result.dtype == bool
+    assert result.tolist() == [pred(P.hc[0], P.hc[1]), pred(P.hc[0], P.hc[33])]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_engine_uses_batch_and_agrees(seed):
+    G = nx.erdos_renyi_graph(60, 0.15, seed=seed)
+
+    batched = BatchOnlyCommonNeighbors()
+    reference = BatchOnlyCommonNeighbors()
+    reference_pred = lambda u, v: reference(u, v)  # hides .batch
+
+    assert get_communities(G, batched) == get_communities(G, reference_pred)
+    assert batched.batch_calls > 0
+    assert batched.scalar_calls == 0
+
+    assert set(build_hypergraph(G, batched).hypernodes()) == set(build_hypergraph(G, reference_pred).hypernodes())
+    for v in (0, 10, 20):
+        assert get_node_community(G, batched, v) == get_node_community(G, reference_pred, v)
+    assert batched.scalar_calls == 0
+
+
+def test_jaccard_batch_is_opt_in():
+    G = nx.karate_club_graph()
+    assert closed_neighborhood_jaccard_predicate(0.3).batch is None
+    assert PreparedGraph(G).check_functions(closed_neighborhood_jaccard_predicate(0.3))[1] is None
+
+    batched = closed_neighborhood_jaccard_predicate(0.3, batch=True)
+    assert PreparedGraph(G).check_functions(batched)[1] is not None
+    plain = closed_neighborhood_jaccard_predicate(0.3)
+    assert get_communities(G, batched) == get_communities(G, plain)
+    for v in (0, 16, 33):
+        assert get_node_community(G, batched, v) == get_node_community(G, plain, v)
@@ -0,0 +1,70 @@
+"""
+closed_neighborhood_jaccard_table must hold exactly the pairs within distance 2,
+each with the value the per-pair closed_neighborhood_jaccard gives.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard_table
+from predicates.threshold import ThresholdPredicate
+from utils.threshold import avg_threshold
+
+
+def pairs_within_two(G):
+    out = set()
+    for u, reach in nx.all_pairs_shortest_path_length(G, cutoff=2):
+        for v in reach:
+            if u != v:
+                out.add(frozenset((u, v)))
+    return out
+
+
+@pytest.mark.parametrize("G", [
+    nx.karate_club_graph(),
+    nx.erdos_renyi_graph(50, 0.1, seed=3),
+    ring_lattice([20, 10], [6, 4]),
+    nx.Graph([("x", "y"), ("y", "z")]),
+])
+def test_table_matches_scalar_jaccard(G):
+    P = PreparedGraph(G)
+    table = closed_neighborhood_jaccard_table(P)
+
+    entries = {frozenset((a, b)): val for a, b, val in table.items()}
+    assert len(entries) == len(table)
+    assert set(entries) == pairs_within_two(G)
+    for pair, val in entries.items():
+        a, b = tuple(pair)
+        assert val == closed_neighborhood_jaccard(P.hc[a], P.hc[b])
+
+
+def test_get_by_index():
+    G = nx.path_graph(4)
+    table = closed_neighborhood_jaccard_table(G)
+    assert table.get(0, 1) == pytest.approx(2 / 3)
+    assert table.get(2, 0) == pytest.approx(1 / 4)
+    assert table.get(0, 3) is None
+
+
+def test_precompute_fills_the_cache_once():
+    G = nx.karate_club_graph()
+    P = PreparedGraph(G)
+    assert P.precompute(closed_neighborhood_jaccard)
+    assert P.cache_size() == len(pairs_within_two(G))
+
+    plain = ThresholdPredicate(lambda u, v: closed_neighborhood_jaccard(u, v), 0.2)
+    assert not P.precompute(plain.commonality_value)
+
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities(P, pred) == get_communities(G, plain)
+
+
+def test_avg_threshold_uses_table():
+    G = nx.erdos_renyi_graph(40, 0.15, seed=5)
+    fast = avg_threshold(G, closed_neighborhood_jaccard, 0.6)
+    slow = avg_threshold(G, lambda u, v: closed_neighborhood_jaccard(u, v), 0.6)
+    assert fast == pytest.approx(slow, rel=1e-12)
@@ -0,0 +1,42 @@
+"""
+get_communities_multi must agree with one get_communities call per threshold,
+including community order, whatever order the thresholds are given in.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities, get_communities_multi
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+
+THRESHOLDS = [0.3, 0.0, 0.15, 0.5, 0.1, 1.0, 0.2, 0.15]
+
+
+def assert_matches_single(G, thresholds):
+    multi = get_communities_multi(G, closed_neighborhood_jaccard, thresholds)
+    assert len(multi) == len(thresholds)
+    for t, communities in zip(thresholds, multi):
+        assert communities == get_communities(G, closed_neighborhood_jaccard_predicate(t)), f"t={t}"
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_single_threshold_erdos_renyi(seed):
+    assert_matches_single(nx.erdos_renyi_graph(50, 0.15, seed=seed), THRESHOLDS)
+
+
+def test_matches_single_threshold_ring_lattice():
+    assert_matches_single(ring_lattice([30, 20, 10], [8, 6, 4]), THRESHOLDS)
+
+
+def test_matches_single_threshold_karate():
+    assert_matches_single(nx.karate_club_graph(), [round(i * 0.05, 2) for i in range(21)])
+
+
+def test_empty_threshold_list():
+    assert get_communities_multi(nx.karate_club_graph(), closed_neighborhood_jaccard, []) == []
+
+
+def test_thresholds_above_every_level():
+    G = nx.path_graph(5)
+    assert get_communities_multi(G, closed_neighborhood_jaccard, [1.5, 2.0]) == [[], []]
@@ -0,0 +1,73 @@
+"""
+CommunityIndex answers node -> community lookups from precomputed runs, and
+round-trips through an .npz file.
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon import CommunityIndex
+from hypercommon.algorithm import get_communities
+from predicates import closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard
+
+THRESHOLDS = [0.15, 0.25, 0.4]
+
+
+def _graph():
+    G = nx.erdos_renyi_graph(60, 0.15, seed=4)
+    G.add_nodes_from([100, 101])  # isolated, in no community
+    return G
+
+
+def assert_matches(index, G):
+    for t in THRESHOLDS:
+        communities = get_communities(G, closed_neighborhood_jaccard_predicate(t))
+        assert index.communities(t) == communities
+        for v in G.nodes():
+            expected = [c for c in communities if v in c]
+            assert index.lookup(v, t) == expected
+            assert index.community_ids(v, t).dtype == np.int32
+
+
+def test_build_matches_get_communities():
+    G = _graph()
+    assert_matches(CommunityIndex.build(G, closed_neighborhood_jaccard, THRESHOLDS), G)
+
+
+def test_from_communities():
+    G = ring_lattice([12, 10], [4, 4])
+    found = {t: get_communities(G, closed_neighborhood_jaccard_predicate(t)) for t in THRESHOLDS}
+    index = CommunityIndex.from_communities(found)
+    for t in THRESHOLDS:
+        assert index.communities(t) == found[t]
+
+
+def test_save_and_load(tmp_path):
+    G = _graph()
+    index = CommunityIndex.build(G, closed_neighborhood_jaccard, THRESHOLDS)
+    index.save(tmp_path / "index.npz")
+    loaded = CommunityIndex.load(tmp_path / "index.npz")
+    assert loaded.nodes == index.nodes
+    assert loaded.thresholds == THRESHOLDS
+    assert_matches(loaded, G)
+
+
+def test_save_and_load_non_integer_ids(tmp_path):
+    G = nx.relabel_nodes(ring_lattice([10, 8], [4, 4]), lambda u: ("n", u) if u % 2 else str(u))
+    index = CommunityIndex.build(G, closed_neighborhood_jaccard, [0.3])
+    index.save(tmp_path / "index.npz")
+    with pytest.raises(ValueError):
+        CommunityIndex.load(tmp_path / "index.npz")
+    loaded = CommunityIndex.load(tmp_path / "index.npz", allow_pickle=True)
+    assert loaded.communities(0.3) == index.communities(0.3)
+
+
+def test_unknown_node_or_threshold_raises():
+    index = CommunityIndex.build(_graph(), closed_neighborhood_jaccard, THRESHOLDS)
+    with pytest.raises(KeyError, match="threshold"):
+        index.lookup(0, 0.33)
+    with pytest.raises(KeyError, match="node"):
+        index.lookup("missing", 0.15)
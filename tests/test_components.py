@@ -0,0 +1,104 @@
+"""
+Per-component execution: splitting G into connected components, in worker
+processes or with memoised components, must reproduce get_communities exactly.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.components import connected_parts, edge_fingerprint
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard_predicate
+from utils.rewiring import rewire_step
+from tests.helpers import CountingJaccard
+
+
+def interleaved_rings():
+    # components whose nodes interleave in node order, so the merge has to
+    # put communities of different components in between each other
+    G0 = ring_lattice([12, 10, 8], [4, 4, 2])
+    nodes = list(G0.nodes())
+    random.Random(2).shuffle(nodes)
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(G0.edges())
+    G.add_edge(1000, 1001)  # too small for a triple
+    return G
+
+
+def test_connected_parts_skip_small_components():
+    G = interleaved_rings()
+    parts = connected_parts(PreparedGraph(G))
+    assert sorted(map(len, parts)) == [8, 10, 12]
+
+
+def test_fingerprint_ignores_order():
+    G = nx.Graph([(1, 2), (2, 3), (3, 1)])
+    H = nx.Graph()
+    H.add_nodes_from([1, 2, 3])
+    H.add_edges_from([(3, 1), (2, 1), (3, 2)])
+    assert edge_fingerprint(PreparedGraph(G), [1, 2, 3]) == edge_fingerprint(PreparedGraph(H), [3, 2, 1])
+    H.remove_edge(1, 3)
+    assert edge_fingerprint(PreparedGraph(G), [1, 2, 3]) != edge_fingerprint(PreparedGraph(H), [1, 2, 3])
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3, 0.5])
+def test_split_matches_whole_graph(threshold):
+    G = interleaved_rings()
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities(G, pred, memo={}) == get_communities(G, pred)
+
+
+def test_worker_processes_match_whole_graph():
+    G = ring_lattice([20, 20, 16, 12], [6, 6, 4, 4])
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    expected = get_communities(G, pred)
+
+    assert get_communities(G, pred, workers=2) == expected
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert get_communities(G, pred, workers=pool) == expected
+
+
+def test_memo_reuses_untouched_components():
+    rng = random.Random(0)
+    G = ring_lattice([20] * 5, [6] * 5)
+    pred = CountingJaccard(0.2)
+    memo = {}
+
+    get_communities(G, pred, memo=memo)
+    full = pred.calls
+    assert len(memo) == 5
+
+    # a rewiring step of one ring-0 edge touches ring 0 and at most one other
+    ring0 = [e for e in G.edges() if e[0] < 20 and e[1] < 20]
+    rewire_step(G=G, edge_stack=ring0, k=1, rng=rng)
+
+    pred.calls = 0
+    assert get_communities(G, pred, memo=memo) == get_communities(G, CountingJaccard(0.2))
+    assert 0 < pred.calls <= 2 * full / 5
+
+    # an unchanged snapshot is free
+    pred.calls = 0
+    get_communities(G, pred, memo=memo)
+    assert pred.calls == 0
+
+
+def test_equal_threshold_predicates_share_memo_entries():
+    G = ring_lattice([12, 12], [4, 4])
+    memo = {}
+    get_communities(G, closed_neighborhood_jaccard_predicate(0.2), memo=memo)
+    get_communities(G, closed_neighborhood_jaccard_predicate(0.2), memo=memo)
+    assert len(memo) == 2
+    get_communities(G, closed_neighborhood_jaccard_predicate(0.3), memo=memo)
+    assert len(memo) == 4
+
+
+def test_hypergraph_engine_rejects_split():
+    with pytest.raises(ValueError, match="unionfind"):
+        get_communities(nx.complete_graph(4), closed_neighborhood_jaccard_predicate(0.2),
+                        engine="hypergraph", memo={})
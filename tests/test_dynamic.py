@@ -0,0 +1,73 @@
+"""
+DynamicHypercommon must track get_communities exactly as edges are added,
+removed and rewired.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.dynamic import DynamicHypercommon
+from predicates import closed_neighborhood_jaccard_predicate
+from utils.rewiring import rewire_step
+
+
+def as_set(communities):
+    return {frozenset(c) for c in communities}
+
+
+def test_initial_communities_match():
+    G = nx.karate_club_graph()
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    dyn = DynamicHypercommon(G, pred)
+    assert as_set(dyn.communities()) == as_set(get_communities(G, pred))
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3])
+def test_tracks_a_rewiring_trajectory(threshold):
+    rng = random.Random(3)
+    G = ring_lattice([20, 20, 15], [6, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    dyn = DynamicHypercommon(G, pred)
+
+    edge_stack = list(G.edges())
+    rng.shuffle(edge_stack)
+    for _ in range(10):
+        rewire_step(G=G, edge_stack=edge_stack, k=6, rng=rng, dynamic=dyn)
+        assert as_set(dyn.communities()) == as_set(get_communities(G, pred))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_insertions_and_deletions(seed):
+    rng = random.Random(seed)
+    G = nx.erdos_renyi_graph(30, 0.15, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(0.25)
+    dyn = DynamicHypercommon(G, pred)
+
+    for _ in range(40):
+        if rng.random() < 0.5 and G.number_of_edges():
+            u, v = rng.choice(list(G.edges()))
+            G.remove_edge(u, v)
+            dyn.remove_edge(u, v)
+        else:
+            u, v = rng.sample(range(32), 2)  # 30, 31 are new nodes
+            G.add_edge(u, v)
+            dyn.add_edge(u, v)
+        assert as_set(dyn.communities()) == as_set(get_communities(G, pred))
+
+
+def test_remove_missing_edge_raises():
+    dyn = DynamicHypercommon(nx.path_graph(3), closed_neighborhood_jaccard_predicate(0.2))
+    with pytest.raises(KeyError):
+        dyn.remove_edge(0, 2)
+
+
+def test_input_graph_is_copied():
+    G = nx.complete_graph(4)
+    dyn = DynamicHypercommon(G, closed_neighborhood_jaccard_predicate(0.2))
+    dyn.remove_edge(0, 1)
+    assert G.has_edge(0, 1)
+    assert not dyn.has_edge(0, 1)
@@ -44,7 +44,7 @@ def test_triangle_threshold_too_high(triangle):
 def test_triangle_node_not_in_graph(triangle):
     """Node 99 not in graph — should raise."""
     pred = closed_neighborhood_jaccard_predicate(0.5)
-    with pytest.raises(Exception):
+    with pytest.raises(nx.NetworkXError):
         get_node_community(triangle, pred, 99)
 
 
@@ -0,0 +1,101 @@
+"""
+Graph inputs other than networkx: CSR arrays, (E, 2) edge arrays, and any
+object with neighbors() and has_edge(). Each must give the same communities
+as the networkx graph it describes.
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from hypercommon.algorithm import get_communities, get_communities_multi, get_node_community
+from hypercommon.hypergraph import build_hypergraph
+from hypercommon.prepared import PreparedGraph, prepare
+from predicates import closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard
+
+
+def _graph():
+    return nx.erdos_renyi_graph(70, 0.12, seed=3)
+
+
+def _csr(G):
+    nodes = list(G.nodes())
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum([G.degree(u) for u in nodes], out=indptr[1:])
+    indices = np.array([v for u in nodes for v in G.neighbors(u)], dtype=np.int32)
+    return indptr, indices
+
+
+class AdjacencyOnly:
+    """A graph known only through the neighbors/has_edge protocol."""
+
+    def __init__(self, G):
+        self._adj = {u: list(G.neighbors(u)) for u in G.nodes()}
+
+    def __iter__(self):
+        return iter(self._adj)
+
+    def neighbors(self, u):
+        return iter(self._adj[u])
+
+    def has_edge(self, u, v):
+        return v in self._adj[u]
+
+
+@pytest.mark.parametrize("form", ["edges", "csr", "scipy", "protocol"])
+def test_forms_match_networkx(form):
+    G = _graph()
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    if form == "edges":
+        H = np.array(list(G.edges()), dtype=np.int32)
+    elif form == "csr":
+        H = _csr(G)
+    elif form == "scipy":
+        H = sp.csr_matrix(nx.to_scipy_sparse_array(G, nodelist=list(G.nodes())))
+    else:
+        H = AdjacencyOnly(G)
+    expected = get_communities(G, pred)
+    got = get_communities(H, pred)
+    if form == "scipy":
+        # the sparse matrix lists neighbors in index order, which can reorder communities
+        assert sorted(map(sorted, got)) == sorted(map(sorted, expected))
+    else:
+        assert got == expected
+
+
+def test_from_edges_follows_networkx_construction():
+    G = nx.Graph()
+    G.add_nodes_from([5, 3, 9, 1])
+    edges = np.array([(3, 1), (1, 7), (3, 7), (1, 3), (7, 7)], dtype=np.int32)
+    G.add_edges_from(edges.tolist())
+    P = PreparedGraph.from_edges(edges, [5, 3, 9, 1])
+    assert P.nodes == list(G.nodes())
+    assert P.neighbor_lists == {u: list(G.neighbors(u)) for u in G.nodes()}
+
+
+def test_from_edges_without_edges():
+    # a fully disconnected snapshot, as np.array(list(G.edges())) gives it
+    P = PreparedGraph.from_edges(np.array([], dtype=np.int32), range(4))
+    assert P.nodes == [0, 1, 2, 3]
+    assert get_communities_multi(P, closed_neighborhood_jaccard, [0.2]) == [[]]
+
+
+def test_other_entry_points_accept_edge_arrays():
+    G = _graph()
+    edges = np.array(list(G.edges()), dtype=np.int32)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities_multi(edges, closed_neighborhood_jaccard, [0.2, 0.3]) == \
+        get_communities_multi(G, closed_neighborhood_jaccard, [0.2, 0.3])
+    assert get_node_community(edges, pred, 4) == get_node_community(G, pred, 4)
+    assert set(build_hypergraph(edges, pred).hypernodes()) == set(build_hypergraph(G, pred).hypernodes())
+
+
+def test_bad_shapes_raise():
+    with pytest.raises(ValueError, match="E, 2"):
+        prepare(np.zeros((4, 3), dtype=np.int32))
+    with pytest.raises(ValueError, match="every CSR row"):
+        PreparedGraph.from_csr([0, 1, 2], [1, 0], nodes=["a"])
+    with pytest.raises(TypeError, match="networkx.Graph"):
+        prepare([(0, 1), (1, 2)])
@@ -25,12 +25,13 @@ def test_two_components_hypergraph():
         (4, 5, 6)
     }
 
-    print(H.nodes())
+    print(H.hypernodes())
 
-    assert set(H.nodes()) == expected_hypernodes
+    assert set(H.hypernodes()) == expected_hypernodes
 
     # --- Each should be isolated (size=1 component each) ---
-    components = list(nx.connected_components(H))
+    labelled = H.hypernodes()
+    components = [{labelled[t] for t in part} for part in H.components()]
     assert len(components) == 2
     assert {(1, 2, 3)} in components
     assert {(4, 5, 6)} in components
@@ -31,8 +31,8 @@ def test_empty_graph():
     """Empty graph: no nodes, iterator yields nothing; should return empty H."""
     G = nx.Graph()
     H = build_hypergraph(G, _always_true)
-    assert H.number_of_nodes() == 0
-    assert H.number_of_edges() == 0
+    assert len(H) == 0
+    assert len(H.links) == 0
 
 
 def test_single_node():
@@ -40,8 +40,8 @@ def test_single_node():
     G = nx.Graph()
     G.add_node(0)
     H = build_hypergraph(G, _always_true)
-    assert H.number_of_nodes() == 0
-    assert H.number_of_edges() == 0
+    assert len(H) == 0
+    assert len(H.links) == 0
 
 
 def test_two_nodes_one_edge():
@@ -49,8 +49,8 @@ def test_two_nodes_one_edge():
     G = nx.Graph()
     G.add_edge(0, 1)
     H = build_hypergraph(G, _always_true)
-    assert H.number_of_nodes() == 0
-    assert H.number_of_edges() == 0
+    assert len(H) == 0
+    assert len(H.links) == 0
 
 
 def test_triangle_produces_hypernode():
@@ -58,8 +58,16 @@ def test_triangle_produces_hypernode():
     G = nx.Graph()
     G.add_edges_from([(1, 2), (2, 3), (3, 1)])
     H = build_hypergraph(G, _always_true)
-    assert set(H.nodes()) == {(1, 2, 3)}
-    assert H.number_of_edges() == 0
+    assert set(H.hypernodes()) == {(1, 2, 3)}
+    assert len(H.links) == 0
+
+
+def test_self_loop_makes_no_degenerate_triple():
+    """A self-loop is not a second neighbor: triangle plus loop is still one hypernode."""
+    G = nx.Graph()
+    G.add_edges_from([(1, 2), (2, 3), (3, 1), (2, 2)])
+    H = build_hypergraph(G, _always_true)
+    assert set(H.hypernodes()) == {(1, 2, 3)}
 
 
 # --- Predicate raises ---
@@ -86,21 +94,14 @@ def test_predicate_raises_propagates():
             assert "predicate failed" in str(e)
 
 
-def test_non_comparable_nodes_break_sorted():
-    """Nodes that are not mutually comparable break sorted(G.nodes())."""
+def test_non_comparable_nodes_are_supported():
+    """Nodes that are not mutually comparable work; triples follow node order."""
     G = nx.Graph()
     G.add_nodes_from([1, "a", (3,)])  # int, str, tuple
     G.add_edges_from([(1, "a"), ("a", (3,)), ((3,), 1)])  # triangle-ish
 
-    if HAS_PYTEST:
-        with pytest.raises(TypeError):
-            build_hypergraph(G, _always_true)
-    else:
-        try:
-            build_hypergraph(G, _always_true)
-            assert False, "expected TypeError from sorted()"
-        except TypeError:
-            pass
+    H = build_hypergraph(G, _always_true)
+    assert set(H.hypernodes()) == {(1, "a", (3,))}
 
 
 # --- Type validation (already in code) ---
@@ -141,8 +142,9 @@ def run_all():
     test_two_nodes_one_edge()
     test_wedge_produces_no_hypernode()
     test_triangle_produces_hypernode()
+    test_self_loop_makes_no_degenerate_triple()
     test_predicate_raises_propagates()
-    test_non_comparable_nodes_break_sorted()
+    test_non_comparable_nodes_are_supported()
     test_non_graph_raises()
     test_non_callable_predicate_raises()
     print("All edge-case tests passed.")
@@ -0,0 +1,54 @@
+"""
+build_hypergraph returns a HyperGraph: triples and links as int32 arrays,
+with degree(), components() and an on-demand to_networkx().
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.hypergraph import build_hypergraph
+from predicates import closed_neighborhood_jaccard_predicate
+
+
+def _graph():
+    return ring_lattice([24, 18, 12], [6, 4, 4])
+
+
+@pytest.mark.parametrize("mode", ["star", "clique"])
+def test_arrays_are_compact(mode):
+    H = build_hypergraph(_graph(), closed_neighborhood_jaccard_predicate(0.2), mode)
+    assert H.triples.dtype == np.int32 and H.triples.shape[1] == 3
+    assert H.links.dtype == np.int32 and H.links.shape[1] == 2
+    assert (np.diff(H.triples, axis=1) > 0).all()
+    assert (H.links[:, 0] < H.links[:, 1]).all()
+
+
+@pytest.mark.parametrize("mode", ["star", "clique"])
+def test_degree_and_components_match_networkx(mode):
+    H = build_hypergraph(_graph(), closed_neighborhood_jaccard_predicate(0.2), mode)
+    N = H.to_networkx()
+    labelled = H.hypernodes()
+    assert list(N.nodes()) == labelled
+    assert N.number_of_edges() == len(H.links)
+    assert H.degree().tolist() == [N.degree(t) for t in labelled]
+    assert [{labelled[t] for t in part} for part in H.components()] == list(nx.connected_components(N))
+    assert all(N.nodes[t]["members"] == t for t in labelled)
+
+
+def test_clique_links_every_pair_sharer():
+    # four triangles' worth of triples around the pair (0, 1)
+    G = nx.Graph([(0, 1), (0, 2), (1, 2), (0, 3), (1, 3), (0, 4), (1, 4)])
+    pred = lambda u, v: True
+    star = build_hypergraph(G, pred, "star")
+    clique = build_hypergraph(G, pred, "clique")
+    assert len(clique.links) > len(star.links)
+    assert [p.tolist() for p in clique.components()] == [p.tolist() for p in star.components()]
+
+
+def test_communities_match_get_communities():
+    G = nx.erdos_renyi_graph(70, 0.12, seed=2)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert build_hypergraph(G, pred).communities() == get_communities(G, pred)
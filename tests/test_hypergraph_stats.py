@@ -0,0 +1,80 @@
+"""
+hypergraph_stats counts what build_hypergraph would build, at every
+threshold, and must agree with it exactly.
+"""
+
+from collections import Counter
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.hypergraph import build_hypergraph, hypergraph_stats
+from predicates import ThresholdPredicate
+from predicates.jaccard import closed_neighborhood_jaccard
+
+
+def expected_stats(G, t, pair_connection_mode):
+    H = build_hypergraph(G, ThresholdPredicate(closed_neighborhood_jaccard, t), pair_connection_mode)
+    communities = H.communities()
+    multiplicity = Counter(v for c in communities for v in c)
+    return {
+        "threshold": t,
+        "triples": len(H),
+        "links": len(H.links),
+        "degrees": dict(sorted(Counter(H.degree().tolist()).items())),
+        "communities": len(communities),
+        "community_sizes": dict(sorted(Counter(len(c) for c in communities).items())),
+        "membership": dict(sorted(Counter(multiplicity.get(v, 0) for v in G).items())),
+    }
+
+
+THRESHOLDS = [0.3, 0.05, 0.2, 0.1, 0.5]
+
+
+@pytest.mark.parametrize("pair_connection_mode", ["star", "clique"])
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_build_hypergraph_erdos_renyi(seed, pair_connection_mode):
+    G = nx.erdos_renyi_graph(60, 0.15, seed=seed)
+    stats = hypergraph_stats(G, closed_neighborhood_jaccard, THRESHOLDS, pair_connection_mode)
+    assert stats == [expected_stats(G, t, pair_connection_mode) for t in THRESHOLDS]
+
+
+@pytest.mark.parametrize("pair_connection_mode", ["star", "clique"])
+def test_matches_build_hypergraph_ring_lattice(pair_connection_mode):
+    G = ring_lattice([30, 20, 10], [8, 6, 4])
+    thresholds = [0.05, 0.11, 0.2, 0.3]
+    stats = hypergraph_stats(G, closed_neighborhood_jaccard, thresholds, pair_connection_mode)
+    assert stats == [expected_stats(G, t, pair_connection_mode) for t in thresholds]
+
+
+def test_overlapping_communities_are_counted_per_node():
+    G = nx.karate_club_graph()
+    (stats,) = hypergraph_stats(G, closed_neighborhood_jaccard, [0.2])
+    assert stats == expected_stats(G, 0.2, "star")
+    assert sum(stats["membership"].values()) == G.number_of_nodes()
+
+
+def test_repeated_thresholds_and_empty_input():
+    G = nx.karate_club_graph()
+    first, second = hypergraph_stats(G, closed_neighborhood_jaccard, [0.2, 0.2])
+    assert first == second
+    assert hypergraph_stats(G, closed_neighborhood_jaccard, []) == []
+
+
+def test_no_triples():
+    (stats,) = hypergraph_stats(nx.empty_graph(5), closed_neighborhood_jaccard, [0.1])
+    assert stats == {
+        "threshold": 0.1,
+        "triples": 0,
+        "links": 0,
+        "degrees": {},
+        "communities": 0,
+        "community_sizes": {},
+        "membership": {0: 5},
+    }
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        hypergraph_stats(nx.karate_club_graph(), closed_neighborhood_jaccard, [0.2], "chain")
@@ -0,0 +1,57 @@
+"""
+HCNode compact forms: closed_size, bitset and sorted-array neighborhoods must
+describe the same neighborhood as the neighbor set, and Jaccard must not
+depend on which form it reads.
+"""
+
+import itertools
+
+import networkx as nx
+import pytest
+
+from hypercommon.algorithm import get_communities
+from hypercommon.hypernode import HCNode
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+
+
+def reference_jaccard(u, v):
+    Nu = u.neighbors | {u.id}
+    Nv = v.neighbors | {v.id}
+    return len(Nu & Nv) / len(Nu | Nv)
+
+
+def test_closed_size():
+    assert HCNode(1, {2, 3}).closed_size == 3
+    assert HCNode(1, set()).closed_size == 1
+    assert HCNode(1, {1, 2}).closed_size == 2  # self-loop
+
+
+def test_forms_describe_the_neighbor_set():
+    G = nx.erdos_renyi_graph(30, 0.2, seed=1)
+    P = PreparedGraph(G, forms=("bits", "array"))
+    for u, node in P.hc.items():
+        expected = {P.index[x] for x in node.neighbors}
+        assert set(node.array.tolist()) == expected
+        assert list(node.array) == sorted(node.array)
+        assert {i for i in range(len(P)) if (node.bits >> i) & 1} == expected
+
+
+@pytest.mark.parametrize("forms", [(), ("bits",), ("array",), ("bits", "array")])
+def test_jaccard_is_form_independent(forms):
+    G = nx.erdos_renyi_graph(35, 0.2, seed=7)
+    G.add_edges_from([(0, 0), (3, 3)])  # self-loops
+    P = PreparedGraph(G, forms=forms)
+    for a, b in itertools.combinations(G.nodes(), 2):
+        assert closed_neighborhood_jaccard(P.hc[a], P.hc[b]) == reference_jaccard(P.hc[a], P.hc[b])
+
+
+def test_communities_with_bitsets():
+    G = nx.karate_club_graph()
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities(PreparedGraph(G, forms=("bits",)), pred) == get_communities(G, pred)
+
+
+def test_unknown_form_raises():
+    with pytest.raises(ValueError, match="forms"):
+        PreparedGraph(nx.path_graph(3), forms=("hash",))
@@ -0,0 +1,79 @@
+"""
+iter_communities streams the communities of get_communities, in the same
+order, one finished community at a time.
+"""
+
+import itertools
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon import iter_communities
+from hypercommon.algorithm import get_communities
+from predicates import closed_neighborhood_jaccard_predicate
+from tests.helpers import CountingJaccard
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_get_communities_erdos_renyi(seed, threshold):
+    G = nx.erdos_renyi_graph(60, 0.15, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert list(iter_communities(G, pred)) == get_communities(G, pred)
+
+
+@pytest.mark.parametrize("threshold", [0.05, 0.11, 0.2, 0.3])
+def test_matches_get_communities_ring_lattice(threshold):
+    G = ring_lattice([30, 20, 10], [8, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert list(iter_communities(G, pred)) == get_communities(G, pred)
+
+
+def test_karate_and_overlapping_nodes():
+    G = nx.karate_club_graph()
+    for threshold in (0.1, 0.2, 0.3):
+        pred = closed_neighborhood_jaccard_predicate(threshold)
+        assert list(iter_communities(G, pred)) == get_communities(G, pred)
+
+
+def test_no_communities():
+    G = nx.empty_graph(6)
+    assert list(iter_communities(G, closed_neighborhood_jaccard_predicate(0.1))) == []
+
+
+def test_first_community_before_the_rest_are_checked():
+    """The first community is yielded having checked little beyond itself."""
+    G = ring_lattice([40] * 10, [8] * 10)
+
+    full = CountingJaccard(0.2)
+    communities = get_communities(G, full)
+    assert len(communities) == 10
+
+    streamed = CountingJaccard(0.2)
+    first = next(iter_communities(G, streamed))
+    assert first == communities[0]
+    assert streamed.calls < full.calls / 3
+
+
+def test_early_exit():
+    G = ring_lattice([20, 60, 20, 60], [6, 8, 6, 8])
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    big = next(c for c in iter_communities(G, pred) if len(c) > 50)
+    assert big == next(c for c in get_communities(G, pred) if len(c) > 50)
+
+
+def test_is_lazy():
+    G = nx.karate_club_graph()
+    pred = CountingJaccard(0.2)
+    stream = iter_communities(G, pred)
+    assert pred.calls == 0
+    list(itertools.islice(stream, 1))
+    assert pred.calls > 0
+
+
+def test_validates_when_called():
+    with pytest.raises(TypeError):
+        iter_communities(nx.path_graph(3), "not callable")
+    with pytest.raises(TypeError):
+        iter_communities([(0, 1), (1, 2)], closed_neighborhood_jaccard_predicate(0.2))
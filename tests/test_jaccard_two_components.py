@@ -37,9 +37,9 @@ def test_jaccard_two_components():
         (5, 6, 7)
     }
 
-    assert set(H.nodes()) == expected
+    assert set(H.hypernodes()) == expected
 
-    components = list(nx.connected_components(H))
+    components = H.components()
 
     assert len(components) == 2
 
@@ -0,0 +1,129 @@
+"""
+get_node_community reads networkx graphs lazily, touching only the nodes the
+search reaches, and stops early under a Budget, reporting that it did.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon import Budget
+from hypercommon.algorithm import get_node_community
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard_batch
+
+
+class CountingGraph:
+    """A neighbors()/has_edge() graph recording which nodes were read."""
+
+    def __init__(self, G):
+        self.G = G
+        self.read = set()
+
+    def __contains__(self, u):
+        return u in self.G
+
+    def neighbors(self, u):
+        self.read.add(u)
+        return self.G.neighbors(u)
+
+    def has_edge(self, u, v):
+        return self.G.has_edge(u, v)
+
+
+def _chain_of_rings(rings=200, size=30):
+    G = ring_lattice([size] * rings, [6] * rings)
+    G.add_edges_from((i * size, (i + 1) * size) for i in range(rings - 1))
+    return G
+
+
+def test_lazy_query_reads_only_the_neighborhood_of_the_community():
+    G = _chain_of_rings()
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    C = CountingGraph(G)
+    found = get_node_community(C, pred, 5)
+    assert found == get_node_community(PreparedGraph(G), pred, 5)
+    assert len(found) == 30
+    assert len(C.read) < 100
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_lazy_matches_prepared(seed):
+    G = nx.erdos_renyi_graph(60, 0.12, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    P = PreparedGraph(G)
+    for v in range(0, 60, 7):
+        assert get_node_community(G, pred, v) == get_node_community(P, pred, v)
+
+
+def test_generous_budget_is_not_truncated():
+    G = _chain_of_rings(rings=5)
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    budget = Budget(max_checks=10**6, max_size=1000, max_seconds=60)
+    assert get_node_community(G, pred, 5, budget=budget) == get_node_community(G, pred, 5)
+    assert not budget.truncated and budget.reason is None
+    assert budget.checks > 0
+
+
+def test_size_budget():
+    G = _chain_of_rings(rings=5)
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    full = get_node_community(G, pred, 5)
+    budget = Budget(max_size=10)
+    found = get_node_community(G, pred, 5, budget=budget)
+    assert len(found) == 10 and found < full
+    assert budget.truncated and budget.reason == "size"
+
+
+def test_check_budget():
+    G = _chain_of_rings(rings=5)
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    budget = Budget(max_checks=40)
+    found = get_node_community(G, pred, 5, budget=budget)
+    assert budget.truncated and budget.reason == "checks"
+    assert budget.checks == 40
+    assert found is None or found < get_node_community(G, pred, 5)
+
+
+class CountingBatchJaccard:
+    """closed_neighborhood_jaccard >= t with a batch path, counting every pair evaluated."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.evaluated = 0
+
+    def __call__(self, u, v):
+        self.evaluated += 1
+        return closed_neighborhood_jaccard(u, v) >= self.threshold
+
+    def batch(self, csr, us, vs):
+        self.evaluated += len(us)
+        return closed_neighborhood_jaccard_batch(csr, us, vs) >= self.threshold
+
+
+@pytest.mark.parametrize("prepared", [False, True])
+def test_check_budget_bounds_batch_evaluations(prepared):
+    G = _chain_of_rings(rings=5)
+    pred = CountingBatchJaccard(0.3)
+    budget = Budget(max_checks=10)
+    get_node_community(PreparedGraph(G) if prepared else G, pred, 5, budget=budget)
+    assert budget.reason == "checks"
+    assert pred.evaluated <= 10
+
+
+def test_time_budget_and_reuse():
+    G = _chain_of_rings(rings=5)
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    budget = Budget(max_seconds=0)
+    get_node_community(G, pred, 5, budget=budget)
+    assert budget.truncated and budget.reason == "seconds"
+
+    budget.max_seconds = None
+    get_node_community(G, pred, 5, budget=budget)
+    assert not budget.truncated
+
+
+def test_negative_limit_raises():
+    with pytest.raises(ValueError, match="max_checks"):
+        Budget(max_checks=-1)
@@ -167,7 +167,7 @@ def test_a_pair_belongs_to_exactly_one_community(seed, threshold):
 
     from hypercommon.hypergraph import build_hypergraph
 
-    H = build_hypergraph(G, pred)
+    H = build_hypergraph(G, pred).to_networkx()
     components = list(nx.connected_components(H))
 
     pair_to_component = {}
@@ -0,0 +1,53 @@
+"""
+get_node_communities answers many seeds at once; every answer must be a
+global community containing the seed, as for get_node_community.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities, get_node_communities
+from predicates import closed_neighborhood_jaccard_predicate
+from tests.helpers import CountingJaccard
+
+
+def assert_global(G, pred, found):
+    communities = get_communities(G, pred)
+    for v, local in found.items():
+        candidates = [c for c in communities if v in c]
+        if not candidates:
+            assert local is None
+        else:
+            assert local in candidates
+
+
+@pytest.mark.parametrize("threshold", [0.15, 0.25])
+@pytest.mark.parametrize("seed", range(3))
+def test_every_seed_gets_a_global_community(seed, threshold):
+    G = nx.erdos_renyi_graph(50, 0.18, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert_global(G, pred, get_node_communities(G, pred, G.nodes()))
+
+
+def test_covered_seeds_share_one_search():
+    G = ring_lattice([20, 20, 20], [4, 4, 4])
+    pred = CountingJaccard(0.3)
+    found = get_node_communities(G, pred, range(60))
+    assert len({id(c) for c in found.values()}) == 3
+    assert found[0] is found[19]
+    one = CountingJaccard(0.3)
+    get_node_communities(G, one, [0])
+    assert pred.calls <= 3 * one.calls
+
+
+def test_workers_match_serial():
+    G = ring_lattice([16, 12, 10], [4, 4, 4])
+    pred = closed_neighborhood_jaccard_predicate(0.3)
+    seeds = list(G.nodes())
+    assert get_node_communities(G, pred, seeds, workers=2) == get_node_communities(G, pred, seeds)
+
+
+def test_unknown_seed_raises():
+    with pytest.raises(nx.NetworkXError):
+        get_node_communities(nx.complete_graph(4), closed_neighborhood_jaccard_predicate(0.2), [0, 9])
@@ -0,0 +1,72 @@
+"""
+Engines run on node indices and map back to node ids on exit, so any hashable
+ids work, comparable or not, and give the communities of the same graph with
+integer ids.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities, get_communities_multi, get_node_community
+from predicates import closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard
+
+
+class Opaque:
+    """A hashable node id with no ordering."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def __hash__(self):
+        return hash(("opaque", self.n))
+
+    def __eq__(self, other):
+        return isinstance(other, Opaque) and other.n == self.n
+
+
+def _labels(G):
+    # a mix of types that cannot be compared with each other
+    kinds = [str, lambda u: (u,), Opaque, lambda u: u]
+    return {u: kinds[u % 4](u) for u in G.nodes()}
+
+
+def _relabelled(communities, mapping):
+    return [{mapping[u] for u in c} for c in communities]
+
+
+@pytest.mark.parametrize("engine", ["unionfind", "hypergraph", "numpy"])
+def test_get_communities_maps_back(engine):
+    G = ring_lattice([20, 16, 12], [6, 4, 4])
+    mapping = _labels(G)
+    R = nx.relabel_nodes(G, mapping)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    expected = _relabelled(get_communities(G, pred), mapping)
+    assert get_communities(R, pred, engine=engine) == expected
+
+
+def test_component_memo_maps_back():
+    G = ring_lattice([20, 16, 12], [6, 4, 4])
+    mapping = _labels(G)
+    R = nx.relabel_nodes(G, mapping)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    expected = _relabelled(get_communities(G, pred), mapping)
+    memo = {}
+    assert get_communities(R, pred, memo=memo) == expected
+    assert memo
+    assert get_communities(R, pred, memo=memo) == expected
+
+
+def test_multi_and_node_community_map_back():
+    G = nx.erdos_renyi_graph(60, 0.15, seed=5)
+    mapping = _labels(G)
+    R = nx.relabel_nodes(G, mapping)
+    thresholds = [0.15, 0.3]
+    expected = [_relabelled(cs, mapping) for cs in get_communities_multi(G, closed_neighborhood_jaccard, thresholds)]
+    assert get_communities_multi(R, closed_neighborhood_jaccard, thresholds) == expected
+
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    for v in (0, 1, 2, 3):
+        found = get_node_community(G, pred, v)
+        assert get_node_community(R, pred, mapping[v]) == (None if found is None else {mapping[u] for u in found})
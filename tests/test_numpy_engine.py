@@ -0,0 +1,64 @@
+"""
+engine="numpy" runs the whole pipeline as array operations; its output must
+match get_communities exactly, order included.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.prepared import PreparedGraph
+from hypercommon.vectorized import communities_numpy
+from predicates import closed_neighborhood_jaccard_predicate
+from tests.test_batch_predicate import BatchOnlyCommonNeighbors
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3, 0.5])
+def test_matches_unionfind_on_ring_lattice(threshold):
+    G = ring_lattice([30, 24, 16], [8, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities(G, pred, engine="numpy") == get_communities(G, pred)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_unionfind_on_random_graphs(seed):
+    G = nx.erdos_renyi_graph(80, 0.1, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities(G, pred, engine="numpy") == get_communities(G, pred)
+
+
+def test_node_order_and_labels_are_kept():
+    G = nx.relabel_nodes(nx.erdos_renyi_graph(60, 0.15, seed=7), lambda u: f"n{59 - u}")
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    P = PreparedGraph(G, order="degree")
+    assert get_communities(P, pred, engine="numpy") == get_communities(P, pred)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_only_predicate(seed):
+    G = nx.erdos_renyi_graph(60, 0.15, seed=seed)
+    pred = BatchOnlyCommonNeighbors()
+    expected = get_communities(G, lambda u, v: pred(u, v))
+    pred.scalar_calls = 0
+    assert get_communities(G, pred, engine="numpy") == expected
+    assert pred.scalar_calls == 0
+    assert pred.batch_calls > 0
+
+
+def test_no_triples():
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities(nx.path_graph(2), pred, engine="numpy") == []
+    assert communities_numpy(PreparedGraph(nx.Graph()), pred) == []
+
+
+def test_plain_callable_is_rejected():
+    G = nx.complete_graph(4)
+    with pytest.raises(ValueError, match="numpy"):
+        get_communities(G, lambda u, v: True, engine="numpy")
+
+
+def test_workers_need_unionfind():
+    G = nx.complete_graph(4)
+    with pytest.raises(ValueError, match="unionfind"):
+        get_communities(G, closed_neighborhood_jaccard_predicate(0.2), engine="numpy", workers=2)
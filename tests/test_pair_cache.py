@@ -0,0 +1,126 @@
+"""
+Bounded pair caches: a PreparedGraph (or LazyGraph) with cache_limit must give the same
+communities as an unbounded one while never holding more than the limit, and
+a locality-preserving center order must keep the recomputation low.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities, get_communities_multi, get_node_community
+from hypercommon.cache import ClockCache
+from hypercommon.prepared import LazyGraph, PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from tests.helpers import CountingJaccard
+
+
+def shuffled_rings():
+    # ring lattice whose node order has no locality at all
+    G0 = ring_lattice([60] * 5, [10] * 5)
+    nodes = list(G0.nodes())
+    random.Random(1).shuffle(nodes)
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(G0.edges())
+    return G
+
+
+def as_set(communities):
+    return {frozenset(c) for c in communities}
+
+
+def test_clock_cache_respects_capacity():
+    cache = ClockCache(3)
+    for key in range(10):
+        cache[key] = key * key
+        assert len(cache) <= 3
+    assert len(cache) == 3
+    assert all(cache.get(key) == key * key for key in range(10) if key in cache)
+
+
+def test_clock_cache_gives_used_entries_a_second_chance():
+    cache = ClockCache(3)
+    for key in (1, 2, 3):
+        cache[key] = key
+    assert cache.get(1) == 1
+    cache[4] = 4  # 1 was used since insertion, so 2 goes first
+    assert 1 in cache and 2 not in cache
+    assert cache.get(2) is None
+
+
+def test_clock_cache_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        ClockCache(0)
+
+
+@pytest.mark.parametrize("limit", [None, 1, 50, 1000])
+@pytest.mark.parametrize("order", [None, "bfs", "degree"])
+def test_bounded_cache_gives_same_communities(limit, order):
+    G = shuffled_rings()
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    P = PreparedGraph(G, cache_limit=limit, order=order)
+
+    communities = get_communities(P, pred)
+    assert as_set(communities) == as_set(get_communities(G, pred))
+    if order is None:
+        assert communities == get_communities(G, pred)
+    if limit is not None:
+        assert P.cache_size() <= limit
+
+
+def test_bounded_cache_multi_and_local():
+    G = nx.karate_club_graph()
+    thresholds = [0.1, 0.2, 0.3]
+    P = PreparedGraph(G, cache_limit=40)
+
+    assert not P.precompute(closed_neighborhood_jaccard)  # table does not fit
+    assert get_communities_multi(P, closed_neighborhood_jaccard, thresholds) == \
+        get_communities_multi(G, closed_neighborhood_jaccard, thresholds)
+
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    for v in (0, 16, 33):
+        assert get_node_community(P, pred, v) == get_node_community(G, pred, v)
+    assert P.cache_size() <= 40
+
+
+def test_bounded_lazy_query():
+    G = ring_lattice([40] * 3, [8] * 3)
+    unbounded = CountingJaccard(0.3)
+    expected = get_node_community(G, unbounded, 5)
+
+    bounded = CountingJaccard(0.3)
+    assert get_node_community(LazyGraph(G, cache_limit=8), bounded, 5) == expected
+    assert bounded.calls > unbounded.calls  # evicted pairs were recomputed
+    with pytest.raises(ValueError, match="cache_limit"):
+        LazyGraph(G, cache_limit=0)
+
+
+def test_bfs_order_keeps_a_small_cache_hitting():
+    G = shuffled_rings()
+    unbounded = CountingJaccard(0.2)
+    get_communities(PreparedGraph(G), unbounded)
+
+    given = CountingJaccard(0.2)
+    get_communities(PreparedGraph(G, cache_limit=500), given)
+    bfs = CountingJaccard(0.2)
+    get_communities(PreparedGraph(G, cache_limit=500, order="bfs"), bfs)
+
+    assert given.calls > 1.5 * unbounded.calls
+    assert bfs.calls < 1.1 * unbounded.calls
+
+
+def test_invalid_cache_options_raise():
+    with pytest.raises(ValueError, match="cache_limit"):
+        PreparedGraph(nx.path_graph(3), cache_limit=0)
+    with pytest.raises(ValueError, match="order"):
+        PreparedGraph(nx.path_graph(3), order="random")
+
+
+def test_pair_key_is_symmetric_and_needs_no_node_ordering():
+    G = nx.Graph([("a", 1), (1, (2,))])
+    P = PreparedGraph(G)
+    assert P.pair_key("a", 1) == P.pair_key(1, "a")
+    assert len({P.pair_key(u, v) for u in G for v in G if u != v}) == 3
@@ -0,0 +1,67 @@
+"""
+engine="parallel" splits the centers across worker processes sharing the
+graph; its output must match get_communities exactly, order included.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.parallel import _center_ranges
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard_predicate
+from tests.helpers import BlockPair
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3])
+def test_matches_serial_on_ring_lattice(threshold):
+    G = ring_lattice([30, 24, 16], [8, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities(G, pred, engine="parallel", workers=2) == get_communities(G, pred)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_serial_on_random_graphs(seed):
+    G = nx.erdos_renyi_graph(80, 0.1, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities(G, pred, engine="parallel", workers=3) == get_communities(G, pred)
+
+
+def test_pair_deferred_in_one_range_admitted_in_another():
+    # the same shape as the union-find engine's bridging test: (2, 3) is
+    # deferred by centers 0 and 4, which end up in different ranges
+    G = nx.Graph([(0, 1), (0, 2), (0, 3), (4, 5), (4, 2), (4, 3)])
+    pred = BlockPair({0, 4})
+    assert get_communities(G, pred, engine="parallel", workers=2) == [{0, 1, 2, 3, 4, 5}]
+
+
+def test_center_ranges_cover_the_node_order():
+    P = PreparedGraph(nx.barabasi_albert_graph(200, 3, seed=1))
+    ranges = _center_ranges(P, 8)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(P)
+    assert all(a < b for a, b in ranges)
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+
+
+def test_single_worker_and_tiny_graphs():
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    G = nx.karate_club_graph()
+    assert get_communities(G, pred, engine="parallel", workers=1) == get_communities(G, pred)
+    assert get_communities(nx.path_graph(2), pred, engine="parallel", workers=2) == []
+
+
+def test_parallel_rejects_memo_and_executors():
+    G = nx.complete_graph(4)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    with pytest.raises(ValueError, match="memo"):
+        get_communities(G, pred, engine="parallel", memo={})
+    with pytest.raises(TypeError, match="workers"):
+        get_communities(G, pred, engine="parallel", workers=object())
+
+
+def test_named_nodes_reach_the_workers():
+    # the predicate sees node ids, which here are not the workers' row numbers
+    G = nx.relabel_nodes(nx.Graph([(0, 1), (0, 2), (0, 3), (4, 5), (4, 2), (4, 3)]), str)
+    pred = BlockPair({"0", "4"})
+    assert get_communities(G, pred, engine="parallel", workers=2) == [{"0", "1", "2", "3", "4", "5"}]
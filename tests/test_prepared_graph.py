@@ -0,0 +1,79 @@
+"""
+A PreparedGraph must give the same answers as the raw graph, and must reuse
+commonality values across calls instead of recomputing them.
+"""
+
+import networkx as nx
+import pytest
+
+from hypercommon.algorithm import get_communities, get_communities_multi, get_node_community
+from hypercommon.hypergraph import build_hypergraph
+from hypercommon.prepared import PreparedGraph
+from predicates import ThresholdPredicate, closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+
+
+class CountingValue:
+    """closed_neighborhood_jaccard that counts how often it is evaluated."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, u, v):
+        self.calls += 1
+        return closed_neighborhood_jaccard(u, v)
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3])
+def test_same_results_as_raw_graph(threshold):
+    G = nx.erdos_renyi_graph(50, 0.15, seed=4)
+    P = PreparedGraph(G)
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+
+    assert get_communities(P, pred) == get_communities(G, pred)
+    assert set(build_hypergraph(P, pred).hypernodes()) == set(build_hypergraph(G, pred).hypernodes())
+    for v in (0, 7, 23):
+        assert get_node_community(P, pred, v) == get_node_community(G, pred, v)
+
+
+def test_values_are_computed_once_across_thresholds():
+    G = nx.karate_club_graph()
+    P = PreparedGraph(G)
+    value = CountingValue()
+
+    get_communities(P, ThresholdPredicate(value, 0.3))
+    first = value.calls
+    assert first == P.cache_size()
+    get_communities(P, ThresholdPredicate(value, 0.3))
+    assert value.calls == first
+
+    # The multi-threshold pass evaluates every pair a triple can test; after it,
+    # no threshold and no local query computes anything new.
+    get_communities_multi(P, value, [0.1, 0.2])
+    evaluated = value.calls
+    for t in (0.25, 0.2, 0.05, 0.35):
+        get_communities(P, ThresholdPredicate(value, t))
+    get_node_community(P, ThresholdPredicate(value, 0.2), 0)
+    assert value.calls == evaluated
+
+
+def test_plain_predicates_still_work():
+    G = nx.karate_club_graph()
+    P = PreparedGraph(G)
+
+    def pred(u, v):
+        return len(u.neighbors & v.neighbors) >= 2
+
+    assert get_communities(P, pred) == get_communities(G, pred)
+    assert P.cache_size() == 0
+
+
+def test_snapshot_is_not_affected_by_later_edits():
+    G = nx.complete_graph(4)
+    P = PreparedGraph(G)
+    G.remove_edge(0, 1)
+    assert P.has_edge(0, 1)
+
+
+def test_rejects_non_graph():
+    with pytest.raises(TypeError, match="networkx.Graph"):
+        PreparedGraph([(0, 1)])
@@ -0,0 +1,142 @@
+"""
+CommunityServer answers community(v, t) and communities(t) over JSON lines,
+matching the library's answers, and keeps what it found warm.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.server import CommunityClient, CommunityServer
+from predicates import closed_neighborhood_jaccard_predicate
+
+
+def _graph():
+    G = ring_lattice([20, 16, 12], [6, 4, 4])
+    G.add_edges_from([(0, 20), (20, 36)])
+    G.add_node(99)
+    return G
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _with_client(G, body, unix_path=None, **kwargs):
+    server = CommunityServer(G, closed_neighborhood_jaccard_predicate, **kwargs)
+    await server.start(path=unix_path)
+    address = server.address()
+    if unix_path is not None:
+        client = await CommunityClient.connect(path=address)
+    else:
+        client = await CommunityClient.connect(host=address[0], port=address[1])
+    try:
+        return await body(client, server)
+    finally:
+        await client.close()
+        await server.close()
+
+
+def _communities_of(G, v, t):
+    return [c for c in get_communities(G, closed_neighborhood_jaccard_predicate(t)) if v in c]
+
+
+@pytest.mark.parametrize("transport", ["tcp", "unix"])
+def test_concurrent_community_requests(transport, tmp_path):
+    G = _graph()
+
+    async def body(client, server):
+        return await asyncio.gather(*(client.community(v, 0.3) for v in G.nodes()))
+
+    path = str(tmp_path / "hc.sock") if transport == "unix" else None
+    found = run(_with_client(G, body, unix_path=path))
+    for v, c in zip(G.nodes(), found):
+        expected = _communities_of(G, v, 0.3)
+        if not expected:
+            assert c is None
+        else:
+            assert set(c) in expected
+
+
+def test_batching_and_cache_stats():
+    G = _graph()
+
+    async def body(client, server):
+        first = await asyncio.gather(*(client.community(v, 0.3) for v in range(20)))
+        again = await asyncio.gather(*(client.community(v, 0.3) for v in range(20)))
+        return first, again, await client.stats()
+
+    first, again, stats = run(_with_client(G, body, batch_window=0.05))
+    assert first == again
+    assert stats["requests"] == 41
+    assert stats["batches"] < 41
+    assert stats["misses"] <= 2  # one search per community hit in the first batch
+    assert stats["hits"] >= 38
+    assert stats["pair_values"] > 0
+
+
+def test_communities_request_matches_get_communities():
+    G = _graph()
+
+    async def body(client, server):
+        whole = await client.communities(0.3)
+        local = await client.community(5, 0.3)
+        return whole, local, await client.stats()
+
+    whole, local, stats = run(_with_client(G, body))
+    assert [set(c) for c in whole] == get_communities(G, closed_neighborhood_jaccard_predicate(0.3))
+    assert set(local) in [set(c) for c in whole]
+    assert stats["hits"] == 1  # the community request was answered from the full run
+
+
+def test_cached_thresholds_are_bounded():
+    G = _graph()
+
+    async def body(client, server):
+        async def misses(request):
+            await request
+            return (await client.stats())["misses"]
+
+        return [
+            await misses(client.communities(0.3)),  # search
+            await misses(client.community(5, 0.1)),  # search
+            await misses(client.community(5, 0.3)),  # kept, and most recent again
+            await misses(client.community(5, 0.2)),  # search, evicting 0.1
+            await misses(client.community(5, 0.3)),  # still kept
+            await misses(client.community(5, 0.1)),  # evicted: searched again, evicting 0.2
+            await misses(client.communities(0.3)),  # still kept
+            await misses(client.community(5, 0.2)),  # evicted: searched again
+        ]
+
+    assert run(_with_client(G, body, max_thresholds=2)) == [1, 2, 2, 3, 3, 4, 4, 5]
+
+
+def test_errors_do_not_stop_the_server():
+    G = _graph()
+
+    async def body(client, server):
+        errors = []
+        for request in ({"op": "community", "node": 12345, "t": 0.3}, {"op": "nope"}, {"op": "community", "node": 1}):
+            with pytest.raises(RuntimeError) as info:
+                await client.request(**request)
+            errors.append(str(info.value))
+
+        # a line that is not JSON gets an error reply with a null id
+        host, port = server.address()
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b"not json\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+        return errors, reply, await client.community(99, 0.3)
+
+    errors, reply, isolated = run(_with_client(G, body))
+    assert "not in G" in errors[0]
+    assert "unknown op" in errors[1]
+    assert "needs node and t" in errors[2]
+    assert reply["id"] is None and "bad request" in reply["error"]
+    assert isolated is None
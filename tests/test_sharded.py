@@ -0,0 +1,72 @@
+"""
+Halo-sharded execution: each shard runs on its centers plus a 2-hop halo, and
+the stitched result must equal get_communities exactly, order included.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon import get_communities_sharded
+from hypercommon.algorithm import get_communities
+from hypercommon.prepared import PreparedGraph
+from hypercommon.sharded import partition, shard_view
+from predicates import closed_neighborhood_jaccard_predicate
+from tests.helpers import BlockPair
+
+
+@pytest.mark.parametrize("method", ["range", "label_propagation"])
+@pytest.mark.parametrize("shards", [1, 2, 5, 13])
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.35])
+def test_matches_get_communities(method, shards, threshold):
+    G = nx.erdos_renyi_graph(70, 0.1, seed=shards)
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities_sharded(G, pred, shards, method) == get_communities(G, pred)
+
+
+def test_ring_lattice_shards_cut_through_rings():
+    G = ring_lattice([30, 30, 20], [8, 8, 6])
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities_sharded(G, pred, shards=7) == get_communities(G, pred)
+
+
+def test_worker_processes():
+    G = ring_lattice([24, 24, 16], [6, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    assert get_communities_sharded(G, pred, shards=4, workers=2) == get_communities(G, pred)
+
+
+def test_boundary_pair_deferred_in_two_shards():
+    # (2, 3) is deferred by centers 0 and 4 only; with one shard per node it
+    # is a boundary pair of both, and has to be checked when stitching
+    G = nx.Graph([(0, 1), (0, 2), (0, 3), (4, 5), (4, 2), (4, 3)])
+    pred = BlockPair({0, 4})
+    assert get_communities_sharded(G, pred, shards=6) == [{0, 1, 2, 3, 4, 5}]
+
+
+@pytest.mark.parametrize("method", ["range", "label_propagation"])
+def test_partition_covers_every_node_once(method):
+    P = PreparedGraph(nx.barabasi_albert_graph(120, 3, seed=4))
+    parts = partition(P, 6, method)
+    assert len(parts) <= 6
+    assert sorted(u for part in parts for u in part) == sorted(P.nodes)
+    for part in parts:
+        assert part == sorted(part, key=P.index.__getitem__)
+
+
+def test_shard_view_is_the_two_hop_halo():
+    G = nx.path_graph(10)
+    P = PreparedGraph(G)
+    view = shard_view(P, [4, 5])
+    assert view.nodes == [2, 3, 4, 5, 6, 7]
+    assert view.neighbor_lists[3] == [2, 4]  # one hop out: full neighborhood
+    assert view.neighbor_lists[2] == [3]     # two hops out: only inside the view
+
+
+def test_invalid_arguments():
+    G = nx.complete_graph(5)
+    pred = closed_neighborhood_jaccard_predicate(0.2)
+    with pytest.raises(ValueError, match="shards"):
+        get_communities_sharded(G, pred, shards=0)
+    with pytest.raises(ValueError, match="method"):
+        get_communities_sharded(G, pred, method="metis")
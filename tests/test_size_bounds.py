@@ -0,0 +1,88 @@
+"""
+Size-filter pruning: a threshold predicate may expose size_bounds(size), and
+engines may skip pairs outside it, but the results must not change.
+"""
+
+import itertools
+
+import networkx as nx
+import pytest
+
+from hypercommon.algorithm import get_communities
+from hypercommon.hypergraph import admissible_triples, build_hypergraph
+from hypercommon.prepared import PreparedGraph
+from predicates import closed_neighborhood_jaccard, closed_neighborhood_jaccard_predicate
+from predicates.jaccard import closed_neighborhood_jaccard_size_bounds
+from tests.helpers import CountingJaccard
+
+
+HUBS = (100, 101, 102)
+
+
+def hub_graph():
+    # two dense rings joined through hubs that touch most of the graph
+    G = nx.circulant_graph(60, [1, 2, 3])
+    for hub in HUBS:
+        for u in range(0, 60, 2):
+            G.add_edge(hub, u)
+    G.add_edges_from([(100, 101), (101, 102)])
+    return G
+
+
+@pytest.mark.parametrize("threshold", [0.05, 0.1, 0.25, 0.3, 1 / 3, 0.5, 0.9, 1.0])
+def test_bounds_never_exclude_a_passing_pair(threshold):
+    # the best a pair of sizes (a, b) can reach is intersection min(a, b),
+    # union max(a, b); any pair reaching the threshold must be within bounds
+    for a, b in itertools.product(range(1, 60), repeat=2):
+        lo, hi = closed_neighborhood_jaccard_size_bounds(a, threshold)
+        best = min(a, b) / max(a, b)
+        assert (lo <= b <= hi) == (best >= threshold)
+
+
+def test_bounds_outside_unit_interval():
+    assert closed_neighborhood_jaccard_size_bounds(7, 0.0)[0] == 0
+    lo, hi = closed_neighborhood_jaccard_size_bounds(7, 1.5)
+    assert lo > hi
+
+
+def test_threshold_predicate_exposes_size_bounds():
+    pred = closed_neighborhood_jaccard_predicate(0.25)
+    assert pred.size_bounds(8) == closed_neighborhood_jaccard_size_bounds(8, 0.25)
+    assert getattr(CountingJaccard(0.25), "size_bounds", None) is None
+
+
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3, 0.5])
+def test_pruned_enumeration_matches_plain_predicate(threshold):
+    G = hub_graph()
+    pruned = list(admissible_triples(G, closed_neighborhood_jaccard_predicate(threshold)))
+    plain = list(admissible_triples(G, CountingJaccard(threshold)))
+    assert pruned == plain
+
+    assert get_communities(G, closed_neighborhood_jaccard_predicate(threshold)) == \
+        get_communities(G, CountingJaccard(threshold))
+
+
+def test_pruned_hypergraph_matches_plain_predicate():
+    G = nx.barabasi_albert_graph(150, 4, seed=3)
+    for mode in ("star", "clique"):
+        H1 = build_hypergraph(G, closed_neighborhood_jaccard_predicate(0.2), mode)
+        H2 = build_hypergraph(G, CountingJaccard(0.2), mode)
+        assert (H1.triples == H2.triples).all()
+        assert (H1.links == H2.links).all()
+
+
+def test_pruning_skips_hub_pairs():
+    G = hub_graph()
+    P = PreparedGraph(G)
+    pred = closed_neighborhood_jaccard_predicate(0.4)
+    list(admissible_triples(P, pred))
+
+    counting = CountingJaccard(0.4)
+    list(admissible_triples(G, counting))
+
+    # the hubs have closed neighborhoods over 3x larger than the ring nodes,
+    # so none of their pairs with ring nodes is ever evaluated
+    n = len(P)
+    cached = [(P.nodes[key // n], P.nodes[key % n]) for key in P._values[closed_neighborhood_jaccard]]
+    assert not any(set(HUBS) & set(key) and set(key) - set(HUBS) for key in cached)
+    assert len(cached) < counting.calls
@@ -0,0 +1,92 @@
+"""
+The union-find engine must reproduce the hypergraph engine exactly — same
+communities, in the same order — since it is the default behind get_communities.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+from hypercommon.algorithm import get_communities
+from hypercommon.unionfind import DisjointSet
+from predicates import closed_neighborhood_jaccard_predicate
+
+
+def test_disjoint_set_union_and_find():
+    dsu = DisjointSet(4)
+    assert dsu.add() == 4
+    assert dsu.union(0, 1)
+    assert dsu.union(3, 4)
+    assert not dsu.union(1, 0)
+    assert dsu.find(0) == dsu.find(1)
+    assert dsu.find(3) == dsu.find(4)
+    assert dsu.find(0) != dsu.find(3)
+    assert dsu.find(2) == 2
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("threshold", [0.1, 0.2, 0.3, 0.5])
+def test_matches_hypergraph_engine_erdos_renyi(seed, threshold):
+    G = nx.erdos_renyi_graph(60, 0.12, seed=seed)
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities(G, pred) == get_communities(G, pred, engine="hypergraph")
+
+
+@pytest.mark.parametrize("threshold", [0.05, 0.11, 0.2, 0.3])
+def test_matches_hypergraph_engine_ring_lattice(threshold):
+    G = ring_lattice([30, 20, 10], [8, 6, 4])
+    pred = closed_neighborhood_jaccard_predicate(threshold)
+    assert get_communities(G, pred) == get_communities(G, pred, engine="hypergraph")
+
+
+class RandomPairPredicate:
+    """Passes a fixed random subset of pairs, counting evaluations."""
+
+    def __init__(self, seed, rate):
+        self.seed = seed
+        self.rate = rate
+        self.calls = 0
+
+    def __call__(self, u, v):
+        self.calls += 1
+        a, b = sorted((u.id, v.id))
+        return random.Random(self.seed * 1_000_003 + a * 1009 + b).random() < self.rate
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("rate", [0.5, 0.8, 0.95])
+def test_deferred_checks_match_hypergraph_engine(seed, rate):
+    # arbitrary pair predicates stress the deferred outer-pair checks, which
+    # must still merge classes that an unchecked pair would have bridged
+    G = nx.erdos_renyi_graph(40, 0.2, seed=seed)
+    pred = RandomPairPredicate(seed, rate)
+    assert get_communities(G, pred) == get_communities(G, pred, engine="hypergraph")
+
+
+def test_deferred_pair_bridging_two_classes():
+    # Centers 0 and 4 each reach (2, 3) only after their own center pairs
+    # already share a class, so both defer it; (2, 3) is in no other triple,
+    # yet it joins the two classes into one community.
+    G = nx.Graph([(0, 1), (0, 2), (0, 3), (4, 5), (4, 2), (4, 3)])
+
+    def pred(u, v):
+        return {u.id, v.id} != {0, 4}
+
+    assert get_communities(G, pred) == get_communities(G, pred, engine="hypergraph")
+    assert get_communities(G, pred) == [{0, 1, 2, 3, 4, 5}]
+
+
+def test_connected_pairs_skip_predicate_calls():
+    G = ring_lattice([40, 40], [12, 12])
+    lazy = RandomPairPredicate(0, 1.0)
+    eager = RandomPairPredicate(0, 1.0)
+    assert get_communities(G, lazy) == get_communities(G, eager, engine="hypergraph")
+    assert lazy.calls < eager.calls
+
+
+def test_unknown_engine_raises():
+    G = nx.complete_graph(4)
+    with pytest.raises(ValueError, match="engine"):
+        get_communities(G, closed_neighborhood_jaccard_predicate(0.5), engine="bogus")
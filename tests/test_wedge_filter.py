@@ -0,0 +1,86 @@
+"""
+Triple enumeration pairs only the neighbors that pass with the center, so a
+neighbor pair is never evaluated when one of its center pairs fails, and it
+reaches every triple from one center only, without a set of visited triples.
+"""
+
+import networkx as nx
+import pytest
+
+from generators.ring_lattice import ring_lattice
+
+from hypercommon.hypergraph import admissible_triples
+from hypercommon.hypernode import HCNode
+
+
+class RecordingPredicate:
+    """Common-neighbor predicate that records every pair it is asked about."""
+
+    def __init__(self, blocked):
+        self.blocked = blocked
+        self.asked = set()
+
+    def __call__(self, u, v):
+        self.asked.add(frozenset((u.id, v.id)))
+        if u.id in self.blocked or v.id in self.blocked:
+            return False
+        return len(u.neighbors & v.neighbors) >= 1
+
+
+def test_failed_center_pairs_are_not_paired():
+    # hub 0 is adjacent to everything but fails with everyone
+    G = nx.cycle_graph(range(1, 21))
+    G.add_edges_from((0, u) for u in range(1, 21))
+    pred = RecordingPredicate(blocked={0})
+
+    triples = list(admissible_triples(G, pred))
+
+    assert all(0 not in t for t in triples)
+    # no pair of cycle nodes two or more steps apart is ever asked about: the
+    # hub is the only center they share
+    far = {
+        frozenset((a, b)) for a in range(1, 21) for b in range(a + 1, 21)
+        if min(b - a, 20 - (b - a)) > 2
+    }
+    assert not (pred.asked & far)
+
+
+def test_filtered_enumeration_order_is_unchanged():
+    G = nx.karate_club_graph()
+    pred = RecordingPredicate(blocked={0, 33})
+    hc = {u: HCNode(u, set(G.neighbors(u))) for u in G.nodes()}
+
+    expected = []
+    seen = set()
+    for j in G.nodes():
+        nbrs = list(G.neighbors(j))
+        for a in range(len(nbrs)):
+            for b in range(a + 1, len(nbrs)):
+                triple = tuple(sorted((nbrs[a], j, nbrs[b])))
+                if triple in seen:
+                    continue
+                seen.add(triple)
+                x, y, z = triple
+                if pred(hc[x], hc[y]) and pred(hc[x], hc[z]) and pred(hc[y], hc[z]):
+                    expected.append(triple)
+
+    assert list(admissible_triples(G, pred)) == expected
+
+
+
+@pytest.mark.parametrize("G", [
+    nx.complete_graph(8),
+    ring_lattice([12, 10], [6, 4]),
+    nx.erdos_renyi_graph(40, 0.25, seed=5),
+])
+def test_each_triple_is_enumerated_once(G):
+    triples = list(admissible_triples(G, lambda u, v: True))
+    expected = {
+        tuple(sorted((i, j, k)))
+        for j in G.nodes()
+        for i in G.neighbors(j)
+        for k in G.neighbors(j)
+        if i != k
+    }
+    assert len(triples) == len(set(triples))
+    assert set(triples) == expected
@@ -6,7 +6,8 @@ def rewire_one_edge(
         G: nx.Graph,
         keep_node: int,
         replace_node: int,
-        rng: random.Random
+        rng: random.Random,
+        dynamic=None,
 ) -> None:
     # pick a new endpoint w
     candidates = set(G.nodes())
@@ -22,12 +23,18 @@ def rewire_one_edge(
     G.remove_edge(keep_node, replace_node)
     G.add_edge(keep_node, new_node)
 
+    # keep an incremental hypercommon structure in step with G
+    if dynamic is not None:
+        dynamic.remove_edge(keep_node, replace_node)
+        dynamic.add_edge(keep_node, new_node)
+
 
 def rewire_step(
         G: nx.Graph,
         edge_stack: list[tuple[int, int]],
         k: int,
-        rng: random.Random
+        rng: random.Random,
+        dynamic=None,
 ) -> None:
     for _ in range(k):
         u, v = edge_stack.pop()
@@ -37,4 +44,4 @@ def rewire_step(
         else:
             keep_node, replace_node = v, u
 
-        rewire_one_edge(G, keep_node, replace_node, rng)
+        rewire_one_edge(G, keep_node, replace_node, rng, dynamic)
@@ -8,6 +8,12 @@ def avg_threshold(
         commonality_value,
         threshold_multiplier
 ):
+    # Pairs within distance 2 are exactly the pairs of a commonality table, so
+    # when the value function can build one the mean comes straight from it.
+    table_function = getattr(commonality_value, "table", None)
+    if table_function is not None:
+        return table_function(G).mean() * threshold_multiplier
+
     s = 0
     count = 0
 